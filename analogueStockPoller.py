@@ -0,0 +1,115 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Callable
+
+import CynanBotCommon.utils as utils
+from CynanBotCommon.analogueStoreRepository import (AnalogueStoreRepository,
+                                                    AnalogueStoreStock)
+
+
+class AnalogueStockPoller():
+
+    def __init__(
+        self,
+        analogueStoreRepository: AnalogueStoreRepository,
+        pollTimeDelta: timedelta = timedelta(minutes=5)
+    ):
+        if analogueStoreRepository is None:
+            raise ValueError(f'analogueStoreRepository argument is malformed: \"{analogueStoreRepository}\"')
+        elif pollTimeDelta is None:
+            raise ValueError(f'pollTimeDelta argument is malformed: \"{pollTimeDelta}\"')
+
+        self.__analogueStoreRepository = analogueStoreRepository
+        self.__pollTimeDelta = pollTimeDelta
+        self.__listeners = list()
+        self.__lastPollTime = None
+        self.__pollFuture = None
+        self.__stock = None
+        self.__task = None
+
+    def addBackInStockListener(self, listener: Callable):
+        if listener is None:
+            raise ValueError(f'listener argument is malformed: \"{listener}\"')
+
+        self.__listeners.append(listener)
+
+    def __findBackInStockProducts(self, oldStock: AnalogueStoreStock, newStock: AnalogueStoreStock):
+        if oldStock is None or not newStock.hasProducts():
+            return list()
+
+        oldInStockNames = set()
+
+        if oldStock.hasProducts():
+            for product in oldStock.getProducts():
+                if product.inStock():
+                    oldInStockNames.add(product.getName())
+
+        backInStockProducts = list()
+
+        for product in newStock.getProducts():
+            if product.inStock() and product.getName() not in oldInStockNames:
+                backInStockProducts.append(product)
+
+        return backInStockProducts
+
+    async def fetchStoreStock(self):
+        if self.__stock is not None and datetime.now() < self.__lastPollTime + self.__pollTimeDelta:
+            return self.__stock
+
+        return await self.__poll()
+
+    async def __poll(self):
+        # if a poll is already underway, just wait on its result rather than scraping again
+        if self.__pollFuture is None:
+            self.__pollFuture = asyncio.ensure_future(self.__pollStore())
+
+        try:
+            return await asyncio.shield(self.__pollFuture)
+        finally:
+            if self.__pollFuture is not None and self.__pollFuture.done():
+                self.__pollFuture = None
+
+    async def __pollStore(self):
+        loop = asyncio.get_event_loop()
+        newStock = None
+
+        try:
+            newStock = await loop.run_in_executor(None, self.__analogueStoreRepository.fetchStoreStock)
+        except Exception as e:
+            print(f'Error polling Analogue store stock: {e}')
+
+        if newStock is None:
+            return self.__stock
+
+        oldStock = self.__stock
+        self.__stock = newStock
+        self.__lastPollTime = datetime.now()
+
+        backInStockProducts = self.__findBackInStockProducts(oldStock, newStock)
+
+        if utils.hasItems(backInStockProducts):
+            print(f'{len(backInStockProducts)} Analogue product(s) are back in stock ({utils.getNowTimeText()})')
+
+            for listener in self.__listeners:
+                # one listener failing (say, a channel it sends to is gone) mustn't stop the others
+                try:
+                    await listener(backInStockProducts)
+                except Exception as e:
+                    print(f'Error notifying of Analogue products back in stock: {e}')
+
+        return newStock
+
+    async def __run(self):
+        while True:
+            try:
+                await self.__poll()
+            except Exception as e:
+                print(f'Error in the Analogue store stock poller, will try again next time: {e}')
+
+            await asyncio.sleep(self.__pollTimeDelta.total_seconds())
+
+    def start(self):
+        if self.__task is not None:
+            return
+
+        self.__task = asyncio.get_event_loop().create_task(self.__run())
@@ -140,11 +140,15 @@ class AuthHelper():
             handle = user.getHandle()
             accessToken = userTokensRepository.getAccessToken(handle)
 
-            if accessToken is not None and (not utils.isValidStr(nonce) or nonce == self.__nonceRepository.getNonce(handle)):
-                userTokens[handle] = accessToken
+            if accessToken is None:
+                continue
+            elif utils.isValidStr(nonce) and nonce != self.__nonceRepository.getNonce(handle):
+                continue
+
+            userTokens[handle] = accessToken
 
         if len(userTokens) == 0:
-            print('There are no users with an access token, skipping access token validation')
+            print('There are no access tokens that need validating, skipping access token validation')
             return
 
         print(f'Validating access tokens for {len(userTokens)} user(s) (nonce: \"{nonce}\")...')
@@ -1,15 +1,136 @@
 import sqlite3
+from contextlib import contextmanager
+from typing import Dict, List
 
 import CynanBotCommon.utils as utils
+from databaseMigrations import MIGRATIONS, DatabaseMigration
+from metricsRepository import MetricsRepository
+
+
+# WAL lets readers carry on while something else (such as another shard) is writing, and with WAL,
+# NORMAL is still safe from corruption, it just doesn't fsync on every commit. A negative
+# cache_size is in KiB rather than in pages.
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 64 * 1024 * 1024,
+    'cache_size': -16 * 1024,
+    'temp_store': 'MEMORY'
+}
 
 
 class BackingDatabase():
 
-    def __init__(self, databaseFile: str = 'database.sqlite'):
+    def __init__(
+        self,
+        databaseFile: str = 'database.sqlite',
+        metricsRepository: MetricsRepository = None,
+        migrations: List[DatabaseMigration] = MIGRATIONS,
+        pragmas: Dict[str, object] = DEFAULT_PRAGMAS,
+        cachedStatements: int = 256
+    ):
         if not utils.isValidStr(databaseFile):
             raise ValueError(f'databaseFile argument is malformed: \"{databaseFile}\"')
+        elif migrations is None:
+            raise ValueError(f'migrations argument is malformed: \"{migrations}\"')
+        elif pragmas is None:
+            raise ValueError(f'pragmas argument is malformed: \"{pragmas}\"')
+        elif not utils.isValidNum(cachedStatements):
+            raise ValueError(f'cachedStatements argument is malformed: \"{cachedStatements}\"')
+
+        self.__metricsRepository = metricsRepository
+        self.__statements = dict()
+
+        # sqlite3 keeps this many compiled statements around, keyed by their SQL text, which is
+        # why every query should go through a named statement (so that the text never changes)
+        self.__connection = sqlite3.connect(databaseFile, cached_statements=cachedStatements)
+
+        for name, value in pragmas.items():
+            # PRAGMA doesn't support parameters, these come from our own code rather than users
+            self.__connection.execute(f'PRAGMA {name} = {value}')
+
+        self.__migrate(migrations)
+
+    def commit(self):
+        self.__connection.commit()
 
-        self.__connection = sqlite3.connect(databaseFile)
+    def execute(self, name: str, parameters: tuple = ()):
+        return self.__run(name, lambda sql: self.__connection.execute(sql, parameters))
+
+    def executeMany(self, name: str, parameters):
+        return self.__run(name, lambda sql: self.__connection.executemany(sql, parameters))
+
+    def fetchAll(self, name: str, parameters: tuple = ()):
+        return self.__run(name, lambda sql: self.__connection.execute(sql, parameters).fetchall())
+
+    def fetchOne(self, name: str, parameters: tuple = ()):
+        return self.__run(name, lambda sql: self.__connection.execute(sql, parameters).fetchone())
 
     def getConnection(self):
         return self.__connection
+
+    def getSchemaVersion(self):
+        return self.__connection.execute('PRAGMA user_version').fetchone()[0]
+
+    def __migrate(self, migrations: List[DatabaseMigration]):
+        migrations = sorted(migrations, key=lambda migration: migration.getVersion())
+
+        if not utils.hasItems(migrations) or self.getSchemaVersion() >= migrations[-1].getVersion():
+            return
+
+        # the write lock is taken before checking the version again, so that if multiple shards
+        # start at the same time, only one of them runs each migration
+        with self.transaction():
+            schemaVersion = self.getSchemaVersion()
+
+            for migration in migrations:
+                if migration.getVersion() <= schemaVersion:
+                    continue
+
+                print(f'Migrating database to version {migration.getVersion()} ({migration.getDescription()})...')
+
+                for statement in migration.getStatements():
+                    self.__connection.execute(statement)
+
+                # PRAGMA doesn't support parameters, but this is always an int
+                self.__connection.execute(f'PRAGMA user_version = {int(migration.getVersion())}')
+                schemaVersion = migration.getVersion()
+
+    def registerStatement(self, name: str, sql: str):
+        if not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+        elif not utils.isValidStr(sql):
+            raise ValueError(f'sql argument is malformed: \"{sql}\"')
+
+        existingSql = self.__statements.get(name)
+
+        if existingSql is not None and existingSql != sql:
+            raise ValueError(f'A different statement named \"{name}\" has already been registered')
+
+        self.__statements[name] = sql
+
+    def __run(self, name: str, callback):
+        sql = self.__statements.get(name)
+
+        if sql is None:
+            raise RuntimeError(f'No statement named \"{name}\" has been registered')
+
+        if self.__metricsRepository is None:
+            return callback(sql)
+
+        with self.__metricsRepository.measure('database_statement', { 'statement': name }):
+            return callback(sql)
+
+    @contextmanager
+    def transaction(self):
+        # IMMEDIATE takes the write lock up front, rather than on the first write, so that two
+        # processes can't both read and then both fail to upgrade to a write
+        self.__connection.execute('BEGIN IMMEDIATE')
+
+        try:
+            yield
+        except BaseException:
+            self.__connection.rollback()
+            raise
+        else:
+            self.__connection.commit()
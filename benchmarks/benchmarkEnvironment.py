@@ -0,0 +1,301 @@
+import json
+import locale
+import os
+from datetime import timedelta
+from typing import Dict, List
+
+import CynanBotCommon.utils as utils
+from analogueStockPoller import AnalogueStockPoller
+from authHelper import AuthHelper
+from backingDatabase import BackingDatabase
+from benchmarks.fakeTwitch import FakeChannel, FakeWebsocket
+from benchmarks.localStandIns import LocalStandInServer
+from cutenessMultiplierScheduler import CutenessMultiplierScheduler
+from cutenessRepository import CutenessRepository
+from cynanBot import CynanBot
+from CynanBotCommon.analogueStoreRepository import AnalogueStoreRepository
+from CynanBotCommon.jishoHelper import JishoHelper
+from CynanBotCommon.jokesRepository import JokesRepository
+from CynanBotCommon.wordOfTheDayRepository import WordOfTheDayRepository
+from leaderboardServer import LeaderboardServer
+from locationsRepository import LocationsRepository
+from loopStallDetector import LoopStallDetector
+from metricsRepository import MetricsRepository
+from nonceRepository import NonceRepository
+from pkmnCommandQueue import PkmnCommandQueue
+from responseCache import ResponseCache
+from rewardDispatcher import RewardDispatcher
+from timeZoneRepository import TimeZoneRepository
+from userSchema import USER_SCHEMA
+from userIdsRepository import UserIdsRepository
+from usersRegistryWatcher import UsersRegistryWatcher
+from usersRepository import UsersRepository
+from userTokensRepository import UserTokensRepository
+from weatherRepository import WeatherRepository
+from wordOfTheDayPrefetcher import WordOfTheDayPrefetcher
+
+
+class BenchmarkEnvironment():
+
+    def __init__(
+        self,
+        channelHandles: List[str],
+        directory: str,
+        helixUserIds: Dict[str, str] = None,
+        rewardIds: Dict[str, Dict[str, str]] = None
+    ):
+        if not utils.hasItems(channelHandles):
+            raise ValueError(f'channelHandles argument is malformed: \"{channelHandles}\"')
+        elif not utils.isValidStr(directory):
+            raise ValueError(f'directory argument is malformed: \"{directory}\"')
+
+        if rewardIds is None:
+            rewardIds = dict()
+
+        self.__channelHandles = channelHandles
+        self.__directory = directory
+        self.__rewardIds = rewardIds
+        self.__websocket = FakeWebsocket()
+        self.__channels = dict()
+
+        for handle in self.__channelHandles:
+            self.__channels[handle.lower()] = FakeChannel(handle.lower(), self.__websocket)
+
+        self.__standInServer = LocalStandInServer(helixUserIds=helixUserIds)
+        self.__cynanBot = None
+
+    def __createFile(self, fileName: str, jsonContents: dict):
+        filePath = os.path.join(self.__directory, fileName)
+
+        with open(filePath, 'w') as file:
+            json.dump(jsonContents, file, indent=4, sort_keys=True)
+
+        return filePath
+
+    def __applyRecordedRewardIds(self, userJson: dict, rewardIds: Dict[str, str], picOfTheDayFile: str):
+        # A replay uses the channel's real reward IDs in place of the made up ones, and turns on
+        # whichever features they belong to, so that recorded redemptions reach the same handlers
+        # that they did in production.
+        for field in USER_SCHEMA:
+            if field.getJsonKey().endswith('RewardId'):
+                userJson.pop(field.getJsonKey(), None)
+
+        for field in USER_SCHEMA:
+            if field.getJsonKey() not in rewardIds:
+                continue
+
+            userJson[field.getJsonKey()] = rewardIds[field.getJsonKey()]
+
+            if field.getEnabledBy() is not None:
+                userJson[field.getEnabledBy()] = True
+
+        if 'picOfTheDayRewardId' in rewardIds:
+            userJson['picOfTheDayFile'] = picOfTheDayFile
+
+    def __createFiles(self):
+        authFile = self.__createFile('authFile.json', {
+            'clientId': 'benchmarkClientId',
+            'clientSecret': 'benchmarkClientSecret',
+            'iqAirApiKey': 'benchmarkIqAirApiKey',
+            'ircAuthToken': 'oauth:benchmarkIrcAuthToken',
+            'oneWeatherApiKey': 'benchmarkOneWeatherApiKey'
+        })
+
+        locationsFile = self.__createFile('locationsRepository.json', {
+            'benchmark': {
+                'lat': 47.6062,
+                'lon': -122.3321,
+                'name': 'Seattle',
+                'timeZone': 'America/Los_Angeles'
+            }
+        })
+
+        picOfTheDayFile = os.path.join(self.__directory, 'picOfTheDay.txt')
+
+        with open(picOfTheDayFile, 'w') as file:
+            file.write('https://example.com/picOfTheDay.png')
+
+        usersJson = dict()
+        userTokensJson = dict()
+
+        for handle in self.__channelHandles:
+            usersJson[handle] = {
+                'cutenessEnabled': True,
+                'discord': f'https://discord.gg/{handle}',
+                'giveCutenessEnabled': True,
+                'increaseCutenessDoubleRewardId': self.getIncreaseCutenessDoubleRewardId(),
+                'increaseCutenessRewardId': self.getIncreaseCutenessRewardId(),
+                'locationId': 'benchmark',
+                'pkmnBattleRewardId': self.getPkmnBattleRewardId(),
+                'pkmnEnabled': True,
+                'timeZones': [ 'America/Los_Angeles', 'Asia/Tokyo', 'Europe/London' ],
+                'twitter': f'https://twitter.com/{handle}'
+            }
+
+            if handle in self.__rewardIds:
+                self.__applyRecordedRewardIds(usersJson[handle], self.__rewardIds[handle], picOfTheDayFile)
+
+            userTokensJson[handle] = {
+                'accessToken': f'{handle}AccessToken',
+                'refreshToken': f'{handle}RefreshToken'
+            }
+
+        usersFile = self.__createFile('usersRepository.json', usersJson)
+        userTokensFile = self.__createFile('userTokensRepository.json', userTokensJson)
+
+        return authFile, locationsFile, usersFile, userTokensFile
+
+    def getChannel(self, name: str):
+        if not utils.isValidStr(name):
+            return None
+
+        return self.__channels.get(name.lower())
+
+    def getChannelHandles(self):
+        return self.__channelHandles
+
+    def getChannelId(self, handle: str):
+        return self.__standInServer.getHelixUserId(handle)
+
+    def getCynanBot(self):
+        if self.__cynanBot is None:
+            raise RuntimeError('BenchmarkEnvironment has not been started')
+
+        return self.__cynanBot
+
+    def getIncreaseCutenessDoubleRewardId(self):
+        return 'benchmark-increase-cuteness-double'
+
+    def getIncreaseCutenessRewardId(self):
+        return 'benchmark-increase-cuteness'
+
+    def getPkmnBattleRewardId(self):
+        return 'benchmark-pkmn-battle'
+
+    def getSentCount(self):
+        count = self.__websocket.getSentCount()
+
+        for channel in self.__channels.values():
+            count = count + channel.getSentCount()
+
+        return count
+
+    def start(self):
+        if self.__cynanBot is not None:
+            return self.__cynanBot
+
+        try:
+            locale.setlocale(locale.LC_ALL, 'en_US.utf8')
+        except locale.Error:
+            print('Unable to set the en_US.utf8 locale, numbers will be formatted without grouping')
+
+        self.__standInServer.start()
+        authFile, locationsFile, usersFile, userTokensFile = self.__createFiles()
+
+        analogueStoreRepository = AnalogueStoreRepository()
+        metricsRepository = MetricsRepository()
+        backingDatabase = BackingDatabase(
+            databaseFile=os.path.join(self.__directory, 'database.sqlite'),
+            metricsRepository=metricsRepository
+        )
+        nonceRepository = NonceRepository()
+        authHelper = AuthHelper(
+            nonceRepository=nonceRepository,
+            authFile=authFile,
+            oauth2TokenUrl=self.__standInServer.getOauth2TokenUrl(),
+            oauth2ValidateUrl=self.__standInServer.getOauth2ValidateUrl()
+        )
+        userIdsRepository = UserIdsRepository(
+            backingDatabase=backingDatabase,
+            helixUsersUrl=self.__standInServer.getHelixUsersUrl()
+        )
+        timeZoneRepository = TimeZoneRepository()
+        usersRepository = UsersRepository(
+            timeZoneRepository=timeZoneRepository,
+            usersFile=usersFile
+        )
+        cutenessRepository = CutenessRepository(
+            backingDatabase=backingDatabase,
+            leaderboardSize=10,
+            localLeaderboardSize=5,
+            userIdsRepository=userIdsRepository
+        )
+        userTokensRepository = UserTokensRepository(
+            userTokensFile=userTokensFile
+        )
+        rewardDispatcher = RewardDispatcher(
+            authHelper=authHelper,
+            userIdsRepository=userIdsRepository,
+            usersRepository=usersRepository,
+            userTokensRepository=userTokensRepository
+        )
+        wordOfTheDayRepository = WordOfTheDayRepository()
+        wordOfTheDayPrefetcher = WordOfTheDayPrefetcher(
+            rolloverTimeZone=timeZoneRepository.getTimeZone('America/New_York'),
+            wordOfTheDayRepository=wordOfTheDayRepository
+        )
+
+        self.__cynanBot = CynanBot(
+            analogueStockPoller=AnalogueStockPoller(
+                analogueStoreRepository=analogueStoreRepository
+            ),
+            authHelper=authHelper,
+            cutenessMultiplierScheduler=CutenessMultiplierScheduler(),
+            cutenessRepository=cutenessRepository,
+            jishoHelper=JishoHelper(),
+            jokesRepository=JokesRepository(),
+            leaderboardServer=LeaderboardServer(
+                cutenessRepository=cutenessRepository,
+                usersRepository=usersRepository
+            ),
+            locationsRepository=LocationsRepository(
+                timeZoneRepository=timeZoneRepository,
+                locationsFile=locationsFile
+            ),
+            loopStallDetector=LoopStallDetector(
+                metricsRepository=metricsRepository
+            ),
+            metricsRepository=metricsRepository,
+            nonceRepository=nonceRepository,
+            # pacing would only make the benchmark measure time spent asleep
+            pkmnCommandQueue=PkmnCommandQueue(
+                metricsRepository=metricsRepository,
+                commandTimeDelta=timedelta(0)
+            ),
+            responseCache=ResponseCache(
+                timeToLives={
+                    'jisho': timedelta(days=7)
+                },
+                expirationTimes={
+                    'wotd': wordOfTheDayPrefetcher.getNextRolloverTime
+                }
+            ),
+            rewardDispatcher=rewardDispatcher,
+            timeZoneRepository=timeZoneRepository,
+            userIdsRepository=userIdsRepository,
+            usersRegistryWatcher=UsersRegistryWatcher(
+                usersRepository=usersRepository
+            ),
+            usersRepository=usersRepository,
+            userTokensRepository=userTokensRepository,
+            weatherRepository=WeatherRepository(
+                oneWeatherApiKey=authHelper.getOneWeatherApiKey(),
+                iqAirApiKey=authHelper.getIqAirApiKey(),
+                iqAirApiUrl=self.__standInServer.getIqAirApiUrl(),
+                oneWeatherApiUrl=self.__standInServer.getOneWeatherApiUrl()
+            ),
+            wordOfTheDayPrefetcher=wordOfTheDayPrefetcher,
+            wordOfTheDayRepository=wordOfTheDayRepository
+        )
+
+        # There's no IRC connection, so channel lookups resolve to our fake channels instead.
+        self.__cynanBot.get_channel = self.getChannel
+
+        # event_ready never fires without a connection either, so build the reward tables that it
+        # otherwise would have
+        rewardDispatcher.buildTables()
+
+        return self.__cynanBot
+
+    def stop(self):
+        self.__standInServer.stop()
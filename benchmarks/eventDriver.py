@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+from benchmarks.latencyReport import LatencyReport
+
+
+class EventDriver():
+
+    def __init__(self, latencyReport: LatencyReport, speed: float = None):
+        if latencyReport is None:
+            raise ValueError(f'latencyReport argument is malformed: \"{latencyReport}\"')
+        elif speed is not None and speed <= 0:
+            raise ValueError(f'speed argument is out of bounds: \"{speed}\"')
+
+        self.__latencyReport = latencyReport
+        self.__speed = speed
+
+    async def __runEvent(self, kind: str, handler, scheduledTime: float):
+        try:
+            await handler()
+        except Exception as e:
+            self.__latencyReport.recordError(kind, e)
+            return
+
+        # Latency is measured from when the event was supposed to arrive rather than from when it
+        # was started, so that any time spent queued behind a stalled event loop is counted.
+        self.__latencyReport.recordLatency(kind, time.perf_counter() - scheduledTime)
+
+    async def run(self, events):
+        # Each event is an (offsetSeconds, kind, handler) tuple, where handler is a zero argument
+        # callable that returns a coroutine. With no speed, events are run back to back as fast
+        # as possible; otherwise each one is started at its offset, scaled by the speed.
+        self.__latencyReport.start()
+        startTime = time.perf_counter()
+        tasks = list()
+
+        for offsetSeconds, kind, handler in events:
+            if self.__speed is None:
+                await self.__runEvent(kind, handler, time.perf_counter())
+                continue
+
+            scheduledTime = startTime + (offsetSeconds / self.__speed)
+            delaySeconds = scheduledTime - time.perf_counter()
+
+            if delaySeconds > 0:
+                await asyncio.sleep(delaySeconds)
+
+            tasks.append(asyncio.ensure_future(self.__runEvent(kind, handler, scheduledTime)))
+
+        if len(tasks) >= 1:
+            await asyncio.gather(*tasks)
+
+        self.__latencyReport.stop()
@@ -0,0 +1,136 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+import CynanBotCommon.utils as utils
+
+
+# These fakes mimic just enough of twitchio's Message, Channel and User objects for CynanBot's
+# event handlers and twitchio's command dispatch to run against them, without a connection to
+# Twitch. Everything CynanBot "sends" is counted instead of going anywhere.
+
+class FakeWebsocket():
+
+    def __init__(self):
+        self.__sentCount = 0
+
+    def __getattr__(self, name: str):
+        async def send(*args, **kwargs):
+            self.__sentCount = self.__sentCount + 1
+
+        return send
+
+    def getSentCount(self):
+        return self.__sentCount
+
+
+class FakeChannel():
+
+    def __init__(self, name: str, websocket: FakeWebsocket):
+        if not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+        elif websocket is None:
+            raise ValueError(f'websocket argument is malformed: \"{websocket}\"')
+
+        self.name = name
+        self._ws = websocket
+        self._websocket = websocket
+        self._http = None
+        self.__lastMessage = None
+        self.__sentCount = 0
+
+    def getLastMessage(self):
+        return self.__lastMessage
+
+    def getSentCount(self):
+        return self.__sentCount
+
+    async def send(self, content: str):
+        self.__lastMessage = content
+        self.__sentCount = self.__sentCount + 1
+
+    async def send_me(self, content: str):
+        await self.send(f'/me {content}')
+
+
+class FakeAuthor():
+
+    def __init__(self, id_: str, name: str, isMod: bool = False):
+        if not utils.isValidStr(id_):
+            raise ValueError(f'id_ argument is malformed: \"{id_}\"')
+        elif not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+
+        self.id = id_
+        self.name = name
+        self.display_name = name
+        self.is_mod = isMod
+        self.is_subscriber = False
+        self.is_turbo = False
+        self.badges = dict()
+        self.tags = dict()
+
+
+class FakeMessage():
+
+    def __init__(self, author: FakeAuthor, channel: FakeChannel, content: str):
+        if author is None:
+            raise ValueError(f'author argument is malformed: \"{author}\"')
+        elif channel is None:
+            raise ValueError(f'channel argument is malformed: \"{channel}\"')
+        elif not utils.isValidStr(content):
+            raise ValueError(f'content argument is malformed: \"{content}\"')
+
+        self.author = author
+        self.channel = channel
+        self.content = content
+        self.echo = False
+        self.raw_data = f':{author.name}!{author.name}@{author.name}.tmi.twitch.tv PRIVMSG #{channel.name} :{content}'
+        self.tags = {
+            'display-name': author.name,
+            'mod': '1' if author.is_mod else '0',
+            'user-id': author.id
+        }
+        self.timestamp = datetime.now(timezone.utc)
+
+
+def createRewardRedeemedFrame(
+    channelId: str,
+    rewardId: str,
+    userId: str,
+    userName: str,
+    userInput: str = None
+):
+    redemptionJson = {
+        'id': str(uuid.uuid4()),
+        'channel_id': channelId,
+        'redeemed_at': datetime.now(timezone.utc).isoformat(),
+        'reward': {
+            'id': rewardId,
+            'channel_id': channelId,
+            'title': 'Benchmark Reward'
+        },
+        'status': 'UNFULFILLED',
+        'user': {
+            'id': userId,
+            'login': userName.lower(),
+            'display_name': userName
+        }
+    }
+
+    if utils.isValidStr(userInput):
+        redemptionJson['user_input'] = userInput
+
+    return {
+        'type': 'MESSAGE',
+        'data': {
+            'topic': f'channel-points-channel-v1.{channelId}',
+            'message': json.dumps({
+                'type': 'reward-redeemed',
+                'data': {
+                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                    'redemption': redemptionJson
+                }
+            })
+        }
+    }
@@ -0,0 +1,81 @@
+import resource
+import sys
+import time
+
+import CynanBotCommon.utils as utils
+
+
+class LatencyReport():
+
+    def __init__(self):
+        self.__errorCounts = dict()
+        self.__latencies = dict()
+        self.__startTime = None
+        self.__stopTime = None
+
+    def __getPercentile(self, latencies, percentile: float):
+        index = min(len(latencies) - 1, int(round(percentile * (len(latencies) - 1))))
+        return latencies[index]
+
+    def __getPeakRssMegabytes(self):
+        peakRss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # Linux reports this in kilobytes, while macOS reports it in bytes
+        if sys.platform == 'darwin':
+            return peakRss / (1024 * 1024)
+        else:
+            return peakRss / 1024
+
+    def recordError(self, kind: str, error: Exception):
+        self.__errorCounts[kind] = self.__errorCounts.get(kind, 0) + 1
+
+        if self.__errorCounts[kind] == 1:
+            print(f'First {kind} error: {error}')
+
+    def recordLatency(self, kind: str, seconds: float):
+        latencies = self.__latencies.get(kind)
+
+        if latencies is None:
+            latencies = list()
+            self.__latencies[kind] = latencies
+
+        latencies.append(seconds)
+
+    def start(self):
+        self.__startTime = time.perf_counter()
+
+    def stop(self):
+        self.__stopTime = time.perf_counter()
+
+    def toStr(self, sentCount: int = None):
+        if self.__startTime is None or self.__stopTime is None:
+            raise RuntimeError('LatencyReport must be started and stopped before it can be printed')
+
+        elapsedSeconds = self.__stopTime - self.__startTime
+        allLatencies = list()
+        lines = list()
+
+        for kind in sorted(set(self.__latencies.keys()) | set(self.__errorCounts.keys())):
+            latencies = sorted(self.__latencies.get(kind, list()))
+            allLatencies.extend(latencies)
+            lines.append(self.__toLineStr(kind, latencies, self.__errorCounts.get(kind, 0), elapsedSeconds))
+
+        allLatencies.sort()
+        totalErrors = sum(self.__errorCounts.values())
+        lines.append(self.__toLineStr('total', allLatencies, totalErrors, elapsedSeconds))
+        lines.append(f'elapsed: {elapsedSeconds:.2f}s, peak RSS: {self.__getPeakRssMegabytes():.1f} MB')
+
+        if utils.isValidNum(sentCount):
+            lines.append(f'chat messages sent by CynanBot: {sentCount}')
+
+        return '\n'.join(lines)
+
+    def __toLineStr(self, kind: str, latencies, errorCount: int, elapsedSeconds: float):
+        if len(latencies) == 0:
+            return f'{kind}: 0 events, {errorCount} error(s)'
+
+        throughput = len(latencies) / elapsedSeconds
+        p50Millis = self.__getPercentile(latencies, 0.5) * 1000
+        p99Millis = self.__getPercentile(latencies, 0.99) * 1000
+        maxMillis = latencies[-1] * 1000
+        return f'{kind}: {len(latencies)} events ({throughput:.1f}/s), p50 {p50Millis:.2f}ms, p99 {p99Millis:.2f}ms, max {maxMillis:.2f}ms, {errorCount} error(s)'
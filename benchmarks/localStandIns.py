@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+
+def createHelixUserId(userName: str):
+    # stable across runs, so that a database from a previous run lines up with this one
+    return str((zlib.crc32(userName.lower().encode('utf-8')) % 1000000000) + 1)
+
+
+class LocalStandInHandler(BaseHTTPRequestHandler):
+
+    def __createOneWeatherJson(self):
+        now = int(time.time())
+
+        return {
+            'current': {
+                'humidity': 64,
+                'pressure': 1013,
+                'sunrise': now - 3600,
+                'sunset': now + 3600,
+                'temp': 21.5,
+                'weather': [
+                    { 'id': 801, 'description': 'few clouds' },
+                    { 'id': 500, 'description': 'light rain' }
+                ]
+            },
+            'daily': [
+                {
+                    'sunrise': now - 3600,
+                    'sunset': now + 3600,
+                    'temp': { 'max': 23.0, 'min': 15.0 },
+                    'weather': [ { 'id': 801, 'description': 'few clouds' } ]
+                },
+                {
+                    'sunrise': now + 82800,
+                    'sunset': now + 90000,
+                    'temp': { 'max': 25.0, 'min': 16.0 },
+                    'weather': [ { 'id': 800, 'description': 'clear sky' } ]
+                }
+            ]
+        }
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path.endswith('/helix/users'):
+            userName = query.get('login', [ 'unknown' ])[0]
+            self.__writeJson({ 'data': [ { 'id': self.server.getHelixUserId(userName), 'login': userName } ] })
+        elif url.path.endswith('/onecall'):
+            self.__writeJson(self.__createOneWeatherJson())
+        elif url.path.endswith('/nearest_city'):
+            self.__writeJson({ 'status': 'success', 'data': { 'current': { 'pollution': { 'aqius': 42 } } } })
+        elif url.path.endswith('/oauth2/validate'):
+            self.__writeJson({ 'client_id': 'benchmark', 'expires_in': 3600 })
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+
+        if url.path.endswith('/oauth2/token'):
+            self.__writeJson({ 'access_token': 'benchmarkAccessToken', 'refresh_token': 'benchmarkRefreshToken' })
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        # keeps the stand-ins from printing a line for every request during a benchmark
+        pass
+
+    def __writeJson(self, jsonContents: dict):
+        body = json.dumps(jsonContents).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class LocalStandInHttpServer(ThreadingHTTPServer):
+
+    def __init__(self, host: str, helixUserIds: Dict[str, str]):
+        super().__init__((host, 0), LocalStandInHandler)
+        self.__helixUserIds = dict()
+
+        if helixUserIds is not None:
+            for userName, userId in helixUserIds.items():
+                self.__helixUserIds[userName.lower()] = userId
+
+    def getHelixUserId(self, userName: str):
+        userId = self.__helixUserIds.get(userName.lower())
+
+        if userId is None:
+            return createHelixUserId(userName)
+        else:
+            return userId
+
+
+class LocalStandInServer():
+
+    def __init__(self, host: str = '127.0.0.1', helixUserIds: Dict[str, str] = None):
+        self.__server = LocalStandInHttpServer(host, helixUserIds)
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever,
+            name='LocalStandInServer',
+            daemon=True
+        )
+
+    def getBaseUrl(self):
+        host, port = self.__server.server_address
+        return f'http://{host}:{port}'
+
+    def getHelixUserId(self, userName: str):
+        return self.__server.getHelixUserId(userName)
+
+    def getHelixUsersUrl(self):
+        return f'{self.getBaseUrl()}/helix/users'
+
+    def getIqAirApiUrl(self):
+        return f'{self.getBaseUrl()}/v2/nearest_city'
+
+    def getOauth2TokenUrl(self):
+        return f'{self.getBaseUrl()}/oauth2/token'
+
+    def getOauth2ValidateUrl(self):
+        return f'{self.getBaseUrl()}/oauth2/validate'
+
+    def getOneWeatherApiUrl(self):
+        return f'{self.getBaseUrl()}/data/2.5/onecall'
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self):
+        self.__server.shutdown()
+        self.__server.server_close()
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+import tempfile
+
+from benchmarks.benchmarkEnvironment import BenchmarkEnvironment
+from benchmarks.eventDriver import EventDriver
+from benchmarks.fakeTwitch import FakeAuthor, FakeMessage
+from benchmarks.latencyReport import LatencyReport
+
+
+# Plays a traffic file captured by TrafficRecorder (see CYNANBOT_TRAFFIC_FILE in initCynanBot.py)
+# back into CynanBot, against the same local stand-ins as runBenchmark.py. Run from the repository
+# root:
+#
+#   python -m benchmarks.replayTraffic traffic.log --speed 1
+#   python -m benchmarks.replayTraffic traffic.log --speed 10
+#   python -m benchmarks.replayTraffic traffic.log --speed max
+
+def readRecords(trafficFile: str):
+    with open(trafficFile, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+
+            if len(line) == 0:
+                continue
+
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # the last line can be cut off if the bot was killed mid-write
+                print(f'Skipping malformed traffic record: \"{line}\"')
+
+
+def createEvents(records, environment: BenchmarkEnvironment, cynanBot):
+    firstTime = None
+
+    for record in records:
+        kind = record.get('k')
+
+        if kind not in ('m', 'p'):
+            continue
+
+        if firstTime is None:
+            firstTime = record['t']
+
+        offsetSeconds = record['t'] - firstTime
+
+        if kind == 'm':
+            channel = environment.getChannel(record['c'])
+
+            if channel is None:
+                continue
+
+            message = FakeMessage(
+                author=FakeAuthor(id_=record['i'], name=record['a'], isMod=record.get('o') == 1),
+                channel=channel,
+                content=record['x']
+            )
+
+            eventKind = 'command' if message.content.startswith('!') else 'chat'
+            yield offsetSeconds, eventKind, lambda message=message: cynanBot.event_message(message)
+        else:
+            data = record['d']
+            yield offsetSeconds, 'pubsub', lambda data=data: cynanBot.event_raw_pubsub(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replays captured CynanBot chat and pub sub traffic')
+    parser.add_argument('trafficFile', help='traffic file written by TrafficRecorder')
+    parser.add_argument('--speed', default='1', help='playback speed multiplier (e.g. 1, 10), or \"max\"')
+    args = parser.parse_args()
+
+    speed = None
+    if args.speed.lower() != 'max':
+        speed = float(args.speed)
+
+    # The first pass only collects channels, so that the stand-in Helix API hands out the same
+    # user IDs as production did, and the users file has the same reward IDs, so the recorded
+    # pub sub frames line up with their channels and reach the same handlers.
+    helixUserIds = dict()
+    rewardIds = dict()
+    channelHandles = set()
+
+    for record in readRecords(args.trafficFile):
+        if record.get('k') == 'c':
+            helixUserIds[record['c']] = record['i']
+            rewardIds[record['c']] = record.get('r', dict())
+            channelHandles.add(record['c'])
+        elif record.get('k') == 'm':
+            channelHandles.add(record['c'].lower())
+
+    if len(channelHandles) == 0:
+        raise RuntimeError(f'No channels found in traffic file: \"{args.trafficFile}\"')
+
+    with tempfile.TemporaryDirectory(prefix='cynanBotReplay') as directory:
+        environment = BenchmarkEnvironment(
+            channelHandles=sorted(channelHandles),
+            directory=directory,
+            helixUserIds=helixUserIds,
+            rewardIds=rewardIds
+        )
+        cynanBot = environment.start()
+
+        latencyReport = LatencyReport()
+        eventDriver = EventDriver(latencyReport=latencyReport, speed=speed)
+
+        print(f'Replaying \"{args.trafficFile}\" across {len(channelHandles)} channel(s) at {args.speed} speed...')
+
+        try:
+            asyncio.get_event_loop().run_until_complete(eventDriver.run(
+                createEvents(readRecords(args.trafficFile), environment, cynanBot)
+            ))
+        finally:
+            environment.stop()
+
+        print(latencyReport.toStr(sentCount=environment.getSentCount()))
+
+
+if __name__ == '__main__':
+    main()
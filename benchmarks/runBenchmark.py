@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import random
+import tempfile
+
+from benchmarks.benchmarkEnvironment import BenchmarkEnvironment
+from benchmarks.eventDriver import EventDriver
+from benchmarks.fakeTwitch import (FakeAuthor, FakeMessage,
+                                   createRewardRedeemedFrame)
+from benchmarks.latencyReport import LatencyReport
+from benchmarks.localStandIns import createHelixUserId
+
+
+# Drives CynanBot with synthetic chat and pub sub traffic across a number of fake channels, with
+# local stand-ins for Helix, OpenWeather and IQAir. Run from the repository root:
+#
+#   python -m benchmarks.runBenchmark --channels 25 --rate 200 --duration 30
+
+CHAT_LINES = [ 'hello chat', 'catJAM', 'ratJAM', 'PogChamp', 'that was close', 'gg', 'lol' ]
+
+COMMANDS = [ '!commands', '!cuteness', '!discord', '!mycuteness', '!time', '!twitter', '!weather' ]
+
+
+class WorkloadGenerator():
+
+    def __init__(
+        self,
+        environment: BenchmarkEnvironment,
+        chattersPerChannel: int,
+        commandRatio: float,
+        pubSubRatio: float,
+        seed: int
+    ):
+        self.__environment = environment
+        self.__commandRatio = commandRatio
+        self.__pubSubRatio = pubSubRatio
+        self.__random = random.Random(seed)
+        self.__chatters = [ f'chatter{index}' for index in range(chattersPerChannel) ]
+
+    def __createChatEvent(self, cynanBot, kind: str, content: str):
+        handle = self.__random.choice(self.__environment.getChannelHandles())
+        chatter = self.__random.choice(self.__chatters)
+        isMod = self.__random.random() < 0.05
+
+        message = FakeMessage(
+            author=FakeAuthor(id_=createHelixUserId(chatter), name=chatter, isMod=isMod),
+            channel=self.__environment.getChannel(handle),
+            content=content
+        )
+
+        return kind, lambda: cynanBot.event_message(message)
+
+    def __createPubSubEvent(self, cynanBot):
+        handle = self.__random.choice(self.__environment.getChannelHandles())
+        chatter = self.__random.choice(self.__chatters)
+        roll = self.__random.random()
+
+        if roll < 0.8:
+            rewardId = self.__environment.getIncreaseCutenessRewardId()
+        elif roll < 0.85:
+            rewardId = self.__environment.getIncreaseCutenessDoubleRewardId()
+        else:
+            rewardId = self.__environment.getPkmnBattleRewardId()
+
+        frame = createRewardRedeemedFrame(
+            channelId=self.__environment.getChannelId(handle),
+            rewardId=rewardId,
+            userId=createHelixUserId(chatter),
+            userName=chatter,
+            userInput=self.__random.choice(self.__chatters)
+        )
+
+        return 'pubsub', lambda: cynanBot.event_raw_pubsub(frame)
+
+    def createEvent(self, cynanBot):
+        roll = self.__random.random()
+
+        if roll < self.__pubSubRatio:
+            return self.__createPubSubEvent(cynanBot)
+        elif self.__random.random() < self.__commandRatio:
+            # rolled separately, so that commandRatio is the share of chat messages (rather than of
+            # all events) that are commands, as --command-ratio says
+            command = self.__random.choice(COMMANDS)
+
+            if command == '!cuteness' and self.__random.random() < 0.5:
+                command = f'{command} {self.__random.choice(self.__chatters)}'
+
+            return self.__createChatEvent(cynanBot, 'command', command)
+        else:
+            return self.__createChatEvent(cynanBot, 'chat', self.__random.choice(CHAT_LINES))
+
+    def createEvents(self, cynanBot, rate: float, eventCount: int):
+        for index in range(eventCount):
+            kind, handler = self.createEvent(cynanBot)
+
+            if rate <= 0:
+                yield 0, kind, handler
+            else:
+                yield index / rate, kind, handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline CynanBot chat and pub sub benchmark')
+    parser.add_argument('--channels', type=int, default=10, help='number of fake channels')
+    parser.add_argument('--chatters', type=int, default=200, help='number of fake chatters per channel')
+    parser.add_argument('--rate', type=float, default=100, help='events per second, or 0 to run as fast as possible')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of traffic to generate')
+    parser.add_argument('--events', type=int, default=None, help='exact number of events, overrides --duration')
+    parser.add_argument('--command-ratio', type=float, default=0.3, help='fraction of chat messages that are commands')
+    parser.add_argument('--pubsub-ratio', type=float, default=0.1, help='fraction of events that are reward redemptions')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the generated workload')
+    args = parser.parse_args()
+
+    if args.events is not None:
+        eventCount = args.events
+    elif args.rate <= 0:
+        raise ValueError('--events is required when --rate is 0')
+    else:
+        eventCount = int(args.rate * args.duration)
+
+    with tempfile.TemporaryDirectory(prefix='cynanBotBenchmark') as directory:
+        environment = BenchmarkEnvironment(
+            channelHandles=[ f'benchmarkChannel{index}' for index in range(args.channels) ],
+            directory=directory
+        )
+        cynanBot = environment.start()
+
+        workloadGenerator = WorkloadGenerator(
+            environment=environment,
+            chattersPerChannel=args.chatters,
+            commandRatio=args.command_ratio,
+            pubSubRatio=args.pubsub_ratio,
+            seed=args.seed
+        )
+
+        latencyReport = LatencyReport()
+        eventDriver = EventDriver(
+            latencyReport=latencyReport,
+            speed=None if args.rate <= 0 else 1
+        )
+
+        print(f'Running {eventCount} event(s) across {args.channels} channel(s)...')
+
+        try:
+            asyncio.get_event_loop().run_until_complete(eventDriver.run(
+                workloadGenerator.createEvents(cynanBot, args.rate, eventCount)
+            ))
+        finally:
+            environment.stop()
+
+        print(latencyReport.toStr(sentCount=environment.getSentCount()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import CynanBotCommon.utils as utils
+
+
+class ChannelKey(str):
+
+    # A channel's handle, lowercased. Every distinct spelling of a handle is only lowercased once,
+    # after which ChannelKey(handle) is a single dict lookup that hands back the very same
+    # instance, so repositories can key on these without allocating or case folding anything, and
+    # comparing two of them usually stops at the identity check.
+    #
+    # Handles can come from outside (for example, the leaderboard server's URLs), so only so many
+    # are kept around. Past that, keys are still correct, they just aren't shared.
+    __slots__ = ()
+
+    __channelKeys = dict()
+    __maxChannelKeys = 4096
+
+    def __new__(cls, handle: str):
+        if type(handle) is ChannelKey:
+            return handle
+
+        channelKey = ChannelKey.__channelKeys.get(handle)
+
+        if channelKey is not None:
+            return channelKey
+        elif not utils.isValidStr(handle):
+            raise ValueError(f'handle argument is malformed: \"{handle}\"')
+
+        lowerHandle = handle.lower()
+        channelKey = ChannelKey.__channelKeys.get(lowerHandle)
+
+        if channelKey is None:
+            channelKey = super().__new__(cls, lowerHandle)
+
+        if len(ChannelKey.__channelKeys) < ChannelKey.__maxChannelKeys:
+            ChannelKey.__channelKeys[lowerHandle] = channelKey
+            ChannelKey.__channelKeys[handle] = channelKey
+
+        return channelKey
@@ -0,0 +1,75 @@
+import bisect
+import hashlib
+from typing import List
+
+import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
+
+
+class ConsistentHashRing():
+
+    def __init__(self, nodes: List[str], replicas: int = 128):
+        if not utils.hasItems(nodes):
+            raise ValueError(f'nodes argument is malformed: \"{nodes}\"')
+        elif not utils.isValidNum(replicas):
+            raise ValueError(f'replicas argument is malformed: \"{replicas}\"')
+        elif replicas < 1:
+            raise ValueError(f'replicas argument is out of bounds: \"{replicas}\"')
+
+        ring = list()
+
+        for node in nodes:
+            for replica in range(replicas):
+                ring.append((self.__hash(f'{node}:{replica}'), node))
+
+        ring.sort()
+        self.__hashes = [ hash_ for hash_, _ in ring ]
+        self.__nodes = [ node for _, node in ring ]
+
+    def getNode(self, key: str):
+        if not utils.isValidStr(key):
+            raise ValueError(f'key argument is malformed: \"{key}\"')
+
+        index = bisect.bisect(self.__hashes, self.__hash(key))
+
+        if index == len(self.__hashes):
+            index = 0
+
+        return self.__nodes[index]
+
+    def __hash(self, key: str):
+        # Python's built in hash() is randomized per process, so it can't be used here, as every
+        # shard (and the supervisor) has to agree on where each channel lives.
+        return int.from_bytes(hashlib.md5(key.encode('utf-8')).digest()[:8], 'big')
+
+
+class ChannelShard():
+
+    def __init__(self, shardIndex: int, shardCount: int):
+        if not utils.isValidNum(shardCount):
+            raise ValueError(f'shardCount argument is malformed: \"{shardCount}\"')
+        elif shardCount < 1:
+            raise ValueError(f'shardCount argument is out of bounds: \"{shardCount}\"')
+        elif not utils.isValidNum(shardIndex):
+            raise ValueError(f'shardIndex argument is malformed: \"{shardIndex}\"')
+        elif shardIndex < 0 or shardIndex >= shardCount:
+            raise ValueError(f'shardIndex argument is out of bounds: \"{shardIndex}\"')
+
+        self.__shardIndex = shardIndex
+        self.__shardCount = shardCount
+        self.__ring = ConsistentHashRing([ str(index) for index in range(shardCount) ])
+
+    def getShardCount(self):
+        return self.__shardCount
+
+    def getShardIndex(self):
+        return self.__shardIndex
+
+    def isInShard(self, handle: str):
+        if not utils.isValidStr(handle):
+            raise ValueError(f'handle argument is malformed: \"{handle}\"')
+
+        return self.__ring.getNode(ChannelKey(handle)) == str(self.__shardIndex)
+
+    def toStr(self):
+        return f'shard {self.__shardIndex + 1}/{self.__shardCount}'
@@ -0,0 +1,164 @@
+import argparse
+import csv
+import json
+import sys
+import time
+
+from backingDatabase import BackingDatabase
+from cutenessRepository import CutenessRepository
+from userIdsRepository import UserIdsRepository
+
+
+# Bulk cuteness administration, against the same database.sqlite that the bot uses. Every command
+# runs as a single transaction, so it's safe to run while the bot is up. Run from the repository
+# root:
+#
+#   python cutenessCli.py export cuteness.csv --channel smCharles
+#   python cutenessCli.py import cuteness.ndjson --replace
+#   python cutenessCli.py grant smCharles 5 user1 user2 user3
+#   python cutenessCli.py merge oldChannelName newChannelName
+#   python cutenessCli.py reset smCharles
+
+FIELD_NAMES = [ 'twitchChannel', 'userId', 'userName', 'cuteness' ]
+
+
+def getFileFormat(fileName: str, fileFormat: str):
+    if fileFormat is not None:
+        return fileFormat
+    elif fileName.lower().endswith('.ndjson') or fileName.lower().endswith('.jsonl'):
+        return 'ndjson'
+    else:
+        return 'csv'
+
+
+def exportCuteness(cutenessRepository: CutenessRepository, args):
+    rows = cutenessRepository.exportCuteness(twitchChannel=args.channel)
+    count = 0
+
+    with open(args.file, 'w', encoding='utf-8', newline='') as file:
+        if getFileFormat(args.file, args.format) == 'ndjson':
+            # newline delimited JSON, one object per row, so that it can be read back a row at a time
+            for row in rows:
+                file.write(json.dumps(dict(zip(FIELD_NAMES, row))))
+                file.write('\n')
+                count = count + 1
+        else:
+            writer = csv.writer(file)
+            writer.writerow(FIELD_NAMES)
+
+            for row in rows:
+                writer.writerow(row)
+                count = count + 1
+
+    return f'Exported {count} row(s) to \"{args.file}\"'
+
+
+def readNdjson(file):
+    for line in file:
+        line = line.strip()
+
+        if len(line) >= 1:
+            yield json.loads(line)
+
+
+def importCuteness(cutenessRepository: CutenessRepository, args):
+    with open(args.file, 'r', encoding='utf-8', newline='') as file:
+        # both formats are read a row at a time, so files of any size use the same little memory
+        if getFileFormat(args.file, args.format) == 'ndjson':
+            rows = ( (row['twitchChannel'], row['userId'], row.get('userName'), row['cuteness']) for row in readNdjson(file) )
+        else:
+            rows = ( (row['twitchChannel'], row['userId'], row.get('userName'), row['cuteness']) for row in csv.DictReader(file) )
+
+        result = cutenessRepository.importCuteness(rows=rows, isReplace=args.replace)
+
+    return f'Imported \"{args.file}\", {result.getUpdatedCountStr()} row(s) changed'
+
+
+def grantCuteness(cutenessRepository: CutenessRepository, args):
+    result = cutenessRepository.grantCuteness(
+        incrementAmount=args.amount,
+        twitchChannel=args.channel,
+        userNames=args.userNames
+    )
+
+    message = f'Gave {args.amount} cuteness to {result.getUpdatedCountStr()} user(s) in {args.channel}'
+
+    if result.hasMissingUserNames():
+        message = f'{message}, these user(s) aren\'t in the database: {", ".join(result.getMissingUserNames())}'
+
+    if result.hasAmbiguousUserNames():
+        message = f'{message}, these name(s) belong to more than one user so were skipped: {", ".join(result.getAmbiguousUserNames())}'
+
+    return message
+
+
+def mergeChannels(cutenessRepository: CutenessRepository, args):
+    result = cutenessRepository.mergeChannels(
+        sourceTwitchChannel=args.source,
+        targetTwitchChannel=args.target
+    )
+
+    return f'Merged {result.getUpdatedCountStr()} user(s) from {args.source} into {args.target}'
+
+
+def resetChannel(cutenessRepository: CutenessRepository, args):
+    result = cutenessRepository.resetChannel(twitchChannel=args.channel)
+    return f'Reset cuteness for {result.getUpdatedCountStr()} user(s) in {args.channel}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk cuteness administration')
+    parser.add_argument('--database', default='database.sqlite', help='database file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    exportParser = subparsers.add_parser('export', help='export cuteness to a CSV or newline delimited JSON file')
+    exportParser.add_argument('file')
+    exportParser.add_argument('--channel', default=None, help='only export this channel')
+    exportParser.add_argument('--format', choices=[ 'csv', 'ndjson' ], default=None, help='defaults to the file\'s extension')
+    exportParser.set_defaults(function=exportCuteness)
+
+    importParser = subparsers.add_parser('import', help='import cuteness from a CSV or newline delimited JSON file')
+    importParser.add_argument('file')
+    importParser.add_argument('--format', choices=[ 'csv', 'ndjson' ], default=None, help='defaults to the file\'s extension')
+    importParser.add_argument('--replace', action='store_true', help='replace existing cuteness rather than adding to it')
+    importParser.set_defaults(function=importCuteness)
+
+    grantParser = subparsers.add_parser('grant', help='give (or take away) cuteness for many users at once')
+    grantParser.add_argument('channel')
+    grantParser.add_argument('amount', type=int)
+    grantParser.add_argument('userNames', nargs='+')
+    grantParser.set_defaults(function=grantCuteness)
+
+    mergeParser = subparsers.add_parser('merge', help='move all of one channel\'s cuteness into another')
+    mergeParser.add_argument('source')
+    mergeParser.add_argument('target')
+    mergeParser.set_defaults(function=mergeChannels)
+
+    resetParser = subparsers.add_parser('reset', help='clear all of a channel\'s cuteness')
+    resetParser.add_argument('channel')
+    resetParser.set_defaults(function=resetChannel)
+
+    args = parser.parse_args()
+
+    backingDatabase = BackingDatabase(databaseFile=args.database)
+    userIdsRepository = UserIdsRepository(backingDatabase=backingDatabase)
+    cutenessRepository = CutenessRepository(
+        backingDatabase=backingDatabase,
+        leaderboardSize=10,
+        localLeaderboardSize=5,
+        userIdsRepository=userIdsRepository
+    )
+
+    startTime = time.perf_counter()
+
+    try:
+        message = args.function(cutenessRepository, args)
+    except (KeyError, ValueError) as e:
+        print(f'Error running {args.command}: {e}')
+        sys.exit(1)
+
+    print(f'{message} ({time.perf_counter() - startTime:.2f}s)')
+
+
+if __name__ == '__main__':
+    main()
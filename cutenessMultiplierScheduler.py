@@ -0,0 +1,169 @@
+import asyncio
+import math
+from datetime import timedelta
+from typing import Callable
+
+import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
+
+
+# Runs each channel's double cuteness window. A window starts the moment it's redeemed and ends
+# exactly when its timer fires (rather than whenever the next redemption happens to notice), at
+# which point every window ended listener is told about it. Redeeming it again while a window is
+# already running extends that window, up to maxWindowTimeDelta from now.
+
+class CutenessMultiplierScheduler():
+
+    def __init__(
+        self,
+        multiplier: int = 2,
+        windowTimeDelta: timedelta = timedelta(minutes=5),
+        maxWindowTimeDelta: timedelta = timedelta(minutes=30),
+        minExtensionTimeDelta: timedelta = timedelta(minutes=1)
+    ):
+        if not utils.isValidNum(multiplier):
+            raise ValueError(f'multiplier argument is malformed: \"{multiplier}\"')
+        elif multiplier < 1:
+            raise ValueError(f'multiplier argument is out of bounds: \"{multiplier}\"')
+        elif windowTimeDelta is None:
+            raise ValueError(f'windowTimeDelta argument is malformed: \"{windowTimeDelta}\"')
+        elif maxWindowTimeDelta is None:
+            raise ValueError(f'maxWindowTimeDelta argument is malformed: \"{maxWindowTimeDelta}\"')
+        elif maxWindowTimeDelta < windowTimeDelta:
+            raise ValueError(f'maxWindowTimeDelta ({maxWindowTimeDelta}) must be at least windowTimeDelta ({windowTimeDelta})')
+        elif minExtensionTimeDelta is None:
+            raise ValueError(f'minExtensionTimeDelta argument is malformed: \"{minExtensionTimeDelta}\"')
+
+        self.__multiplier = multiplier
+        self.__windowSeconds = windowTimeDelta.total_seconds()
+        self.__maxWindowSeconds = maxWindowTimeDelta.total_seconds()
+        self.__minExtensionSeconds = minExtensionTimeDelta.total_seconds()
+        self.__listeners = list()
+        self.__windows = dict()
+
+    def addWindowEndedListener(self, listener: Callable):
+        if listener is None:
+            raise ValueError(f'listener argument is malformed: \"{listener}\"')
+
+        self.__listeners.append(listener)
+
+    def __endWindow(self, window):
+        # only the window that scheduled this timer gets to end, in case it was replaced since
+        if self.__windows.get(window.getChannelKey()) is not window:
+            return
+
+        del self.__windows[window.getChannelKey()]
+        print(f'Double cuteness window in {window.getHandle()} has ended ({utils.getNowTimeText()})')
+
+        asyncio.get_event_loop().create_task(self.__notifyListeners(window))
+
+    def getMultiplier(self, handle: str):
+        window = self.__windows.get(ChannelKey(handle))
+
+        if window is None:
+            return 1
+
+        return window.getMultiplier()
+
+    def getWindow(self, handle: str):
+        return self.__windows.get(ChannelKey(handle))
+
+    async def __notifyListeners(self, window):
+        for listener in self.__listeners:
+            try:
+                await listener(window)
+            except Exception as e:
+                print(f'Error notifying of the end of the double cuteness window in {window.getHandle()}: {e}')
+
+    def startWindow(self, handle: str):
+        channelKey = ChannelKey(handle)
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        window = self.__windows.get(channelKey)
+
+        if window is None:
+            window = CutenessMultiplierWindow(
+                handle=handle,
+                multiplier=self.__multiplier,
+                endTime=now + self.__windowSeconds
+            )
+
+            self.__windows[channelKey] = window
+        else:
+            endTime = min(window.getEndTime() + self.__windowSeconds, now + self.__maxWindowSeconds)
+
+            # Once a window is at the cap, every redemption would only nudge it along by however
+            # long it's been since the last one. That isn't worth telling anyone about (or
+            # rescheduling for), so the window is left alone.
+            if endTime - window.getEndTime() < self.__minExtensionSeconds:
+                endTime = window.getEndTime()
+
+            if not window.extendTo(endTime):
+                return window
+
+        window.setTimerHandle(loop.call_at(window.getEndTime(), self.__endWindow, window))
+        return window
+
+
+class CutenessMultiplierWindow():
+
+    def __init__(self, handle: str, multiplier: int, endTime: float):
+        if not utils.isValidStr(handle):
+            raise ValueError(f'handle argument is malformed: \"{handle}\"')
+        elif not utils.isValidNum(multiplier):
+            raise ValueError(f'multiplier argument is malformed: \"{multiplier}\"')
+        elif not utils.isValidNum(endTime):
+            raise ValueError(f'endTime argument is malformed: \"{endTime}\"')
+
+        self.__handle = handle
+        self.__channelKey = ChannelKey(handle)
+        self.__multiplier = multiplier
+        self.__endTime = endTime
+        self.__redemptionCount = 1
+        self.__isExtended = False
+        self.__timerHandle = None
+
+    def extendTo(self, endTime: float):
+        # returns whether the end time actually moved, which it won't once it's hit the cap
+        self.__redemptionCount = self.__redemptionCount + 1
+        self.__isExtended = endTime > self.__endTime
+
+        if self.__isExtended:
+            self.__endTime = endTime
+
+        return self.__isExtended
+
+    def getChannelKey(self):
+        return self.__channelKey
+
+    def getEndTime(self):
+        return self.__endTime
+
+    def getHandle(self):
+        return self.__handle
+
+    def getMultiplier(self):
+        return self.__multiplier
+
+    def getRemainingMinutesStr(self):
+        remainingSeconds = max(0, self.__endTime - asyncio.get_event_loop().time())
+        remainingMinutes = math.ceil(remainingSeconds / 60)
+
+        if remainingMinutes == 1:
+            return '1 minute'
+        else:
+            return f'{remainingMinutes} minutes'
+
+    def isExtended(self):
+        # whether the latest redemption pushed this window's end time back
+        return self.__isExtended
+
+    def isNew(self):
+        return self.__redemptionCount == 1
+
+    def setTimerHandle(self, timerHandle):
+        # the old timer (if any) is cancelled, as this window now ends at a different time
+        if self.__timerHandle is not None:
+            self.__timerHandle.cancel()
+
+        self.__timerHandle = timerHandle
@@ -1,8 +1,11 @@
 import locale
+import time
+from datetime import datetime, timedelta
 from typing import List
 
 import CynanBotCommon.utils as utils
 from backingDatabase import BackingDatabase
+from channelKey import ChannelKey
 from userIdsRepository import UserIdsRepository
 
 
@@ -13,7 +16,8 @@ class CutenessRepository():
         backingDatabase: BackingDatabase,
         leaderboardSize: int,
         localLeaderboardSize: int,
-        userIdsRepository: UserIdsRepository
+        userIdsRepository: UserIdsRepository,
+        globalLeaderboardTimeDelta: timedelta = timedelta(minutes=1)
     ):
         if backingDatabase is None:
             raise ValueError(f'backingDatabase argument is malformed: \"{backingDatabase}\"')
@@ -27,24 +31,177 @@ class CutenessRepository():
             raise ValueError(f'localLeaderboardSize argument is out of bounds: \"{localLeaderboardSize}\"')
         elif userIdsRepository is None:
             raise ValueError(f'userIdsRepository argument is malformed: \"{userIdsRepository}\"')
+        elif globalLeaderboardTimeDelta is None:
+            raise ValueError(f'globalLeaderboardTimeDelta argument is malformed: \"{globalLeaderboardTimeDelta}\"')
 
         self.__backingDatabase = backingDatabase
         self.__leaderboardSize = leaderboardSize
         self.__localLeaderboardSize = localLeaderboardSize
         self.__userIdsRepository = userIdsRepository
+        self.__globalLeaderboardTimeDelta = globalLeaderboardTimeDelta
+        self.__globalLeaderboard = None
+        self.__globalLeaderboardTime = None
 
-        connection = backingDatabase.getConnection()
-        connection.execute(
+        backingDatabase.registerStatement(
+            name='cuteness.fetchCuteness',
+            sql='''
+                SELECT cuteness FROM cuteness
+                WHERE twitchChannel = ? AND userId = ?
             '''
-                CREATE TABLE IF NOT EXISTS cuteness (
-                    cuteness INTEGER NOT NULL DEFAULT 0,
-                    twitchChannel TEXT NOT NULL COLLATE NOCASE,
-                    userId TEXT NOT NULL COLLATE NOCASE,
-                    PRIMARY KEY (twitchChannel, userId)
-                )
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.fetchDailyLeaderboard',
+            sql='''
+                SELECT cuteness, userId FROM cutenessDaily
+                WHERE twitchChannel = ? AND day = ? AND cuteness >= 1 AND userId != ?
+                ORDER BY cuteness DESC
+                LIMIT ?
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.fetchGlobalCuteness',
+            sql='SELECT cuteness FROM cutenessGlobal WHERE userId = ?'
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.fetchGlobalLeaderboard',
+            sql='''
+                SELECT cuteness, userId FROM cutenessGlobal
+                WHERE cuteness >= 1
+                ORDER BY cuteness DESC
+                LIMIT ?
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.fetchLeaderboard',
+            sql='''
+                SELECT cuteness, userId FROM cuteness
+                WHERE twitchChannel = ? AND cuteness IS NOT NULL AND cuteness >= 1 AND userId != ?
+                ORDER BY cuteness DESC
+                LIMIT ?
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.fetchLeaderboardFirstPage',
+            sql='''
+                SELECT cuteness.cuteness, cuteness.userId, userIds.userName FROM cuteness
+                LEFT JOIN userIds ON userIds.userId = cuteness.userId
+                WHERE cuteness.twitchChannel = ? AND cuteness.cuteness >= 1
+                ORDER BY cuteness.cuteness DESC, cuteness.userId ASC
+                LIMIT ?
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.fetchLeaderboardNextPage',
+            sql='''
+                SELECT cuteness.cuteness, cuteness.userId, userIds.userName FROM cuteness
+                LEFT JOIN userIds ON userIds.userId = cuteness.userId
+                WHERE cuteness.twitchChannel = ? AND cuteness.cuteness >= 1
+                    AND cuteness.cuteness <= ? AND (cuteness.cuteness < ? OR cuteness.userId > ?)
+                ORDER BY cuteness.cuteness DESC, cuteness.userId ASC
+                LIMIT ?
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.fetchLocalLeaderboard',
+            sql='''
+                SELECT cuteness, userId FROM cuteness
+                WHERE twitchChannel = ? AND cuteness IS NOT NULL AND cuteness >= 1 AND userId != ?
+                ORDER BY ABS(? - ABS(cuteness)) ASC
+                LIMIT ?
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.incrementCuteness',
+            sql='''
+                INSERT INTO cuteness (cuteness, twitchChannel, userId)
+                VALUES (MAX(0, ?), ?, ?)
+                ON CONFLICT (twitchChannel, userId) DO UPDATE SET cuteness = MAX(0, cuteness + ?)
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.fetchWeeklyLeaderboard',
+            sql='''
+                SELECT cuteness, userId FROM cutenessWeekly
+                WHERE twitchChannel = ? AND week = ? AND cuteness >= 1 AND userId != ?
+                ORDER BY cuteness DESC
+                LIMIT ?
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.insertEvent',
+            sql='''
+                INSERT INTO cutenessEvents (createdAt, incrementAmount, twitchChannel, userId)
+                VALUES (?, ?, ?, ?)
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.incrementGlobal',
+            sql='''
+                INSERT INTO cutenessGlobal (cuteness, userId)
+                VALUES (?, ?)
+                ON CONFLICT (userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.incrementDaily',
+            sql='''
+                INSERT INTO cutenessDaily (cuteness, day, twitchChannel, userId)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (twitchChannel, day, userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cuteness.incrementWeekly',
+            sql='''
+                INSERT INTO cutenessWeekly (cuteness, twitchChannel, userId, week)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (twitchChannel, week, userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
             '''
         )
-        connection.commit()
+
+        self.__registerBulkStatements(backingDatabase)
+
+        # temporary tables only live as long as the connection does, and are only visible to it
+        backingDatabase.execute('cutenessBulk.createTables')
+        backingDatabase.execute('cutenessBulk.createUserNamesTable')
+
+    def __applyBulkCuteness(self, isLogged: bool):
+        # Expects bulkCuteness to already be filled in with each row's old and new cuteness, and
+        # then writes all of them at once. Grants are logged (and so show up in the daily and
+        # weekly leaderboards) just like !givecuteness is, imports are not.
+        self.__backingDatabase.execute('cutenessBulk.applyCuteness')
+        self.__backingDatabase.execute('cutenessBulk.applyGlobal')
+
+        if isLogged:
+            now = int(time.time())
+            self.__backingDatabase.execute('cutenessBulk.logEvents', (now, ))
+            self.__backingDatabase.execute('cutenessBulk.logDaily', (self.__getDay(now), ))
+            self.__backingDatabase.execute('cutenessBulk.logWeekly', (self.__getWeek(now), ))
+
+        self.__globalLeaderboard = None
+        return self.__backingDatabase.fetchOne('cutenessBulk.countChanged')[0]
+
+    def __deleteChannel(self, twitchChannel: str):
+        deletedCount = self.__backingDatabase.execute('cutenessBulk.deleteCuteness', (twitchChannel, )).rowcount
+        self.__backingDatabase.execute('cutenessBulk.deleteDaily', (twitchChannel, ))
+        self.__backingDatabase.execute('cutenessBulk.deleteWeekly', (twitchChannel, ))
+        return deletedCount
+
+    def exportCuteness(self, twitchChannel: str = None):
+        # Yields (twitchChannel, userId, userName, cuteness) tuples straight off of the cursor,
+        # so that exporting a big database doesn't mean holding all of it in memory.
+        if twitchChannel is None:
+            cursor = self.__backingDatabase.execute('cutenessBulk.exportAll')
+        elif utils.isValidStr(twitchChannel):
+            cursor = self.__backingDatabase.execute('cutenessBulk.exportChannel', (twitchChannel, ))
+        else:
+            raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
+
+        try:
+            for row in cursor:
+                yield row
+        finally:
+            cursor.close()
 
     def fetchCuteness(self, twitchChannel: str, userName: str):
         if not utils.isValidStr(twitchChannel):
@@ -53,23 +210,12 @@ class CutenessRepository():
             raise ValueError(f'userName argument is malformed: \"{userName}\"')
 
         userId = self.__userIdsRepository.fetchUserId(userName=userName)
-
-        cursor = self.__backingDatabase.getConnection().cursor()
-        cursor.execute(
-            '''
-                SELECT cuteness FROM cuteness
-                WHERE twitchChannel = ? AND userId = ?
-            ''',
-            (twitchChannel, userId)
-        )
-        row = cursor.fetchone()
+        row = self.__backingDatabase.fetchOne('cuteness.fetchCuteness', (twitchChannel, userId))
 
         cuteness = None
         if row is not None:
             cuteness = row[0]
 
-        cursor.close()
-
         return CutenessResult(
             cuteness=cuteness,
             localLeaderboard=None,
@@ -91,19 +237,9 @@ class CutenessRepository():
             raise ValueError(f'userName argument is malformed: \"{userName}\"')
 
         self.__userIdsRepository.setUser(userId=userId, userName=userName)
-
-        cursor = self.__backingDatabase.getConnection().cursor()
-        cursor.execute(
-            '''
-                SELECT cuteness FROM cuteness
-                WHERE twitchChannel = ? AND userId = ?
-            ''',
-            (twitchChannel, userId)
-        )
-        row = cursor.fetchone()
+        row = self.__backingDatabase.fetchOne('cuteness.fetchCuteness', (twitchChannel, userId))
 
         if row is None:
-            cursor.close()
             return CutenessResult(
                 cuteness=0,
                 localLeaderboard=None,
@@ -113,20 +249,12 @@ class CutenessRepository():
 
         cuteness = row[0]
 
-        cursor.execute(
-            '''
-                SELECT cuteness, userId FROM cuteness
-                WHERE twitchChannel = ? AND cuteness IS NOT NULL AND cuteness >= 1 AND userId != ?
-                ORDER BY ABS(? - ABS(cuteness)) ASC
-                LIMIT ?
-            ''',
+        rows = self.__backingDatabase.fetchAll(
+            'cuteness.fetchLocalLeaderboard',
             (twitchChannel, userId, cuteness, self.__localLeaderboardSize)
         )
 
-        rows = cursor.fetchmany(size=self.__localLeaderboardSize)
-
         if len(rows) == 0:
-            cursor.close()
             return CutenessResult(
                 cuteness=cuteness,
                 localLeaderboard=None,
@@ -158,8 +286,6 @@ class CutenessRepository():
                 # Just log the error and continue, there's nothing more we can do to recover.
                 print(f'Encountered a user ID that has no username: \"{row[1]}\"')
 
-        cursor.close()
-
         return CutenessResult(
             cuteness=cuteness,
             localLeaderboard=localLeaderboard,
@@ -185,37 +311,28 @@ class CutenessRepository():
 
         self.__userIdsRepository.setUser(userId=userId, userName=userName)
 
-        connection = self.__backingDatabase.getConnection()
-        cursor = connection.cursor()
-        cursor.execute(
-            '''
-                SELECT cuteness FROM cuteness
-                WHERE twitchChannel = ? AND userId = ?
-            ''',
-            (twitchChannel, userId)
-        )
-        row = cursor.fetchone()
-
-        cuteness = 0
-        if row is not None:
-            cuteness = row[0]
+        # Multiple shard processes can share this database, so the increment happens inside of the
+        # database itself (rather than as a separate read and then write), under a write lock.
+        with self.__backingDatabase.transaction():
+            row = self.__backingDatabase.fetchOne('cuteness.fetchCuteness', (twitchChannel, userId))
 
-        cuteness = cuteness + incrementAmount
+            oldCuteness = 0
+            if row is not None:
+                oldCuteness = row[0]
 
-        if cuteness < 0:
-            cuteness = 0
-
-        cursor.execute(
-            '''
-                INSERT INTO cuteness (cuteness, twitchChannel, userId)
-                VALUES (?, ?, ?)
-                ON CONFLICT (twitchChannel, userId) DO UPDATE SET cuteness = excluded.cuteness
-            ''',
-            (cuteness, twitchChannel, userId)
-        )
-
-        connection.commit()
-        cursor.close()
+            self.__backingDatabase.execute(
+                'cuteness.incrementCuteness',
+                (incrementAmount, twitchChannel, userId, incrementAmount)
+            )
+            cuteness = self.__backingDatabase.fetchOne('cuteness.fetchCuteness', (twitchChannel, userId))[0]
+
+            # cuteness never goes below 0, so what's logged is what actually changed, which keeps
+            # the rollups (and the global total) adding up to the running total
+            self.__logCutenessEvent(
+                incrementAmount=cuteness - oldCuteness,
+                twitchChannel=twitchChannel,
+                userId=userId
+            )
 
         return CutenessResult(
             cuteness=cuteness,
@@ -224,6 +341,30 @@ class CutenessRepository():
             userName=userName
         )
 
+    def fetchDailyLeaderboard(self, twitchChannel: str):
+        if not utils.isValidStr(twitchChannel):
+            raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
+
+        twitchChannelUserId = self.__userIdsRepository.fetchUserId(
+            userName=twitchChannel)
+
+        return self.__fetchLeaderboard(self.__backingDatabase.fetchAll(
+            'cuteness.fetchDailyLeaderboard',
+            (twitchChannel, self.__getDay(), twitchChannelUserId, self.__leaderboardSize)
+        ))
+
+    def fetchGlobalLeaderboard(self):
+        if self.__globalLeaderboard is None or datetime.now() >= self.__globalLeaderboardTime + self.__globalLeaderboardTimeDelta:
+            # Our own increments keep this up to date, but other shards' increments only show up
+            # when it's reloaded, which is why it's also reloaded every so often.
+            self.__globalLeaderboard = self.__backingDatabase.fetchAll(
+                'cuteness.fetchGlobalLeaderboard',
+                (self.__leaderboardSize, )
+            )
+            self.__globalLeaderboardTime = datetime.now()
+
+        return self.__fetchLeaderboard(self.__globalLeaderboard)
+
     def fetchLeaderboard(self, twitchChannel: str):
         if not utils.isValidStr(twitchChannel):
             raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
@@ -231,22 +372,72 @@ class CutenessRepository():
         twitchChannelUserId = self.__userIdsRepository.fetchUserId(
             userName=twitchChannel)
 
-        cursor = self.__backingDatabase.getConnection().cursor()
-        cursor.execute(
-            '''
-                SELECT cuteness, userId FROM cuteness
-                WHERE twitchChannel = ? AND cuteness IS NOT NULL AND cuteness >= 1 AND userId != ?
-                ORDER BY cuteness DESC
-                LIMIT ?
-            ''',
+        return self.__fetchLeaderboard(self.__backingDatabase.fetchAll(
+            'cuteness.fetchLeaderboard',
             (twitchChannel, twitchChannelUserId, self.__leaderboardSize)
+        ))
+
+    def fetchLeaderboardPage(
+        self,
+        twitchChannel: str,
+        pageSize: int = 500,
+        afterCursor: str = None
+    ):
+        if not utils.isValidStr(twitchChannel):
+            raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
+        elif not utils.isValidNum(pageSize):
+            raise ValueError(f'pageSize argument is malformed: \"{pageSize}\"')
+        elif pageSize < 1 or pageSize > 5000:
+            raise ValueError(f'pageSize argument is out of bounds: \"{pageSize}\"')
+
+        # Keyset pagination: each page picks up right after the last row of the previous one
+        # (rather than using OFFSET), so every page is a short walk along the index no matter
+        # how far into the ranking it is. The cursor condition leads with cuteness <= ?, as that's
+        # what lets SQLite seek straight to the cursor in the index rather than scanning down to it.
+        if utils.isValidStr(afterCursor):
+            afterCuteness, afterUserId, afterRank = self.__parseLeaderboardCursor(afterCursor)
+            rows = self.__backingDatabase.fetchAll(
+                'cuteness.fetchLeaderboardNextPage',
+                (twitchChannel, afterCuteness, afterCuteness, afterUserId, pageSize)
+            )
+        else:
+            afterRank = 0
+            rows = self.__backingDatabase.fetchAll(
+                'cuteness.fetchLeaderboardFirstPage',
+                (twitchChannel, pageSize)
+            )
+
+        entries = list()
+        rank = afterRank
+
+        for cuteness, userId, userName in rows:
+            rank = rank + 1
+
+            if not utils.isValidStr(userName):
+                # see fetchCutenessAndLocalLeaderboard for why this can happen
+                userName = userId
+
+            entries.append(LeaderboardEntry(
+                cuteness=cuteness,
+                rank=rank,
+                userId=userId,
+                userName=userName
+            ))
+
+        nextCursor = None
+        if len(entries) == pageSize:
+            lastEntry = entries[len(entries) - 1]
+            nextCursor = f'{lastEntry.getCuteness()}:{lastEntry.getRank()}:{lastEntry.getUserId()}'
+
+        return LeaderboardPage(
+            entries=entries,
+            nextCursor=nextCursor
         )
 
-        rows = cursor.fetchmany(size=self.__leaderboardSize)
+    def __fetchLeaderboard(self, rows: List):
         entries = list()
 
         if len(rows) == 0:
-            cursor.close()
             return LeaderboardResult(
                 entries=entries
             )
@@ -263,12 +454,434 @@ class CutenessRepository():
             ))
             rank = rank + 1
 
-        cursor.close()
-
         return LeaderboardResult(
             entries=entries
         )
 
+    def fetchWeeklyLeaderboard(self, twitchChannel: str):
+        if not utils.isValidStr(twitchChannel):
+            raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
+
+        twitchChannelUserId = self.__userIdsRepository.fetchUserId(
+            userName=twitchChannel)
+
+        return self.__fetchLeaderboard(self.__backingDatabase.fetchAll(
+            'cuteness.fetchWeeklyLeaderboard',
+            (twitchChannel, self.__getWeek(), twitchChannelUserId, self.__leaderboardSize)
+        ))
+
+    def __getDay(self, now: int = None):
+        if now is None:
+            now = int(time.time())
+
+        # days (and weeks) are in UTC, so that every shard agrees on when they roll over
+        return now // 86400
+
+    def __getWeek(self, now: int = None):
+        # 1970-01-01 was a Thursday, the + 3 makes weeks start on Mondays
+        return (self.__getDay(now) + 3) // 7
+
+    def grantCuteness(self, incrementAmount: int, twitchChannel: str, userNames: List[str]):
+        if incrementAmount is None:
+            raise ValueError(f'incrementAmount argument is malformed: \"{incrementAmount}\"')
+        elif not utils.isValidStr(twitchChannel):
+            raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
+        elif not utils.hasItems(userNames):
+            raise ValueError(f'userNames argument is malformed: \"{userNames}\"')
+
+        with self.__backingDatabase.transaction():
+            self.__backingDatabase.execute('cutenessBulk.clear')
+            self.__backingDatabase.execute('cutenessBulk.clearUserNames')
+            self.__backingDatabase.executeMany(
+                'cutenessBulk.insertUserName',
+                ((userName, ) for userName in userNames if utils.isValidStr(userName))
+            )
+
+            # User names are resolved with a join, rather than one fetchUserId call per user. A
+            # user name isn't unique in userIds (someone can take a name that someone else gave
+            # up), so any name that matches more than one user is skipped rather than guessed at.
+            self.__backingDatabase.execute('cutenessBulk.insertUserNameGrants', (incrementAmount, twitchChannel))
+            ambiguousUserNames = [ row[0] for row in self.__backingDatabase.fetchAll('cutenessBulk.fetchAmbiguousUserNames') ]
+            missingUserNames = [ row[0] for row in self.__backingDatabase.fetchAll('cutenessBulk.fetchMissingUserNames') ]
+
+            self.__backingDatabase.execute('cutenessBulk.fetchOldCuteness')
+            self.__backingDatabase.execute('cutenessBulk.computeIncrement')
+            updatedCount = self.__applyBulkCuteness(isLogged=True)
+
+        return BulkCutenessResult(
+            updatedCount=updatedCount,
+            ambiguousUserNames=ambiguousUserNames,
+            missingUserNames=missingUserNames
+        )
+
+    def importCuteness(self, rows, isReplace: bool = False):
+        # Takes (twitchChannel, userId, userName, cuteness) tuples, like exportCuteness yields.
+        # These are streamed into a temporary table with executemany, and then applied all at
+        # once, in a single transaction. With isReplace, each row's cuteness replaces what's
+        # there already, otherwise it's added on top of it.
+        if rows is None:
+            raise ValueError(f'rows argument is malformed: \"{rows}\"')
+        elif isReplace is None:
+            raise ValueError(f'isReplace argument is malformed: \"{isReplace}\"')
+
+        with self.__backingDatabase.transaction():
+            self.__backingDatabase.execute('cutenessBulk.clear')
+            self.__backingDatabase.executeMany(
+                'cutenessBulk.insert',
+                ((int(cuteness), twitchChannel, userId, userName) for twitchChannel, userId, userName, cuteness in rows)
+            )
+
+            self.__backingDatabase.execute('cutenessBulk.setUserNames')
+            self.__backingDatabase.execute('cutenessBulk.fetchOldCuteness')
+
+            if isReplace:
+                self.__backingDatabase.execute('cutenessBulk.computeReplace')
+            else:
+                self.__backingDatabase.execute('cutenessBulk.computeIncrement')
+
+            updatedCount = self.__applyBulkCuteness(isLogged=False)
+
+        return BulkCutenessResult(
+            updatedCount=updatedCount
+        )
+
+    def __logCutenessEvent(self, incrementAmount: int, twitchChannel: str, userId: str):
+        if incrementAmount == 0:
+            return
+
+        now = int(time.time())
+
+        self.__backingDatabase.execute(
+            'cuteness.insertEvent',
+            (now, incrementAmount, twitchChannel, userId)
+        )
+        self.__backingDatabase.execute(
+            'cuteness.incrementDaily',
+            (incrementAmount, self.__getDay(now), twitchChannel, userId)
+        )
+        self.__backingDatabase.execute(
+            'cuteness.incrementWeekly',
+            (incrementAmount, twitchChannel, userId, self.__getWeek(now))
+        )
+        self.__backingDatabase.execute(
+            'cuteness.incrementGlobal',
+            (incrementAmount, userId)
+        )
+
+        if self.__globalLeaderboard is not None:
+            globalCuteness = self.__backingDatabase.fetchOne('cuteness.fetchGlobalCuteness', (userId, ))[0]
+            self.__updateGlobalLeaderboard(incrementAmount, globalCuteness, userId)
+
+    def mergeChannels(self, sourceTwitchChannel: str, targetTwitchChannel: str):
+        if not utils.isValidStr(sourceTwitchChannel):
+            raise ValueError(f'sourceTwitchChannel argument is malformed: \"{sourceTwitchChannel}\"')
+        elif not utils.isValidStr(targetTwitchChannel):
+            raise ValueError(f'targetTwitchChannel argument is malformed: \"{targetTwitchChannel}\"')
+        elif ChannelKey(sourceTwitchChannel) == ChannelKey(targetTwitchChannel):
+            raise ValueError(f'Can\'t merge a channel into itself: \"{sourceTwitchChannel}\"')
+
+        # every user keeps the same total, it's just all in one channel now, which is why the
+        # global totals don't change
+        with self.__backingDatabase.transaction():
+            updatedCount = self.__backingDatabase.execute(
+                'cutenessBulk.mergeCuteness',
+                (targetTwitchChannel, sourceTwitchChannel)
+            ).rowcount
+
+            self.__backingDatabase.execute('cutenessBulk.mergeDaily', (targetTwitchChannel, sourceTwitchChannel))
+            self.__backingDatabase.execute('cutenessBulk.mergeWeekly', (targetTwitchChannel, sourceTwitchChannel))
+            self.__backingDatabase.execute('cutenessBulk.mergeEvents', (targetTwitchChannel, sourceTwitchChannel))
+            self.__deleteChannel(sourceTwitchChannel)
+
+        return BulkCutenessResult(
+            updatedCount=updatedCount
+        )
+
+    def __parseLeaderboardCursor(self, cursor: str):
+        try:
+            cuteness, rank, userId = cursor.split(':', 2)
+            return int(cuteness), userId, int(rank)
+        except ValueError:
+            raise ValueError(f'Leaderboard cursor is malformed: \"{cursor}\"')
+
+    def __registerBulkStatements(self, backingDatabase: BackingDatabase):
+        backingDatabase.registerStatement(
+            name='cutenessBulk.applyCuteness',
+            sql='''
+                INSERT INTO cuteness (cuteness, twitchChannel, userId)
+                SELECT newCuteness, twitchChannel, userId FROM bulkCuteness
+                WHERE newCuteness != oldCuteness
+                ON CONFLICT (twitchChannel, userId) DO UPDATE SET cuteness = excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.applyGlobal',
+            sql='''
+                INSERT INTO cutenessGlobal (cuteness, userId)
+                SELECT SUM(newCuteness - oldCuteness), userId FROM bulkCuteness
+                WHERE newCuteness != oldCuteness
+                GROUP BY userId
+                ON CONFLICT (userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.clear',
+            sql='DELETE FROM bulkCuteness'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.clearUserNames',
+            sql='DELETE FROM bulkUserNames'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.createTables',
+            sql='''
+                CREATE TEMP TABLE IF NOT EXISTS bulkCuteness (
+                    cuteness INTEGER NOT NULL,
+                    newCuteness INTEGER,
+                    oldCuteness INTEGER,
+                    twitchChannel TEXT NOT NULL COLLATE NOCASE,
+                    userId TEXT NOT NULL COLLATE NOCASE,
+                    userName TEXT COLLATE NOCASE,
+                    PRIMARY KEY (twitchChannel, userId)
+                )
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.createUserNamesTable',
+            sql='CREATE TEMP TABLE IF NOT EXISTS bulkUserNames (userName TEXT NOT NULL PRIMARY KEY COLLATE NOCASE)'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.computeIncrement',
+            sql='UPDATE bulkCuteness SET newCuteness = MAX(0, oldCuteness + cuteness)'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.computeReplace',
+            sql='UPDATE bulkCuteness SET newCuteness = MAX(0, cuteness)'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.countChanged',
+            sql='SELECT COUNT(*) FROM bulkCuteness WHERE newCuteness != oldCuteness'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.deleteCuteness',
+            sql='DELETE FROM cuteness WHERE twitchChannel = ?'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.deleteDaily',
+            sql='DELETE FROM cutenessDaily WHERE twitchChannel = ?'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.deleteWeekly',
+            sql='DELETE FROM cutenessWeekly WHERE twitchChannel = ?'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.exportAll',
+            sql='''
+                SELECT cuteness.twitchChannel, cuteness.userId, userIds.userName, cuteness.cuteness FROM cuteness
+                LEFT JOIN userIds ON userIds.userId = cuteness.userId
+                ORDER BY cuteness.twitchChannel ASC, cuteness.cuteness DESC
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.exportChannel',
+            sql='''
+                SELECT cuteness.twitchChannel, cuteness.userId, userIds.userName, cuteness.cuteness FROM cuteness
+                LEFT JOIN userIds ON userIds.userId = cuteness.userId
+                WHERE cuteness.twitchChannel = ?
+                ORDER BY cuteness.cuteness DESC
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.fetchAmbiguousUserNames',
+            sql='''
+                SELECT bulkUserNames.userName FROM bulkUserNames
+                JOIN userIds ON userIds.userName = bulkUserNames.userName
+                GROUP BY bulkUserNames.userName
+                HAVING COUNT(*) > 1
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.fetchMissingUserNames',
+            sql='''
+                SELECT userName FROM bulkUserNames
+                WHERE userName NOT IN (SELECT userName FROM userIds)
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.fetchOldCuteness',
+            sql='''
+                UPDATE bulkCuteness SET oldCuteness = COALESCE((
+                    SELECT cuteness.cuteness FROM cuteness
+                    WHERE cuteness.twitchChannel = bulkCuteness.twitchChannel AND cuteness.userId = bulkCuteness.userId
+                ), 0)
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.insert',
+            sql='''
+                INSERT INTO bulkCuteness (cuteness, twitchChannel, userId, userName)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (twitchChannel, userId) DO UPDATE SET cuteness = excluded.cuteness, userName = excluded.userName
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.insertUserName',
+            sql='INSERT OR IGNORE INTO bulkUserNames (userName) VALUES (?)'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.insertUserNameGrants',
+            sql='''
+                INSERT OR IGNORE INTO bulkCuteness (cuteness, twitchChannel, userId)
+                SELECT ?, ?, MIN(userIds.userId) FROM bulkUserNames
+                JOIN userIds ON userIds.userName = bulkUserNames.userName
+                GROUP BY bulkUserNames.userName
+                HAVING COUNT(*) = 1
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.logDaily',
+            sql='''
+                INSERT INTO cutenessDaily (cuteness, day, twitchChannel, userId)
+                SELECT newCuteness - oldCuteness, ?, twitchChannel, userId FROM bulkCuteness
+                WHERE newCuteness != oldCuteness
+                ON CONFLICT (twitchChannel, day, userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.logEvents',
+            sql='''
+                INSERT INTO cutenessEvents (createdAt, incrementAmount, twitchChannel, userId)
+                SELECT ?, newCuteness - oldCuteness, twitchChannel, userId FROM bulkCuteness
+                WHERE newCuteness != oldCuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.logWeekly',
+            sql='''
+                INSERT INTO cutenessWeekly (cuteness, twitchChannel, userId, week)
+                SELECT newCuteness - oldCuteness, twitchChannel, userId, ? FROM bulkCuteness
+                WHERE newCuteness != oldCuteness
+                ON CONFLICT (twitchChannel, week, userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.mergeCuteness',
+            sql='''
+                INSERT INTO cuteness (cuteness, twitchChannel, userId)
+                SELECT cuteness, ?, userId FROM cuteness
+                WHERE twitchChannel = ?
+                ON CONFLICT (twitchChannel, userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.mergeDaily',
+            sql='''
+                INSERT INTO cutenessDaily (cuteness, day, twitchChannel, userId)
+                SELECT cuteness, day, ?, userId FROM cutenessDaily
+                WHERE twitchChannel = ?
+                ON CONFLICT (twitchChannel, day, userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.mergeEvents',
+            sql='UPDATE cutenessEvents SET twitchChannel = ? WHERE twitchChannel = ?'
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.mergeWeekly',
+            sql='''
+                INSERT INTO cutenessWeekly (cuteness, twitchChannel, userId, week)
+                SELECT cuteness, ?, userId, week FROM cutenessWeekly
+                WHERE twitchChannel = ?
+                ON CONFLICT (twitchChannel, week, userId) DO UPDATE SET cuteness = cuteness + excluded.cuteness
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.resetGlobal',
+            sql='''
+                UPDATE cutenessGlobal SET cuteness = cuteness - (
+                    SELECT cuteness.cuteness FROM cuteness
+                    WHERE cuteness.twitchChannel = ? AND cuteness.userId = cutenessGlobal.userId
+                )
+                WHERE userId IN (SELECT userId FROM cuteness WHERE twitchChannel = ?)
+            '''
+        )
+        backingDatabase.registerStatement(
+            name='cutenessBulk.setUserNames',
+            sql='''
+                INSERT INTO userIds (userId, userName)
+                SELECT userId, userName FROM bulkCuteness
+                WHERE userName IS NOT NULL AND userName != ''
+                ON CONFLICT (userId) DO UPDATE SET userName = excluded.userName
+                WHERE userName != excluded.userName COLLATE BINARY
+            '''
+        )
+
+    def resetChannel(self, twitchChannel: str):
+        if not utils.isValidStr(twitchChannel):
+            raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
+
+        # the event log is history, so it's left alone
+        with self.__backingDatabase.transaction():
+            self.__backingDatabase.execute('cutenessBulk.resetGlobal', (twitchChannel, twitchChannel))
+            updatedCount = self.__deleteChannel(twitchChannel)
+
+        self.__globalLeaderboard = None
+
+        return BulkCutenessResult(
+            updatedCount=updatedCount
+        )
+
+    def __updateGlobalLeaderboard(self, incrementAmount: int, globalCuteness: int, userId: str):
+        entries = [ entry for entry in self.__globalLeaderboard if entry[1] != userId ]
+
+        if incrementAmount < 0:
+            # someone that isn't in the top N right now could have overtaken this user, so it's
+            # easiest to just reload the whole thing next time
+            if len(entries) != len(self.__globalLeaderboard):
+                self.__globalLeaderboard = None
+
+            return
+
+        # Anyone not in a full top N has at most the lowest cuteness in it, so an increase can
+        # only ever move this user up into it or within it.
+        entries.append((globalCuteness, userId))
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        self.__globalLeaderboard = entries[:self.__leaderboardSize]
+
+
+class BulkCutenessResult():
+
+    def __init__(
+        self,
+        updatedCount: int,
+        ambiguousUserNames: List[str] = None,
+        missingUserNames: List[str] = None
+    ):
+        if updatedCount is None:
+            raise ValueError(f'updatedCount argument is malformed: \"{updatedCount}\"')
+
+        self.__updatedCount = updatedCount
+        self.__ambiguousUserNames = ambiguousUserNames
+        self.__missingUserNames = missingUserNames
+
+    def getAmbiguousUserNames(self):
+        return self.__ambiguousUserNames
+
+    def getMissingUserNames(self):
+        return self.__missingUserNames
+
+    def getUpdatedCount(self):
+        return self.__updatedCount
+
+    def getUpdatedCountStr(self):
+        return locale.format_string("%d", self.__updatedCount, grouping=True)
+
+    def hasAmbiguousUserNames(self):
+        return self.__ambiguousUserNames is not None and len(self.__ambiguousUserNames) >= 1
+
+    def hasMissingUserNames(self):
+        return self.__missingUserNames is not None and len(self.__missingUserNames) >= 1
+
 
 class CutenessResult():
 
@@ -351,6 +964,36 @@ class LeaderboardResult():
         return delimiter.join(strings)
 
 
+class LeaderboardPage():
+
+    def __init__(self, entries: List, nextCursor: str = None):
+        if entries is None:
+            raise ValueError(f'entries argument is malformed: \"{entries}\"')
+
+        self.__entries = entries
+        self.__nextCursor = nextCursor
+
+    def getEntries(self):
+        return self.__entries
+
+    def getNextCursor(self):
+        return self.__nextCursor
+
+    def hasNextCursor(self):
+        return utils.isValidStr(self.__nextCursor)
+
+    def toJson(self):
+        return {
+            'entries': [ {
+                'cuteness': entry.getCuteness(),
+                'rank': entry.getRank(),
+                'userId': entry.getUserId(),
+                'userName': entry.getUserName()
+            } for entry in self.__entries ],
+            'nextCursor': self.__nextCursor
+        }
+
+
 class LeaderboardEntry():
 
     def __init__(
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import locale
 import random
@@ -8,42 +9,66 @@ import requests
 from twitchio.ext import commands
 
 import CynanBotCommon.utils as utils
+from analogueStockPoller import AnalogueStockPoller
 from authHelper import AuthHelper
+from cutenessMultiplierScheduler import (CutenessMultiplierScheduler,
+                                         CutenessMultiplierWindow)
 from cutenessRepository import (CutenessRepository, CutenessResult,
                                 LeaderboardResult)
-from CynanBotCommon.analogueStoreRepository import (AnalogueStoreRepository,
-                                                    AnalogueStoreStock)
+from CynanBotCommon.analogueStoreRepository import AnalogueStoreStock
 from CynanBotCommon.jishoHelper import JishoHelper, JishoResult
 from CynanBotCommon.jokesRepository import JokeResponse, JokesRepository
 from CynanBotCommon.timedDict import TimedDict
 from CynanBotCommon.wordOfTheDayRepository import (LanguageEntry, LanguageList,
                                                    WordOfTheDayRepository,
                                                    Wotd)
+from leaderboardServer import LeaderboardServer
 from locationsRepository import Location, LocationsRepository
+from loopStallDetector import LoopStallDetector
+from metricsRepository import MetricsRepository
 from nonceRepository import NonceRepository
+from pkmnCommandQueue import PkmnCommandQueue
+from rateLimiter import UserAndChannelRateLimiter
+from responseCache import ResponseCache
+from rewardDispatcher import RewardDispatcher, RewardRedemption
+from timeZoneRepository import TimeZoneRepository
+from trafficRecorder import TrafficRecorder
 from user import User
 from userIdsRepository import UserIdsRepository
+from usersRegistryWatcher import UsersRegistryWatcher
 from usersRepository import UsersRepository
 from userTokensRepository import UserTokensRepository
 from weatherRepository import WeatherReport, WeatherRepository
+from wordOfTheDayPrefetcher import WordOfTheDayPrefetcher
 
 
 class CynanBot(commands.Bot):
 
     def __init__(
         self,
-        analogueStoreRepository: AnalogueStoreRepository,
+        analogueStockPoller: AnalogueStockPoller,
         authHelper: AuthHelper,
+        cutenessMultiplierScheduler: CutenessMultiplierScheduler,
         cutenessRepository: CutenessRepository,
         jishoHelper: JishoHelper,
         jokesRepository: JokesRepository,
+        leaderboardServer: LeaderboardServer,
         locationsRepository: LocationsRepository,
+        loopStallDetector: LoopStallDetector,
+        metricsRepository: MetricsRepository,
         nonceRepository: NonceRepository,
+        pkmnCommandQueue: PkmnCommandQueue,
+        responseCache: ResponseCache,
+        rewardDispatcher: RewardDispatcher,
+        timeZoneRepository: TimeZoneRepository,
         userIdsRepository: UserIdsRepository,
+        usersRegistryWatcher: UsersRegistryWatcher,
         usersRepository: UsersRepository,
         userTokensRepository: UserTokensRepository,
         weatherRepository: WeatherRepository,
-        wordOfTheDayRepository: WordOfTheDayRepository
+        wordOfTheDayPrefetcher: WordOfTheDayPrefetcher,
+        wordOfTheDayRepository: WordOfTheDayRepository,
+        trafficRecorder: TrafficRecorder = None
     ):
         super().__init__(
             irc_token=authHelper.getIrcAuthToken(),
@@ -53,93 +78,180 @@ class CynanBot(commands.Bot):
             initial_channels=[ user.getHandle() for user in usersRepository.getUsers() ]
         )
 
-        if analogueStoreRepository is None:
-            raise ValueError(f'analogueStoreRepository argument is malformed: \"{analogueStoreRepository}\"')
+        if analogueStockPoller is None:
+            raise ValueError(f'analogueStockPoller argument is malformed: \"{analogueStockPoller}\"')
+        elif cutenessMultiplierScheduler is None:
+            raise ValueError(f'cutenessMultiplierScheduler argument is malformed: \"{cutenessMultiplierScheduler}\"')
         elif cutenessRepository is None:
             raise ValueError(f'cutenessRepository argument is malformed: \"{cutenessRepository}\"')
         elif jishoHelper is None:
             raise ValueError(f'jishHelper argument is malformed: \"{jishoHelper}\"')
         elif jokesRepository is None:
             raise ValueError(f'jokesRepository argument is malformed: \"{jokesRepository}\"')
+        elif leaderboardServer is None:
+            raise ValueError(f'leaderboardServer argument is malformed: \"{leaderboardServer}\"')
         elif locationsRepository is None:
             raise ValueError(f'locationsRepository argument is malformed: \"{locationsRepository}\"')
+        elif loopStallDetector is None:
+            raise ValueError(f'loopStallDetector argument is malformed: \"{loopStallDetector}\"')
+        elif metricsRepository is None:
+            raise ValueError(f'metricsRepository argument is malformed: \"{metricsRepository}\"')
         elif nonceRepository is None:
             raise ValueError(f'nonceRepository argument is malformed: \"{nonceRepository}\"')
+        elif pkmnCommandQueue is None:
+            raise ValueError(f'pkmnCommandQueue argument is malformed: \"{pkmnCommandQueue}\"')
+        elif responseCache is None:
+            raise ValueError(f'responseCache argument is malformed: \"{responseCache}\"')
+        elif rewardDispatcher is None:
+            raise ValueError(f'rewardDispatcher argument is malformed: \"{rewardDispatcher}\"')
+        elif timeZoneRepository is None:
+            raise ValueError(f'timeZoneRepository argument is malformed: \"{timeZoneRepository}\"')
         elif userIdsRepository is None:
             raise ValueError(f'userIdsRepository argument is malformed: \"{userIdsRepository}\"')
+        elif usersRegistryWatcher is None:
+            raise ValueError(f'usersRegistryWatcher argument is malformed: \"{usersRegistryWatcher}\"')
         elif userTokensRepository is None:
             raise ValueError(f'userTokensRepository argument is malformed: \"{userTokensRepository}\"')
         elif weatherRepository is None:
             raise ValueError(f'weatherRepository argument is malformed: \"{weatherRepository}\"')
+        elif wordOfTheDayPrefetcher is None:
+            raise ValueError(f'wordOfTheDayPrefetcher argument is malformed: \"{wordOfTheDayPrefetcher}\"')
         elif wordOfTheDayRepository is None:
             raise ValueError(f'wordOfTheDayRepository argument is malformed: \"{wordOfTheDayRepository}\"')
 
-        self.__analogueStoreRepository = analogueStoreRepository
+        self.__analogueStockPoller = analogueStockPoller
         self.__authHelper = authHelper
+        self.__cutenessMultiplierScheduler = cutenessMultiplierScheduler
         self.__cutenessRepository = cutenessRepository
         self.__jishoHelper = jishoHelper
         self.__jokesRepository = jokesRepository
+        self.__leaderboardServer = leaderboardServer
         self.__locationsRepository = locationsRepository
+        self.__loopStallDetector = loopStallDetector
+        self.__metricsRepository = metricsRepository
         self.__nonceRepository = nonceRepository
+        self.__pkmnCommandQueue = pkmnCommandQueue
+        self.__responseCache = responseCache
+        self.__rewardDispatcher = rewardDispatcher
+        self.__timeZoneRepository = timeZoneRepository
         self.__userIdsRepository = userIdsRepository
+        self.__usersRegistryWatcher = usersRegistryWatcher
         self.__usersRepository = usersRepository
         self.__userTokensRepository = userTokensRepository
         self.__weatherRepository = weatherRepository
+        self.__wordOfTheDayPrefetcher = wordOfTheDayPrefetcher
         self.__wordOfTheDayRepository = wordOfTheDayRepository
+        self.__trafficRecorder = trafficRecorder
 
-        self.__cutenessDoubleEndTimes = TimedDict(timedelta(minutes=5))
         self.__lastAnalogueStockMessageTimes = TimedDict(timedelta(minutes=1))
         self.__lastCatJamMessageTimes = TimedDict(timedelta(minutes=20))
-        self.__lastCutenessLeaderboardMessageTimes = TimedDict(timedelta(seconds=30))
         self.__lastCutenessRedeemedMessageTimes = TimedDict(timedelta(seconds=30))
         self.__lastCynanMessageTime = datetime.now() - timedelta(days=1)
         self.__lastDeerForceMessageTimes = TimedDict(timedelta(minutes=20))
-        self.__lastJishoMessageTimes = TimedDict(timedelta(seconds=15))
         self.__lastJokeMessageTimes = TimedDict(timedelta(minutes=1))
         self.__lastRatJamMessageTimes = TimedDict(timedelta(minutes=20))
         self.__lastWeatherMessageTimes = TimedDict(timedelta(minutes=1))
-        self.__lastWotdMessageTimes = TimedDict(timedelta(seconds=15))
+        self.__timeMessages = dict()
+
+        self.__analogueStockPoller.addBackInStockListener(self.__handleAnalogueBackInStock)
+        self.__cutenessMultiplierScheduler.addWindowEndedListener(self.__handleCutenessDoubleWindowEnded)
+        self.__usersRegistryWatcher.addUsersChangedListener(self.__handleUsersChanged)
+        self.__usersRegistryWatcher.addUsersReloadedListener(self.__handleUsersReloaded)
+
+        self.__rewardDispatcher.registerReward('increaseCuteness', User.getIncreaseCutenessRewardId, self.__handleIncreaseCutenessRewardRedeemed)
+        self.__rewardDispatcher.registerReward('increaseCutenessDouble', User.getIncreaseCutenessDoubleRewardId, self.__handleIncreaseCutenessDoubleRewardRedeemed)
+        self.__rewardDispatcher.registerReward('picOfTheDay', User.getPicOfTheDayRewardId, self.__handlePotdRewardRedeemed)
+        self.__rewardDispatcher.registerReward('pkmnBattle', User.getPkmnBattleRewardId, self.__handlePkmnBattleRewardRedeemed)
+        self.__rewardDispatcher.registerReward('pkmnCatch', User.getPkmnCatchRewardId, self.__handlePkmnCatchRewardRedeemed)
+        self.__rewardDispatcher.registerReward('pkmnEvolve', User.getPkmnEvolveRewardId, self.__handlePkmnEvolveRewardRedeemed)
+        self.__rewardDispatcher.registerReward('pkmnShiny', User.getPkmnShinyRewardId, self.__handlePkmnShinyRewardRedeemed)
+
+        self.__cutenessLeaderboardRateLimiter = UserAndChannelRateLimiter(
+            channelMaxEvents=2,
+            channelTimeDelta=timedelta(seconds=30),
+            userMaxEvents=1,
+            userTimeDelta=timedelta(seconds=30)
+        )
 
-    async def event_command_error(self, ctx, error):
-        # prevents exceptions caused by people using commands for other bots
-        pass
+        self.__jishoRateLimiter = UserAndChannelRateLimiter(
+            channelMaxEvents=3,
+            channelTimeDelta=timedelta(seconds=30),
+            userMaxEvents=2,
+            userTimeDelta=timedelta(minutes=1)
+        )
 
-    async def event_message(self, message):
-        if await self.__handleMessageFromCynan(message):
-            return
+        self.__wotdRateLimiter = UserAndChannelRateLimiter(
+            channelMaxEvents=3,
+            channelTimeDelta=timedelta(seconds=30),
+            userMaxEvents=2,
+            userTimeDelta=timedelta(minutes=1)
+        )
 
-        if await self.__handleDeerForceMessage(message):
-            return
+    async def event_command_error(self, ctx, error):
+        commandName = self.__getCommandName(ctx.message.content)
 
-        if await self.__handleCatJamMessage(message):
-            return
+        # errors for commands that aren't ours are just people using commands for other bots
+        if commandName is not None:
+            self.__metricsRepository.recordError(
+                name='command',
+                labels={ 'channel': ctx.channel.name, 'command': commandName }
+            )
 
-        if await self.__handleRatJamMessage(message):
-            return
+    async def event_message(self, message):
+        if self.__trafficRecorder is not None:
+            self.__trafficRecorder.recordMessage(message)
 
-        await self.handle_commands(message)
+        with self.__metricsRepository.measure('event_message', { 'channel': message.channel.name }):
+            await self.__handleMessage(message)
 
     async def event_raw_pubsub(self, data):
-        if 'error' in data and len(data['error']) >= 1:
-            print(f'({utils.getNowTimeText(includeSeconds=True)}) Received pub sub error: {data}')
-
-            if data['error'] == 'ERR_BADAUTH':
-                await self.__validateAndRefreshTokensAndResubscribe(nonce=data.get('nonce'))
-        elif 'type' not in data:
-            print(f'({utils.getNowTimeText(includeSeconds=True)}) Received pub sub event without \"type\": {data}')
-        elif data['type'] == 'PONG' or data['type'] == 'RESPONSE':
-            print(f'({utils.getNowTimeText(includeSeconds=True)}) Received pub sub event: {data}')
-        elif data['type'] != 'MESSAGE' or 'data' not in data or 'message' not in data['data']:
-            print(f'({utils.getNowTimeText(includeSeconds=True)}) Received unusual pub sub event: {data}')
-        else:
-            jsonResponse = json.loads(data['data']['message'])
+        if self.__trafficRecorder is not None:
+            self.__trafficRecorder.recordPubSub(data)
 
-            if jsonResponse['type'] == 'reward-redeemed':
-                await self.__handleRewardRedeemed(jsonResponse)
+        with self.__metricsRepository.measure('event_raw_pubsub', { 'type': data.get('type', 'unknown') }):
+            await self.__handleRawPubSub(data)
 
     async def event_ready(self):
         print(f'{self.nick} is ready!')
-        await self.__subscribeToEvents(self.__usersRepository.getUsers())
+        users = self.__usersRepository.getUsers()
+
+        self.__metricsRepository.start()
+        self.__loopStallDetector.start()
+        self.__startFeatureServices(users)
+
+        await self.__subscribeToEvents(users)
+
+        # every channel's ID was just looked up while subscribing, so this is all local
+        self.__rewardDispatcher.buildTables()
+        self.__usersRegistryWatcher.start()
+
+    async def __handleAnalogueBackInStock(self, products: List):
+        productNames = ', '.join(product.getName() for product in products)
+
+        for user in self.__usersRepository.getUsers():
+            if not user.isAnalogueStockNotificationsEnabled():
+                continue
+
+            twitchChannel = self.get_channel(user.getHandle())
+
+            if twitchChannel is None:
+                continue
+
+            print(f'Sending Analogue back in stock notification to {user.getHandle()}...')
+            await twitchChannel.send(f'🛒 Back in stock at Analogue: {productNames}')
+
+    def __getCommandName(self, content: str):
+        splits = utils.getCleanedSplits(content)
+
+        if not utils.hasItems(splits) or not splits[0].startswith('!'):
+            return None
+
+        commandName = splits[0][1:].lower()
+
+        if commandName in self.commands:
+            return commandName
+        else:
+            return None
 
     async def __handleCatJamMessage(self, message):
         user = self.__usersRepository.getUser(message.channel.name)
@@ -155,6 +267,21 @@ class CynanBot(commands.Bot):
         else:
             return False
 
+    def __createTimeMessage(self, user: User):
+        first = True
+        text = ''
+
+        for timeZone in user.getTimeZones():
+            localTime = self.__timeZoneRepository.getLocalTime(timeZone)
+
+            if first:
+                first = False
+                text = f'🕰️ The local time for {user.getHandle()} is {localTime.getFormattedTime()}.'
+            else:
+                text = f'{text} {localTime.getTimeZoneName()} time is {localTime.getFormattedTimeShort()}.'
+
+        return text
+
     async def __handleDeerForceMessage(self, message):
         user = self.__usersRepository.getUser(message.channel.name)
         text = utils.cleanStr(message.content)
@@ -165,16 +292,30 @@ class CynanBot(commands.Bot):
         else:
             return False
 
-    async def __handleIncreaseCutenessDoubleRewardRedeemed(
-        self,
-        userIdThatRedeemed: str,
-        userNameThatRedeemed: str,
-        twitchUser: User,
-        twitchChannel
-    ):
-        print(f'Enabling double cuteness points in {twitchUser.getHandle()}...')
+    async def __handleCutenessDoubleWindowEnded(self, window: CutenessMultiplierWindow):
+        twitchChannel = self.get_channel(window.getHandle())
+
+        if twitchChannel is None:
+            return
+
+        await twitchChannel.send('✨ Double cuteness points have ended, thanks for being so cute~ ✨')
+
+    async def __handleIncreaseCutenessDoubleRewardRedeemed(self, redemption: RewardRedemption):
+        userIdThatRedeemed = redemption.getUserIdThatRedeemed()
+        userNameThatRedeemed = redemption.getUserNameThatRedeemed()
+        twitchUser = redemption.getTwitchUser()
+        twitchChannel = redemption.getTwitchChannel()
+
+        window = self.__cutenessMultiplierScheduler.startWindow(twitchUser.getHandle())
+
+        if window.isNew():
+            message = f'✨ Double cuteness points enabled for the next {window.getRemainingMinutesStr()}! Increase your cuteness now~'
+        elif window.isExtended():
+            message = f'✨ Double cuteness points extended, they\'re now enabled for the next {window.getRemainingMinutesStr()}!'
+        else:
+            message = f'✨ Double cuteness points are already enabled for as long as they can be, the next {window.getRemainingMinutesStr()}!'
 
-        self.__cutenessDoubleEndTimes.update(twitchUser.getHandle())
+        print(f'Double cuteness points enabled in {twitchUser.getHandle()} for the next {window.getRemainingMinutesStr()}')
 
         try:
             result = self.__cutenessRepository.fetchCutenessIncrementedBy(
@@ -184,22 +325,17 @@ class CynanBot(commands.Bot):
                 userName=userNameThatRedeemed
             )
 
-            await twitchChannel.send(f'✨ Double cuteness points enabled for the next 5 minutes! Increase your cuteness now~ ✨ Also, cuteness for {userNameThatRedeemed} has increased to {result.getCutenessStr()} ✨')
+            await twitchChannel.send(f'{message} ✨ Also, cuteness for {userNameThatRedeemed} has increased to {result.getCutenessStr()} ✨')
         except ValueError:
             print(f'Error increasing cuteness for {userNameThatRedeemed} ({userIdThatRedeemed}) in {twitchUser.getHandle()}')
             await twitchChannel.send(f'⚠ Error increasing cuteness for {userNameThatRedeemed}')
 
-    async def __handleIncreaseCutenessRewardRedeemed(
-        self,
-        userIdThatRedeemed: str,
-        userNameThatRedeemed: str,
-        twitchUser: User,
-        twitchChannel
-    ):
-        incrementAmount = 1
-
-        if not self.__cutenessDoubleEndTimes.isReady(twitchUser.getHandle()):
-            incrementAmount = 2
+    async def __handleIncreaseCutenessRewardRedeemed(self, redemption: RewardRedemption):
+        userIdThatRedeemed = redemption.getUserIdThatRedeemed()
+        userNameThatRedeemed = redemption.getUserNameThatRedeemed()
+        twitchUser = redemption.getTwitchUser()
+        twitchChannel = redemption.getTwitchChannel()
+        incrementAmount = self.__cutenessMultiplierScheduler.getMultiplier(twitchUser.getHandle())
 
         try:
             result = self.__cutenessRepository.fetchCutenessIncrementedBy(
@@ -215,6 +351,28 @@ class CynanBot(commands.Bot):
             print(f'Error increasing cuteness for {userNameThatRedeemed} ({userIdThatRedeemed}) in {twitchUser.getHandle()}')
             await twitchChannel.send(f'⚠ Error increasing cuteness for {userNameThatRedeemed}')
 
+    async def __handleMessage(self, message):
+        if await self.__handleMessageFromCynan(message):
+            return
+
+        if await self.__handleDeerForceMessage(message):
+            return
+
+        if await self.__handleCatJamMessage(message):
+            return
+
+        if await self.__handleRatJamMessage(message):
+            return
+
+        commandName = self.__getCommandName(message.content)
+
+        if commandName is None:
+            await self.handle_commands(message)
+            return
+
+        with self.__metricsRepository.measure('command', { 'channel': message.channel.name, 'command': commandName }):
+            await self.handle_commands(message)
+
     async def __handleMessageFromCynan(self, message):
         if message.author.name.lower() != 'cynanmachae'.lower():
             return False
@@ -229,28 +387,32 @@ class CynanBot(commands.Bot):
         else:
             return False
 
-    async def __handlePkmnBattleRewardRedeemed(
-        self,
-        redemptionMessage: str,
-        userNameThatRedeemed: str,
-        twitchUser: User,
-        twitchChannel
-    ):
-        splits = utils.getCleanedSplits(redemptionMessage)
+    async def __handlePkmnBattleRewardRedeemed(self, redemption: RewardRedemption):
+        userNameThatRedeemed = redemption.getUserNameThatRedeemed()
+        twitchChannel = redemption.getTwitchChannel()
+        splits = utils.getCleanedSplits(redemption.getRedemptionMessage())
 
         if not utils.hasItems(splits):
             await twitchChannel.send(f'⚠ @{userNameThatRedeemed} you must specify the exact user name of the person you want to fight')
             return
 
         opponentUserName = utils.removePreceedingAt(splits[0])
-        await twitchChannel.send(f'!battle {userNameThatRedeemed} {opponentUserName}')
+        await self.__pkmnCommandQueue.submit(twitchChannel, f'!battle {userNameThatRedeemed} {opponentUserName}')
+
+    async def __handlePkmnCatchRewardRedeemed(self, redemption: RewardRedemption):
+        await self.__pkmnCommandQueue.submit(redemption.getTwitchChannel(), f'!catch {redemption.getUserNameThatRedeemed()}')
+
+    async def __handlePkmnEvolveRewardRedeemed(self, redemption: RewardRedemption):
+        await self.__pkmnCommandQueue.submit(redemption.getTwitchChannel(), f'!freeevolve {redemption.getUserNameThatRedeemed()}')
+
+    async def __handlePkmnShinyRewardRedeemed(self, redemption: RewardRedemption):
+        await self.__pkmnCommandQueue.submit(redemption.getTwitchChannel(), f'!freeshiny {redemption.getUserNameThatRedeemed()}')
+
+    async def __handlePotdRewardRedeemed(self, redemption: RewardRedemption):
+        userNameThatRedeemed = redemption.getUserNameThatRedeemed()
+        twitchUser = redemption.getTwitchUser()
+        twitchChannel = redemption.getTwitchChannel()
 
-    async def __handlePotdRewardRedeemed(
-        self,
-        userNameThatRedeemed: str,
-        twitchUser: User,
-        twitchChannel
-    ):
         print(f'Sending POTD to {userNameThatRedeemed} in {twitchUser.getHandle()}...')
 
         try:
@@ -275,87 +437,64 @@ class CynanBot(commands.Bot):
         else:
             return False
 
+    async def __handleRawPubSub(self, data):
+        if 'error' in data and len(data['error']) >= 1:
+            print(f'({utils.getNowTimeText(includeSeconds=True)}) Received pub sub error: {data}')
+
+            if data['error'] == 'ERR_BADAUTH':
+                await self.__validateAndRefreshTokensAndResubscribe(nonce=data.get('nonce'))
+        elif 'type' not in data:
+            print(f'({utils.getNowTimeText(includeSeconds=True)}) Received pub sub event without \"type\": {data}')
+        elif data['type'] == 'PONG' or data['type'] == 'RESPONSE':
+            print(f'({utils.getNowTimeText(includeSeconds=True)}) Received pub sub event: {data}')
+        elif data['type'] != 'MESSAGE' or 'data' not in data or 'message' not in data['data']:
+            print(f'({utils.getNowTimeText(includeSeconds=True)}) Received unusual pub sub event: {data}')
+        else:
+            jsonResponse = json.loads(data['data']['message'])
+
+            if jsonResponse['type'] == 'reward-redeemed':
+                await self.__handleRewardRedeemed(jsonResponse)
+
     async def __handleRewardRedeemed(self, jsonResponse):
         if jsonResponse is None:
             raise ValueError(f'jsonResponse argument is malformed: \"{jsonResponse}\"')
 
         redemptionJson = jsonResponse['data']['redemption']
         twitchUserId = redemptionJson['channel_id']
-        twitchUser = None
-
-        for user in self.__usersRepository.getUsers():
-            accessToken = self.__userTokensRepository.getAccessToken(user.getHandle())
-
-            if accessToken is None:
-                continue
-
-            userId = self.__userIdsRepository.fetchUserId(
-                userName=user.getHandle(),
-                clientId=self.__authHelper.getClientId(),
-                accessToken=accessToken
-            )
-
-            if twitchUserId.lower() == userId.lower():
-                twitchUser = user
-                break
+        rewardId = redemptionJson['reward']['id']
 
-        if twitchUser is None:
-            raise RuntimeError(f'Unable to find User with ID: \"{twitchUserId}\"')
+        rewardType = self.__rewardDispatcher.getReward(twitchUserId, rewardId)
+
+        if rewardType is None:
+            twitchUser = self.__rewardDispatcher.getUser(twitchUserId)
+            failedUsers = self.__rewardDispatcher.getFailedUsers()
+
+            if twitchUser is None and utils.hasItems(failedUsers):
+                # the channel ID of at least one channel couldn't be looked up yet, so this could
+                # be one of those (they're retried in the background)
+                handles = ', '.join(user.getHandle() for user in failedUsers)
+                print(f'Ignoring reward redemption for channel \"{twitchUserId}\", which may be one of the channels whose ID couldn\'t be looked up yet: {handles}')
+            elif twitchUser is None:
+                # This happens for channels that have been removed from the users file while the
+                # bot was running, as there's no way to unsubscribe from their pub sub topics.
+                print(f'Ignoring reward redemption for a channel that is no longer in the users file: \"{twitchUserId}\"')
+            else:
+                # Don't forget to check the users file if you're having trouble with redemption
+                # reward monitoring for specific users!
+                print(f'The Reward ID for {twitchUser.getHandle()} is \"{rewardId}\"')
 
-        # Don't forget to check this if statement if you're having trouble with redemption reward
-        # monitoring for specific users!
-        if not twitchUser.isCutenessEnabled() and not twitchUser.isPicOfTheDayEnabled() and not twitchUser.isPkmnEnabled():
             return
 
-        increaseCutenessDoubleRewardId = twitchUser.getIncreaseCutenessDoubleRewardId()
-        increaseCutenessRewardId = twitchUser.getIncreaseCutenessRewardId()
-        potdRewardId = twitchUser.getPicOfTheDayRewardId()
-        pkmnBattleRewardId = twitchUser.getPkmnBattleRewardId()
-        pkmnCatchRewardId = twitchUser.getPkmnCatchRewardId()
-        pkmnEvolveRewardId = twitchUser.getPkmnEvolveRewardId()
-        pkmnShinyRewardId = twitchUser.getPkmnShinyRewardId()
+        twitchUser = self.__rewardDispatcher.getUser(twitchUserId)
 
-        rewardId = redemptionJson['reward']['id']
-        userIdThatRedeemed = redemptionJson['user']['id']
-        userNameThatRedeemed = redemptionJson['user']['display_name']
-        redemptionMessage = utils.cleanStr(redemptionJson.get('user_input'))
-        twitchChannel = self.get_channel(twitchUser.getHandle())
-
-        if twitchUser.isCutenessEnabled() and rewardId == increaseCutenessRewardId:
-            await self.__handleIncreaseCutenessRewardRedeemed(
-                userIdThatRedeemed=userIdThatRedeemed,
-                userNameThatRedeemed=userNameThatRedeemed,
-                twitchUser=twitchUser,
-                twitchChannel=twitchChannel
-            )
-        elif twitchUser.isCutenessEnabled() and rewardId == increaseCutenessDoubleRewardId:
-            await self.__handleIncreaseCutenessDoubleRewardRedeemed(
-                userIdThatRedeemed=userIdThatRedeemed,
-                userNameThatRedeemed=userNameThatRedeemed,
-                twitchUser=twitchUser,
-                twitchChannel=twitchChannel
-            )
-        elif twitchUser.isPicOfTheDayEnabled() and rewardId == potdRewardId:
-            await self.__handlePotdRewardRedeemed(
-                userNameThatRedeemed=userNameThatRedeemed,
-                twitchUser=twitchUser,
-                twitchChannel=twitchChannel
-            )
-        elif twitchUser.isPkmnEnabled() and rewardId == pkmnBattleRewardId:
-            await self.__handlePkmnBattleRewardRedeemed(
-                redemptionMessage=redemptionMessage,
-                userNameThatRedeemed=userNameThatRedeemed,
-                twitchUser=twitchUser,
-                twitchChannel=twitchChannel
-            )
-        elif twitchUser.isPkmnEnabled() and rewardId == pkmnCatchRewardId:
-            await twitchChannel.send(f'!catch {userNameThatRedeemed}')
-        elif twitchUser.isPkmnEnabled() and rewardId == pkmnEvolveRewardId:
-            await twitchChannel.send(f'!freeevolve {userNameThatRedeemed}')
-        elif twitchUser.isPkmnEnabled() and rewardId == pkmnShinyRewardId:
-            await twitchChannel.send(f'!freeshiny {userNameThatRedeemed}')
-        else:
-            print(f'The Reward ID for {twitchUser.getHandle()} is \"{rewardId}\"')
+        await rewardType.getHandler()(RewardRedemption(
+            redemptionMessage=utils.cleanStr(redemptionJson.get('user_input')),
+            rewardId=rewardId,
+            twitchChannel=self.get_channel(twitchUser.getHandle()),
+            twitchUser=twitchUser,
+            userIdThatRedeemed=redemptionJson['user']['id'],
+            userNameThatRedeemed=redemptionJson['user']['display_name']
+        ))
 
     async def __subscribeToEvents(self, users: List[User]):
         if not utils.hasItems(users):
@@ -378,11 +517,14 @@ class CynanBot(commands.Bot):
                 accessToken=accessToken
             )
 
+            if self.__trafficRecorder is not None:
+                self.__trafficRecorder.recordChannel(user.getHandle(), userId, user.getRewardIds())
+
             # we could subscribe to multiple topics, but for now, just channel points
-            topics = [f'channel-points-channel-v1.{userId}']
+            topic = f'channel-points-channel-v1.{userId}'
 
             # subscribe to pubhub channel points events
-            nonce = await self.pubsub_subscribe(accessToken, *topics)
+            nonce = await self.pubsub_subscribe(accessToken, topic)
 
             # save the nonce, we'll need to use it later if the token used for this user's
             # connection has to be refreshed
@@ -392,6 +534,40 @@ class CynanBot(commands.Bot):
 
         print(f'Finished subscribing to events for {count} user(s)')
 
+    async def __handleUsersChanged(self, addedUsers: List[User], removedUsers: List[User]):
+        if utils.hasItems(removedUsers):
+            handles = [ user.getHandle() for user in removedUsers ]
+            await self.part_channels(handles)
+
+            for handle in handles:
+                self.__nonceRepository.removeNonce(handle)
+
+            print(f'Left {len(handles)} channel(s): {", ".join(handles)}')
+
+        if utils.hasItems(addedUsers):
+            handles = [ user.getHandle() for user in addedUsers ]
+            await self.join_channels(handles)
+            print(f'Joined {len(handles)} channel(s): {", ".join(handles)}')
+
+            await self.__subscribeToEvents(addedUsers)
+
+            # a newly added channel may be the first to enable one of these
+            self.__startFeatureServices(addedUsers)
+
+    async def __handleUsersReloaded(self):
+        self.__rewardDispatcher.buildTables()
+
+    def __startFeatureServices(self, users: List[User]):
+        # each of these only starts once, no matter how many times it's asked to
+        if any(user.isAnalogueEnabled() for user in users):
+            self.__analogueStockPoller.start()
+
+        if any(user.isWordOfTheDayEnabled() for user in users):
+            self.__wordOfTheDayPrefetcher.start()
+
+        if any(user.isCutenessEnabled() for user in users):
+            self.__leaderboardServer.start()
+
     async def __validateAndRefreshTokensAndResubscribe(self, nonce: str):
         print(f'Validating and refreshing tokens... (nonce: \"{nonce}\")')
 
@@ -425,7 +601,7 @@ class CynanBot(commands.Bot):
         includePrices = 'includePrices' in splits
 
         try:
-            result = self.__analogueStoreRepository.fetchStoreStock()
+            result = await self.__analogueStockPoller.fetchStoreStock()
             self.__lastAnalogueStockMessageTimes.update(user.getHandle())
 
             if result is None:
@@ -487,7 +663,11 @@ class CynanBot(commands.Bot):
 
         if not user.isCutenessEnabled():
             return
-        elif not ctx.author.is_mod and not self.__lastCutenessLeaderboardMessageTimes.isReadyAndUpdate(user.getHandle()):
+        elif not self.__cutenessLeaderboardRateLimiter.isReadyAndUpdate(
+            twitchChannel=ctx.channel.name,
+            userName=ctx.author.name,
+            isMod=ctx.author.is_mod
+        ):
             return
 
         splits = utils.getCleanedSplits(ctx.message.content)
@@ -496,13 +676,34 @@ class CynanBot(commands.Bot):
         if len(splits) >= 2:
             userName = splits[1]
 
-        if not utils.isValidStr(userName):
+        if not utils.isValidStr(userName) or userName.lower() == 'alltime':
             result = self.__cutenessRepository.fetchLeaderboard(user.getHandle())
 
             if result.hasEntries():
                 await ctx.send(f'✨ Cuteness leaderboard — {result.toStr()} ✨')
             else:
                 await ctx.send('😿 Unfortunately the cuteness leaderboard is empty 😿')
+        elif userName.lower() == 'global':
+            result = self.__cutenessRepository.fetchGlobalLeaderboard()
+
+            if result.hasEntries():
+                await ctx.send(f'✨ Global cuteness leaderboard — {result.toStr()} ✨')
+            else:
+                await ctx.send('😿 Unfortunately the global cuteness leaderboard is empty 😿')
+        elif userName.lower() == 'today':
+            result = self.__cutenessRepository.fetchDailyLeaderboard(user.getHandle())
+
+            if result.hasEntries():
+                await ctx.send(f'✨ Today\'s cuteness leaderboard — {result.toStr()} ✨')
+            else:
+                await ctx.send('😿 Nobody has gotten any cuteness today 😿')
+        elif userName.lower() == 'week':
+            result = self.__cutenessRepository.fetchWeeklyLeaderboard(user.getHandle())
+
+            if result.hasEntries():
+                await ctx.send(f'✨ This week\'s cuteness leaderboard — {result.toStr()} ✨')
+            else:
+                await ctx.send('😿 Nobody has gotten any cuteness this week 😿')
         else:
             userName = utils.removePreceedingAt(userName)
 
@@ -556,7 +757,8 @@ class CynanBot(commands.Bot):
             await ctx.send(f'⚠ Username argument is malformed. Example: !givecuteness {user.getHandle()} 5')
             return
 
-        incrementAmountStr = splits[2]
+        # the amount always comes last, so that many users can be given cuteness at once
+        incrementAmountStr = splits[len(splits) - 1]
         if not utils.isValidStr(incrementAmountStr):
             print(f'Increment amount is malformed: \"{incrementAmountStr}\"')
             await ctx.send(f'⚠ Increment amount argument is malformed. Example: !givecuteness {user.getHandle()} 5')
@@ -569,6 +771,26 @@ class CynanBot(commands.Bot):
             await ctx.send(f'⚠ Increment amount argument is malformed. Example: !givecuteness {user.getHandle()} 5')
             return
 
+        if len(splits) >= 4:
+            userNames = [ utils.removePreceedingAt(userName) for userName in splits[1:len(splits) - 1] ]
+            result = self.__cutenessRepository.grantCuteness(
+                incrementAmount=incrementAmount,
+                twitchChannel=user.getHandle(),
+                userNames=userNames
+            )
+
+            message = f'✨ Gave {incrementAmount} cuteness to {result.getUpdatedCountStr()} user(s)'
+
+            if result.hasMissingUserNames():
+                message = f'{message}, these user(s) don\'t currently exist in the database: {", ".join(result.getMissingUserNames())}'
+
+            if result.hasAmbiguousUserNames():
+                message = f'{message}, these name(s) belong to more than one user so were skipped: {", ".join(result.getAmbiguousUserNames())}'
+
+            await ctx.send(f'{message} ✨')
+
+            return
+
         userName = utils.removePreceedingAt(userName)
 
         try:
@@ -597,7 +819,11 @@ class CynanBot(commands.Bot):
 
         if not user.isJishoEnabled():
             return
-        elif not ctx.author.is_mod and not self.__lastJishoMessageTimes.isReady(user.getHandle()):
+        elif not self.__jishoRateLimiter.isReadyAndUpdate(
+            twitchChannel=ctx.channel.name,
+            userName=ctx.author.name,
+            isMod=ctx.author.is_mod
+        ):
             return
 
         splits = utils.getCleanedSplits(ctx.message.content)
@@ -609,8 +835,11 @@ class CynanBot(commands.Bot):
         query = splits[1]
 
         try:
-            result = self.__jishoHelper.search(query)
-            self.__lastJishoMessageTimes.update(user.getHandle())
+            result = await self.__responseCache.fetch(
+                source='jisho',
+                key=query.lower(),
+                fetcher=lambda: self.__jishoHelper.search(query)
+            )
 
             if result is None:
                 print(f'Failed searching Jisho for \"{query}\" in {user.getHandle()}')
@@ -631,7 +860,10 @@ class CynanBot(commands.Bot):
             return
 
         try:
-            result = self.__jokesRepository.fetchJoke()
+            # Not cached, as each channel is already held to one joke per cooldown, and sharing a
+            # cached joke across channels would just have them all telling the same one.
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(None, self.__jokesRepository.fetchJoke)
 
             if result is None:
                 print(f'Error fetching joke of the day in {user.getHandle()}')
@@ -685,23 +917,14 @@ class CynanBot(commands.Bot):
         if not user.hasTimeZones():
             return
 
-        timeZones = user.getTimeZones()
-        first = True
-        text = ''
-
-        for timeZone in timeZones:
-            localTime = datetime.now(timeZone)
+        currentMinute = self.__timeZoneRepository.getCurrentMinute()
+        timeMessage = self.__timeMessages.get(user.getHandle())
 
-            if first:
-                first = False
-                formattedTime = utils.formatTime(localTime)
-                text = f'🕰️ The local time for {user.getHandle()} is {formattedTime}.'
-            else:
-                formattedTime = utils.formatTimeShort(localTime)
-                timeZoneName = timeZone.tzname(datetime.now())
-                text = f'{text} {timeZoneName} time is {formattedTime}.'
+        if timeMessage is None or timeMessage[0] != currentMinute:
+            timeMessage = (currentMinute, self.__createTimeMessage(user))
+            self.__timeMessages[user.getHandle()] = timeMessage
 
-        await ctx.send(text)
+        await ctx.send(timeMessage[1])
 
     @commands.command(name='twitter')
     async def command_twitter(self, ctx):
@@ -723,13 +946,13 @@ class CynanBot(commands.Bot):
             return
 
         location = self.__locationsRepository.getLocation(user.getLocationId())
-        weatherReport = self.__weatherRepository.fetchWeather(location)
+        weatherStr = self.__weatherRepository.fetchWeatherStr(location)
         self.__lastWeatherMessageTimes.update(user.getHandle())
 
-        if weatherReport is None:
+        if weatherStr is None:
             await ctx.send('⚠ Error fetching weather')
         else:
-            await ctx.send(weatherReport.toStr())
+            await ctx.send(weatherStr)
 
     @commands.command(name='word')
     async def command_word(self, ctx):
@@ -737,7 +960,11 @@ class CynanBot(commands.Bot):
 
         if not user.isWordOfTheDayEnabled():
             return
-        elif not ctx.author.is_mod and not self.__lastWotdMessageTimes.isReady(user.getHandle()):
+        elif not self.__wotdRateLimiter.isReadyAndUpdate(
+            twitchChannel=ctx.channel.name,
+            userName=ctx.author.name,
+            isMod=ctx.author.is_mod
+        ):
             return
 
         splits = utils.getCleanedSplits(ctx.message.content)
@@ -762,10 +989,20 @@ class CynanBot(commands.Bot):
             await ctx.send(f'⚠ The given language code is not supported by the !word command. Available languages: {languages}')
             return
 
+        wotdStr = self.__wordOfTheDayPrefetcher.getWotdStr(languageEntry)
+
+        if utils.isValidStr(wotdStr):
+            await ctx.send(wotdStr)
+            return
+
         wotd = None
 
         try:
-            wotd = self.__wordOfTheDayRepository.fetchWotd(languageEntry)
+            wotd = await self.__responseCache.fetch(
+                source='wotd',
+                key=languageEntry.getApiName(),
+                fetcher=lambda: self.__wordOfTheDayRepository.fetchWotd(languageEntry)
+            )
         except ValueError:
             print(f'Error fetching word of the day for \"{languageEntry.getApiName()}\"')
 
@@ -0,0 +1,156 @@
+from typing import List
+
+import CynanBotCommon.utils as utils
+
+
+class DatabaseMigration():
+
+    def __init__(self, version: int, description: str, statements: List[str]):
+        if not utils.isValidNum(version):
+            raise ValueError(f'version argument is malformed: \"{version}\"')
+        elif version < 1:
+            raise ValueError(f'version argument is out of bounds: \"{version}\"')
+        elif not utils.isValidStr(description):
+            raise ValueError(f'description argument is malformed: \"{description}\"')
+        elif not utils.hasItems(statements):
+            raise ValueError(f'statements argument is malformed: \"{statements}\"')
+
+        self.__version = version
+        self.__description = description
+        self.__statements = statements
+
+    def getDescription(self):
+        return self.__description
+
+    def getStatements(self):
+        return self.__statements
+
+    def getVersion(self):
+        return self.__version
+
+
+# Every change to the database's schema goes at the end of this list, with the next version number.
+# Never edit a migration that has already shipped, as databases that already ran it won't run it
+# again. BackingDatabase runs whichever of these a database hasn't seen yet, in order, and records
+# the latest version in the database's user_version.
+MIGRATIONS = [
+    DatabaseMigration(
+        version=1,
+        description='create the cuteness and userIds tables',
+        statements=[
+            # These used to be created by CutenessRepository and UserIdsRepository, so existing
+            # databases will already have them.
+            '''
+                CREATE TABLE IF NOT EXISTS cuteness (
+                    cuteness INTEGER NOT NULL DEFAULT 0,
+                    twitchChannel TEXT NOT NULL COLLATE NOCASE,
+                    userId TEXT NOT NULL COLLATE NOCASE,
+                    PRIMARY KEY (twitchChannel, userId)
+                )
+            ''',
+            '''
+                CREATE TABLE IF NOT EXISTS userIds (
+                    userId TEXT NOT NULL PRIMARY KEY COLLATE NOCASE,
+                    userName TEXT NOT NULL COLLATE NOCASE
+                )
+            '''
+        ]
+    ),
+    DatabaseMigration(
+        version=2,
+        description='index userIds by userName and cuteness by channel and cuteness',
+        statements=[
+            'CREATE INDEX IF NOT EXISTS userIds_userName ON userIds (userName)',
+            'CREATE INDEX IF NOT EXISTS cuteness_twitchChannel_cuteness ON cuteness (twitchChannel, cuteness)'
+        ]
+    ),
+    DatabaseMigration(
+        version=3,
+        description='add the cuteness event log and its daily and weekly rollups',
+        statements=[
+            '''
+                CREATE TABLE cutenessEvents (
+                    eventId INTEGER PRIMARY KEY,
+                    createdAt INTEGER NOT NULL,
+                    incrementAmount INTEGER NOT NULL,
+                    twitchChannel TEXT NOT NULL COLLATE NOCASE,
+                    userId TEXT NOT NULL COLLATE NOCASE
+                )
+            ''',
+            '''
+                CREATE TABLE cutenessDaily (
+                    cuteness INTEGER NOT NULL DEFAULT 0,
+                    day INTEGER NOT NULL,
+                    twitchChannel TEXT NOT NULL COLLATE NOCASE,
+                    userId TEXT NOT NULL COLLATE NOCASE,
+                    PRIMARY KEY (twitchChannel, day, userId)
+                )
+            ''',
+            'CREATE INDEX cutenessDaily_twitchChannel_day_cuteness ON cutenessDaily (twitchChannel, day, cuteness)',
+            '''
+                CREATE TABLE cutenessWeekly (
+                    cuteness INTEGER NOT NULL DEFAULT 0,
+                    twitchChannel TEXT NOT NULL COLLATE NOCASE,
+                    userId TEXT NOT NULL COLLATE NOCASE,
+                    week INTEGER NOT NULL,
+                    PRIMARY KEY (twitchChannel, week, userId)
+                )
+            ''',
+            'CREATE INDEX cutenessWeekly_twitchChannel_week_cuteness ON cutenessWeekly (twitchChannel, week, cuteness)'
+        ]
+    ),
+    DatabaseMigration(
+        version=4,
+        description='add the global cuteness totals',
+        statements=[
+            '''
+                CREATE TABLE cutenessGlobal (
+                    cuteness INTEGER NOT NULL DEFAULT 0,
+                    userId TEXT NOT NULL PRIMARY KEY COLLATE NOCASE
+                )
+            ''',
+            'CREATE INDEX cutenessGlobal_cuteness ON cutenessGlobal (cuteness)',
+            '''
+                INSERT INTO cutenessGlobal (cuteness, userId)
+                SELECT SUM(cuteness), userId FROM cuteness
+                GROUP BY userId
+            '''
+        ]
+    ),
+    DatabaseMigration(
+        version=5,
+        description='index cuteness for keyset paginated leaderboards',
+        statements=[
+            # This covers everything that the old (twitchChannel, cuteness) index did, while also
+            # handing back rows already in leaderboard order, which lets paging skip the sort.
+            'CREATE INDEX cuteness_twitchChannel_cutenessDesc_userId ON cuteness (twitchChannel, cuteness DESC, userId)',
+            'DROP INDEX IF EXISTS cuteness_twitchChannel_cuteness'
+        ]
+    ),
+    DatabaseMigration(
+        version=6,
+        description='add pub sub subscription state',
+        statements=[
+            # tokenFingerprint is a SHA-256 of the access token, the token itself is never stored here
+            '''
+                CREATE TABLE pubSubSubscriptions (
+                    handle TEXT NOT NULL PRIMARY KEY COLLATE NOCASE,
+                    lastValidatedAt INTEGER,
+                    nonce TEXT,
+                    tokenFingerprint TEXT,
+                    topic TEXT,
+                    userId TEXT COLLATE NOCASE
+                )
+            '''
+        ]
+    ),
+    DatabaseMigration(
+        version=7,
+        description='drop pub sub subscription state',
+        statements=[
+            # nonces only mean something to the pub sub connection that handed them out, so
+            # they're back to being kept in memory
+            'DROP TABLE IF EXISTS pubSubSubscriptions'
+        ]
+    )
+]
@@ -1,67 +1,224 @@
 import locale
+import os
+from datetime import timedelta
 
-from authHelper import AuthHelper
-from backingDatabase import BackingDatabase
-from cutenessRepository import CutenessRepository
-from cynanBot import CynanBot
-from CynanBotCommon.analogueStoreRepository import AnalogueStoreRepository
-from CynanBotCommon.jishoHelper import JishoHelper
-from CynanBotCommon.jokesRepository import JokesRepository
-from CynanBotCommon.wordOfTheDayRepository import WordOfTheDayRepository
-from locationsRepository import LocationsRepository
-from nonceRepository import NonceRepository
-from timeZoneRepository import TimeZoneRepository
-from userIdsRepository import UserIdsRepository
-from usersRepository import UsersRepository
-from userTokensRepository import UserTokensRepository
-from weatherRepository import WeatherRepository
-
-
-locale.setlocale(locale.LC_ALL, 'en_US.utf8')
-
-analogueStoreRepository = AnalogueStoreRepository()
-nonceRepository = NonceRepository()
-authHelper = AuthHelper(nonceRepository=nonceRepository)
-backingDatabase = BackingDatabase()
-jishoHelper = JishoHelper()
-JokesRepository = JokesRepository()
-userIdsRepository = UserIdsRepository(
-    backingDatabase=backingDatabase
+from startupProfiler import StartupProfiler
+
+# Set CYNANBOT_STARTUP_PROFILE to print how long each module took to import and each component took
+# to set up, before the bot connects.
+startupProfiler = StartupProfiler(isEnabled='CYNANBOT_STARTUP_PROFILE' in os.environ)
+
+with startupProfiler.measureImports():
+    from analogueStockPoller import AnalogueStockPoller
+    from authHelper import AuthHelper
+    from backingDatabase import BackingDatabase
+    from channelShard import ChannelShard
+    from cutenessMultiplierScheduler import CutenessMultiplierScheduler
+    from cutenessRepository import CutenessRepository
+    from cynanBot import CynanBot
+    from CynanBotCommon.analogueStoreRepository import AnalogueStoreRepository
+    from CynanBotCommon.jishoHelper import JishoHelper
+    from CynanBotCommon.jokesRepository import JokesRepository
+    from CynanBotCommon.wordOfTheDayRepository import WordOfTheDayRepository
+    from lazyRepository import LazyRepository
+    from leaderboardServer import LeaderboardServer
+    from locationsRepository import LocationsRepository
+    from loopStallDetector import LoopStallDetector
+    from metricsRepository import MetricsRepository
+    from nonceRepository import NonceRepository
+    from pkmnCommandQueue import PkmnCommandQueue
+    from responseCache import ResponseCache
+    from rewardDispatcher import RewardDispatcher
+    from timeZoneRepository import TimeZoneRepository
+    from trafficRecorder import TrafficRecorder
+    from userIdsRepository import UserIdsRepository
+    from usersRegistryWatcher import UsersRegistryWatcher
+    from usersRepository import UsersRepository
+    from userTokensRepository import UserTokensRepository
+    from weatherRepository import WeatherRepository
+    from wordOfTheDayPrefetcher import WordOfTheDayPrefetcher
+
+
+with startupProfiler.measure('locale'):
+    locale.setlocale(locale.LC_ALL, 'en_US.utf8')
+
+# These are set by shardSupervisor.py when running as one of multiple channel sharded processes.
+channelShard = None
+if 'CYNANBOT_SHARD_INDEX' in os.environ and 'CYNANBOT_SHARD_COUNT' in os.environ:
+    channelShard = ChannelShard(
+        shardIndex=int(os.environ['CYNANBOT_SHARD_INDEX']),
+        shardCount=int(os.environ['CYNANBOT_SHARD_COUNT'])
+    )
+    print(f'Running as {channelShard.toStr()}')
+
+# every shard needs its own metrics and leaderboard ports, as they all run on the same machine
+shardIndex = 0
+if channelShard is not None:
+    shardIndex = channelShard.getShardIndex()
+
+metricsRepository = MetricsRepository(port=9187 + shardIndex)
+
+with startupProfiler.measure('TimeZoneRepository'):
+    timeZoneRepository = TimeZoneRepository()
+
+with startupProfiler.measure('UsersRepository'):
+    usersRepository = metricsRepository.instrument(UsersRepository(
+        timeZoneRepository=timeZoneRepository,
+        channelShard=channelShard
+    ))
+    users = usersRepository.getUsers()
+
+usersRegistryWatcher = UsersRegistryWatcher(
+    usersRepository=usersRepository
 )
-cutenessRepository = CutenessRepository(
-    backingDatabase=backingDatabase,
-    leaderboardSize=10,
-    localLeaderboardSize=5,
-    userIdsRepository=userIdsRepository
+
+with startupProfiler.measure('BackingDatabase'):
+    backingDatabase = BackingDatabase(metricsRepository=metricsRepository)
+
+with startupProfiler.measure('AuthHelper'):
+    nonceRepository = NonceRepository()
+    authHelper = metricsRepository.instrument(AuthHelper(nonceRepository=nonceRepository))
+
+with startupProfiler.measure('UserIdsRepository'):
+    userIdsRepository = metricsRepository.instrument(UserIdsRepository(
+        backingDatabase=backingDatabase
+    ))
+
+with startupProfiler.measure('CutenessRepository'):
+    cutenessRepository = metricsRepository.instrument(CutenessRepository(
+        backingDatabase=backingDatabase,
+        leaderboardSize=10,
+        localLeaderboardSize=5,
+        userIdsRepository=userIdsRepository
+    ))
+
+leaderboardServer = LeaderboardServer(
+    cutenessRepository=cutenessRepository,
+    usersRepository=usersRepository,
+    port=9287 + shardIndex
 )
-timeZoneRepository = TimeZoneRepository()
-locationsRepository = LocationsRepository(
-    timeZoneRepository=timeZoneRepository
+
+with startupProfiler.measure('UserTokensRepository'):
+    userTokensRepository = metricsRepository.instrument(UserTokensRepository())
+
+
+# Repositories for features that no channel has enabled are only constructed if and when they're
+# first used (for example, after a channel that enables them is added to the users file), so that
+# they stay out of the way of getting the bot back up after a restart.
+def createRepository(factory, repositoryName: str, isEnabled: bool):
+    if not isEnabled:
+        return LazyRepository(
+            factory=lambda: metricsRepository.instrument(factory(), repositoryName),
+            repositoryName=repositoryName
+        )
+
+    with startupProfiler.measure(repositoryName):
+        return metricsRepository.instrument(factory(), repositoryName)
+
+
+isWeatherEnabled = any(user.hasLocationId() for user in users)
+
+analogueStoreRepository = createRepository(
+    factory=AnalogueStoreRepository,
+    repositoryName='AnalogueStoreRepository',
+    isEnabled=any(user.isAnalogueEnabled() for user in users)
+)
+jishoHelper = createRepository(
+    factory=JishoHelper,
+    repositoryName='JishoHelper',
+    isEnabled=any(user.isJishoEnabled() for user in users)
 )
-usersRepository = UsersRepository(
-    timeZoneRepository=timeZoneRepository
+jokesRepository = createRepository(
+    factory=JokesRepository,
+    repositoryName='JokesRepository',
+    isEnabled=any(user.isJokesEnabled() for user in users)
 )
-userTokensRepository = UserTokensRepository()
-weatherRepository = WeatherRepository(
-    iqAirApiKey=authHelper.getIqAirApiKey(),
-    oneWeatherApiKey=authHelper.getOneWeatherApiKey()
+locationsRepository = createRepository(
+    factory=lambda: LocationsRepository(
+        timeZoneRepository=timeZoneRepository
+    ),
+    repositoryName='LocationsRepository',
+    isEnabled=isWeatherEnabled
+)
+weatherRepository = createRepository(
+    factory=lambda: WeatherRepository(
+        iqAirApiKey=authHelper.getIqAirApiKey(),
+        oneWeatherApiKey=authHelper.getOneWeatherApiKey()
+    ),
+    repositoryName='WeatherRepository',
+    isEnabled=isWeatherEnabled
+)
+wordOfTheDayRepository = createRepository(
+    factory=WordOfTheDayRepository,
+    repositoryName='WordOfTheDayRepository',
+    isEnabled=any(user.isWordOfTheDayEnabled() for user in users)
 )
-wordOfTheDayRepository = WordOfTheDayRepository()
 
-cynanBot = CynanBot(
-    analogueStoreRepository=analogueStoreRepository,
+analogueStockPoller = AnalogueStockPoller(
+    analogueStoreRepository=analogueStoreRepository
+)
+wordOfTheDayPrefetcher = WordOfTheDayPrefetcher(
+    rolloverTimeZone=timeZoneRepository.getTimeZone('America/New_York'),
+    wordOfTheDayRepository=wordOfTheDayRepository
+)
+responseCache = ResponseCache(
+    timeToLives={
+        'jisho': timedelta(days=7)
+    },
+    expirationTimes={
+        'wotd': wordOfTheDayPrefetcher.getNextRolloverTime
+    }
+)
+
+loopStallDetector = LoopStallDetector(
+    metricsRepository=metricsRepository
+)
+cutenessMultiplierScheduler = CutenessMultiplierScheduler()
+rewardDispatcher = RewardDispatcher(
     authHelper=authHelper,
-    cutenessRepository=cutenessRepository,
-    jishoHelper=jishoHelper,
-    jokesRepository=JokesRepository,
-    locationsRepository=locationsRepository,
-    nonceRepository=nonceRepository,
     userIdsRepository=userIdsRepository,
     usersRepository=usersRepository,
-    userTokensRepository=userTokensRepository,
-    weatherRepository=weatherRepository,
-    wordOfTheDayRepository=wordOfTheDayRepository
+    userTokensRepository=userTokensRepository
 )
+pkmnCommandQueue = PkmnCommandQueue(
+    metricsRepository=metricsRepository
+)
+
+# Set CYNANBOT_TRAFFIC_FILE to capture raw chat and pub sub traffic, which can then be played back
+# offline with benchmarks/replayTraffic.py. When sharded, each shard writes to this path with a
+# ".shard<index>" suffix.
+trafficRecorder = None
+if 'CYNANBOT_TRAFFIC_FILE' in os.environ:
+    trafficRecorder = TrafficRecorder(trafficFile=os.environ['CYNANBOT_TRAFFIC_FILE'])
+
+with startupProfiler.measure('CynanBot'):
+    cynanBot = CynanBot(
+        analogueStockPoller=analogueStockPoller,
+        authHelper=authHelper,
+        cutenessMultiplierScheduler=cutenessMultiplierScheduler,
+        cutenessRepository=cutenessRepository,
+        jishoHelper=jishoHelper,
+        jokesRepository=jokesRepository,
+        leaderboardServer=leaderboardServer,
+        locationsRepository=locationsRepository,
+        loopStallDetector=loopStallDetector,
+        metricsRepository=metricsRepository,
+        nonceRepository=nonceRepository,
+        pkmnCommandQueue=pkmnCommandQueue,
+        responseCache=responseCache,
+        rewardDispatcher=rewardDispatcher,
+        timeZoneRepository=timeZoneRepository,
+        userIdsRepository=userIdsRepository,
+        usersRegistryWatcher=usersRegistryWatcher,
+        usersRepository=usersRepository,
+        userTokensRepository=userTokensRepository,
+        weatherRepository=weatherRepository,
+        wordOfTheDayPrefetcher=wordOfTheDayPrefetcher,
+        wordOfTheDayRepository=wordOfTheDayRepository,
+        trafficRecorder=trafficRecorder
+    )
+
+startupProfiler.printReport()
 
 print('Starting CynanBot...')
 cynanBot.run()
@@ -0,0 +1,41 @@
+import threading
+import time
+from typing import Callable
+
+import CynanBotCommon.utils as utils
+
+
+class LazyRepository():
+
+    def __init__(self, factory: Callable, repositoryName: str):
+        if factory is None:
+            raise ValueError(f'factory argument is malformed: \"{factory}\"')
+        elif not utils.isValidStr(repositoryName):
+            raise ValueError(f'repositoryName argument is malformed: \"{repositoryName}\"')
+
+        self.__factory = factory
+        self.__repositoryName = repositoryName
+        self.__lock = threading.Lock()
+        self.__repository = None
+
+    def __getattr__(self, name: str):
+        # only called for attributes that LazyRepository itself doesn't have, which means that
+        # everything other than the methods below goes through to the real repository
+        return getattr(self.getRepository(), name)
+
+    def getRepository(self):
+        if self.__repository is not None:
+            return self.__repository
+
+        # repository methods are often called from executor threads, so two of them could race
+        # here to construct the same repository
+        with self.__lock:
+            if self.__repository is None:
+                startTime = time.perf_counter()
+                self.__repository = self.__factory()
+                print(f'Constructed {self.__repositoryName} on first use in {(time.perf_counter() - startTime) * 1000:.1f}ms')
+
+        return self.__repository
+
+    def isConstructed(self):
+        return self.__repository is not None
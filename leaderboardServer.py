@@ -0,0 +1,179 @@
+import asyncio
+import json
+from urllib.parse import parse_qs, unquote, urlparse
+
+import CynanBotCommon.utils as utils
+from cutenessRepository import CutenessRepository
+from usersRepository import UsersRepository
+
+
+# Serves each channel's full cuteness ranking as JSON, for overlays and analytics:
+#
+#   GET /leaderboard/<channel>?pageSize=500&after=<nextCursor>
+#       one page, along with the cursor for the next one (null on the last page)
+#   GET /leaderboard/<channel>/stream?pageSize=500
+#       the whole ranking as newline delimited JSON, one entry per line, sent page by page
+
+class LeaderboardServer():
+
+    def __init__(
+        self,
+        cutenessRepository: CutenessRepository,
+        usersRepository: UsersRepository,
+        host: str = '127.0.0.1',
+        port: int = 9287,
+        pageSize: int = 500
+    ):
+        if cutenessRepository is None:
+            raise ValueError(f'cutenessRepository argument is malformed: \"{cutenessRepository}\"')
+        elif usersRepository is None:
+            raise ValueError(f'usersRepository argument is malformed: \"{usersRepository}\"')
+        elif not utils.isValidStr(host):
+            raise ValueError(f'host argument is malformed: \"{host}\"')
+        elif not utils.isValidNum(port):
+            raise ValueError(f'port argument is malformed: \"{port}\"')
+        elif not utils.isValidNum(pageSize):
+            raise ValueError(f'pageSize argument is malformed: \"{pageSize}\"')
+
+        self.__cutenessRepository = cutenessRepository
+        self.__usersRepository = usersRepository
+        self.__host = host
+        self.__port = port
+        self.__pageSize = pageSize
+        self.__task = None
+
+    def __getPageSize(self, query):
+        pageSize = query.get('pageSize')
+
+        if pageSize is None:
+            return self.__pageSize
+
+        return int(pageSize[0])
+
+    async def __handleHttpConnection(self, reader, writer):
+        try:
+            requestLine = (await reader.readline()).decode('utf-8', errors='replace')
+
+            # the request headers aren't needed for anything, so just drain them
+            while True:
+                line = await reader.readline()
+
+                if len(line) == 0 or line in (b'\r\n', b'\n'):
+                    break
+
+            splits = requestLine.split()
+
+            if len(splits) < 2 or splits[0] != 'GET':
+                await self.__writeResponse(writer, 405, { 'error': 'only GET is supported' })
+                return
+
+            url = urlparse(splits[1])
+            query = parse_qs(url.query)
+            pathSplits = [ unquote(split) for split in url.path.split('/') if len(split) >= 1 ]
+
+            if len(pathSplits) < 2 or pathSplits[0] != 'leaderboard' or len(pathSplits) > 3:
+                await self.__writeResponse(writer, 404, { 'error': 'not found' })
+                return
+
+            twitchChannel = pathSplits[1]
+
+            if not self.__isCutenessEnabled(twitchChannel):
+                await self.__writeResponse(writer, 404, { 'error': f'no cuteness leaderboard for {twitchChannel}' })
+            elif len(pathSplits) == 3 and pathSplits[2] == 'stream':
+                await self.__streamLeaderboard(writer, twitchChannel, self.__getPageSize(query))
+            elif len(pathSplits) == 2:
+                page = self.__cutenessRepository.fetchLeaderboardPage(
+                    twitchChannel=twitchChannel,
+                    pageSize=self.__getPageSize(query),
+                    afterCursor=query.get('after', [ None ])[0]
+                )
+
+                await self.__writeResponse(writer, 200, page.toJson())
+            else:
+                await self.__writeResponse(writer, 404, { 'error': 'not found' })
+        except ValueError as e:
+            await self.__writeResponse(writer, 400, { 'error': str(e) })
+        except ConnectionError as e:
+            print(f'Error serving leaderboard: {e}')
+        except Exception as e:
+            print(f'Error serving leaderboard: {e}')
+            await self.__writeResponse(writer, 500, { 'error': 'internal server error' })
+        finally:
+            writer.close()
+
+    def __isCutenessEnabled(self, twitchChannel: str):
+        try:
+            return self.__usersRepository.getUser(twitchChannel).isCutenessEnabled()
+        except RuntimeError:
+            return False
+
+    async def __serve(self):
+        try:
+            await asyncio.start_server(self.__handleHttpConnection, self.__host, self.__port)
+        except OSError as e:
+            print(f'Unable to serve cuteness leaderboards at {self.__host}:{self.__port}: {e}')
+
+            # allow the next start() (e.g. after a users file change) to try again
+            self.__task = None
+            return
+
+        print(f'Serving cuteness leaderboards at http://{self.__host}:{self.__port}/leaderboard/<channel>')
+
+    def start(self):
+        if self.__task is not None:
+            return
+
+        self.__task = asyncio.get_event_loop().create_task(self.__serve())
+
+    async def __streamLeaderboard(self, writer, twitchChannel: str, pageSize: int):
+        # the first page is fetched before anything is written, so that a bad pageSize can still
+        # be answered with a 400
+        page = self.__cutenessRepository.fetchLeaderboardPage(
+            twitchChannel=twitchChannel,
+            pageSize=pageSize
+        )
+
+        writer.write(b'HTTP/1.1 200 OK\r\n')
+        writer.write(b'Content-Type: application/x-ndjson; charset=utf-8\r\n')
+        writer.write(b'Transfer-Encoding: chunked\r\n')
+        writer.write(b'Connection: close\r\n\r\n')
+
+        # Only one page is ever held in memory. Waiting for each chunk to drain before fetching
+        # the next page keeps a slow client from making us buffer the whole ranking, and also
+        # gives chat and pub sub events a turn on the event loop in between pages.
+        try:
+            while True:
+                body = ''.join(json.dumps(entry) + '\n' for entry in page.toJson()['entries']).encode('utf-8')
+
+                if len(body) >= 1:
+                    writer.write(f'{len(body):X}\r\n'.encode('utf-8'))
+                    writer.write(body)
+                    writer.write(b'\r\n')
+                    await writer.drain()
+
+                if not page.hasNextCursor():
+                    break
+
+                page = self.__cutenessRepository.fetchLeaderboardPage(
+                    twitchChannel=twitchChannel,
+                    pageSize=pageSize,
+                    afterCursor=page.getNextCursor()
+                )
+
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        except Exception as e:
+            # The 200 has already gone out, so there's no way to report this to the client other
+            # than closing the connection without the final chunk, which it'll see as truncated.
+            print(f'Error streaming the cuteness leaderboard for {twitchChannel}: {e}')
+
+    async def __writeResponse(self, writer, statusCode: int, jsonContents: dict):
+        body = json.dumps(jsonContents).encode('utf-8')
+        reasons = { 200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error' }
+
+        writer.write(f'HTTP/1.1 {statusCode} {reasons[statusCode]}\r\n'.encode('utf-8'))
+        writer.write(b'Content-Type: application/json; charset=utf-8\r\n')
+        writer.write(f'Content-Length: {len(body)}\r\n'.encode('utf-8'))
+        writer.write(b'Connection: close\r\n\r\n')
+        writer.write(body)
+        await writer.drain()
@@ -26,8 +26,12 @@ class LocationsRepository():
         if not utils.isValidStr(id_):
             raise ValueError(f'id_ argument is malformed: \"{id_}\"')
 
-        if id_.lower() in self.__locationsCache:
-            return self.__locationsCache[id_.lower()]
+        # location IDs aren't channels, but they're matched the same way, case insensitively
+        locationKey = id_.lower()
+        location = self.__locationsCache.get(locationKey)
+
+        if location is not None:
+            return location
 
         if not path.exists(self.__locationsFile):
             raise FileNotFoundError(f'Locations file not found: \"{self.__locationsFile}\"')
@@ -39,7 +43,7 @@ class LocationsRepository():
             raise IOError(f'Error reading from locations file: \"{self.__locationsFile}\"')
 
         for locationId in jsonContents:
-            if id_.lower() == locationId.lower():
+            if locationKey == locationId.lower():
                 timeZoneStr = jsonContents[locationId]['timeZone']
                 timeZone = self.__timeZoneRepository.getTimeZone(timeZoneStr)
 
@@ -51,7 +55,7 @@ class LocationsRepository():
                     timeZone=timeZone
                 )
 
-                self.__locationsCache[id_.lower()] = location
+                self.__locationsCache[locationKey] = location
                 return location
 
         raise RuntimeError(f'Unable to find location with ID \"{id_}\" in locations file: \"{self.__locationsFile}\"')
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+import CynanBotCommon.utils as utils
+from metricsRepository import MetricsRepository
+
+
+class LoopStallDetector():
+
+    def __init__(
+        self,
+        metricsRepository: MetricsRepository,
+        heartbeatTimeDelta: timedelta = timedelta(milliseconds=100),
+        stallTimeDelta: timedelta = timedelta(milliseconds=500)
+    ):
+        if metricsRepository is None:
+            raise ValueError(f'metricsRepository argument is malformed: \"{metricsRepository}\"')
+        elif heartbeatTimeDelta is None:
+            raise ValueError(f'heartbeatTimeDelta argument is malformed: \"{heartbeatTimeDelta}\"')
+        elif stallTimeDelta is None:
+            raise ValueError(f'stallTimeDelta argument is malformed: \"{stallTimeDelta}\"')
+        elif stallTimeDelta <= heartbeatTimeDelta:
+            raise ValueError(f'stallTimeDelta ({stallTimeDelta}) must be greater than heartbeatTimeDelta ({heartbeatTimeDelta})')
+
+        self.__metricsRepository = metricsRepository
+        self.__heartbeatSeconds = heartbeatTimeDelta.total_seconds()
+        self.__stallSeconds = stallTimeDelta.total_seconds()
+        self.__rootDirectory = os.path.dirname(os.path.abspath(__file__))
+        self.__ignoredFiles = {
+            os.path.abspath(__file__),
+            os.path.join(self.__rootDirectory, 'metricsRepository.py')
+        }
+
+        self.__lock = threading.Lock()
+        self.__stallCounts = dict()
+        self.__lastHeartbeat = None
+        self.__loopThreadId = None
+        self.__samplerThread = None
+
+    def __findCallsite(self, frame):
+        # Walks the blocked stack from the innermost frame outwards. The innermost frame inside of
+        # one of our repositories or helpers is the most useful thing to blame, otherwise we fall
+        # back to the innermost frame that is at least somewhere inside of this project.
+        projectCallsite = None
+
+        while frame is not None:
+            fileName = os.path.abspath(frame.f_code.co_filename)
+
+            if fileName.startswith(self.__rootDirectory) and fileName not in self.__ignoredFiles:
+                baseName = os.path.basename(fileName)
+                callsite = f'{baseName}:{frame.f_code.co_name}'
+
+                if baseName.endswith('Repository.py') or baseName.endswith('Helper.py'):
+                    return callsite
+                elif projectCallsite is None:
+                    projectCallsite = callsite
+
+            frame = frame.f_back
+
+        if projectCallsite is None:
+            return 'unknown'
+
+        return projectCallsite
+
+    def getStallCounts(self):
+        with self.__lock:
+            return dict(self.__stallCounts)
+
+    def __recordStall(self, stalledSeconds: float):
+        frame = sys._current_frames().get(self.__loopThreadId)
+
+        if frame is None:
+            return
+
+        callsite = self.__findCallsite(frame)
+        stack = ''.join(traceback.format_stack(frame))
+
+        with self.__lock:
+            count = self.__stallCounts.get(callsite, 0) + 1
+            self.__stallCounts[callsite] = count
+
+        self.__metricsRepository.incrementCounter('loop_stalls', { 'callsite': callsite })
+        print(f'({utils.getNowTimeText(includeSeconds=True)}) Event loop has been stalled for {stalledSeconds * 1000:.0f}ms in {callsite} (stall #{count} there):\n{stack}')
+
+    async def __runHeartbeat(self):
+        while True:
+            startTime = time.monotonic()
+            await asyncio.sleep(self.__heartbeatSeconds)
+            now = time.monotonic()
+            self.__lastHeartbeat = now
+
+            self.__metricsRepository.observeLatency(
+                name='loop_lag',
+                labels=None,
+                seconds=max(0, now - startTime - self.__heartbeatSeconds)
+            )
+
+    def __runSampler(self):
+        capturedHeartbeat = None
+
+        while True:
+            time.sleep(self.__heartbeatSeconds)
+            lastHeartbeat = self.__lastHeartbeat
+
+            if lastHeartbeat is None or lastHeartbeat == capturedHeartbeat:
+                continue
+
+            stalledSeconds = time.monotonic() - lastHeartbeat
+
+            # Only capture the stack once per stall, while the loop thread is still stuck in it.
+            if stalledSeconds >= self.__stallSeconds:
+                capturedHeartbeat = lastHeartbeat
+                self.__recordStall(stalledSeconds)
+
+    def start(self):
+        if self.__samplerThread is not None:
+            return
+
+        self.__loopThreadId = threading.get_ident()
+        self.__lastHeartbeat = time.monotonic()
+        asyncio.get_event_loop().create_task(self.__runHeartbeat())
+
+        self.__samplerThread = threading.Thread(
+            target=self.__runSampler,
+            name='LoopStallDetector',
+            daemon=True
+        )
+
+        self.__samplerThread.start()
@@ -0,0 +1,344 @@
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Dict, List
+
+import CynanBotCommon.utils as utils
+
+
+class MetricsRepository():
+
+    def __init__(
+        self,
+        buckets: List[float] = ( 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10 ),
+        host: str = '127.0.0.1',
+        port: int = 9187,
+        summaryTimeDelta: timedelta = timedelta(minutes=15)
+    ):
+        if not utils.hasItems(buckets):
+            raise ValueError(f'buckets argument is malformed: \"{buckets}\"')
+        elif not utils.isValidStr(host):
+            raise ValueError(f'host argument is malformed: \"{host}\"')
+        elif not utils.isValidNum(port):
+            raise ValueError(f'port argument is malformed: \"{port}\"')
+        elif summaryTimeDelta is None:
+            raise ValueError(f'summaryTimeDelta argument is malformed: \"{summaryTimeDelta}\"')
+
+        self.__buckets = sorted(buckets)
+        self.__host = host
+        self.__port = port
+        self.__summaryTimeDelta = summaryTimeDelta
+
+        # Repository methods can be called from executor threads (see ResponseCache), so every
+        # access to the below dictionaries has to happen while holding this lock.
+        self.__lock = threading.Lock()
+        self.__counters = dict()
+        self.__gauges = dict()
+        self.__histograms = dict()
+        self.__tasks = None
+
+    def __createSeriesKey(self, name: str, labels: Dict[str, str]):
+        if not utils.isValidStr(name):
+            raise ValueError(f'name argument is malformed: \"{name}\"')
+
+        if labels is None or len(labels) == 0:
+            return (name, tuple())
+
+        return (name, tuple(sorted((key, str(value)) for key, value in labels.items())))
+
+    def __escapeLabelValue(self, value: str):
+        return value.replace('\\', '\\\\').replace('\"', '\\\"').replace('\n', '\\n')
+
+    def __formatLabels(self, labels, extraLabel: str = None):
+        strings = [ f'{key}=\"{self.__escapeLabelValue(value)}\"' for key, value in labels ]
+
+        if utils.isValidStr(extraLabel):
+            strings.append(extraLabel)
+
+        if len(strings) == 0:
+            return ''
+
+        return '{' + ','.join(strings) + '}'
+
+    async def __handleHttpConnection(self, reader, writer):
+        try:
+            # we serve the same response no matter the path, so just drain the request headers
+            while True:
+                line = await reader.readline()
+
+                if len(line) == 0 or line in (b'\r\n', b'\n'):
+                    break
+
+            body = self.toPrometheusStr().encode('utf-8')
+            writer.write(b'HTTP/1.1 200 OK\r\n')
+            writer.write(b'Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n')
+            writer.write(f'Content-Length: {len(body)}\r\n'.encode('utf-8'))
+            writer.write(b'Connection: close\r\n\r\n')
+            writer.write(body)
+            await writer.drain()
+        except ConnectionError as e:
+            print(f'Error serving metrics: {e}')
+        finally:
+            writer.close()
+
+    def incrementCounter(self, name: str, labels: Dict[str, str] = None, amount: int = 1):
+        seriesKey = self.__createSeriesKey(name, labels)
+
+        with self.__lock:
+            self.__counters[seriesKey] = self.__counters.get(seriesKey, 0) + amount
+
+    def instrument(self, repository, repositoryName: str = None):
+        if repository is None:
+            raise ValueError(f'repository argument is malformed: \"{repository}\"')
+
+        if not utils.isValidStr(repositoryName):
+            repositoryName = type(repository).__name__
+
+        for methodName in dir(repository):
+            if methodName.startswith('_'):
+                continue
+
+            method = getattr(repository, methodName)
+
+            if not callable(method) or inspect.isclass(method):
+                continue
+
+            setattr(repository, methodName, self.__wrapMethod(
+                method=method,
+                labels={ 'repository': repositoryName, 'method': methodName }
+            ))
+
+        return repository
+
+    @contextmanager
+    def measure(self, name: str, labels: Dict[str, str] = None):
+        startTime = time.perf_counter()
+        isError = False
+
+        try:
+            yield
+        except BaseException:
+            isError = True
+            raise
+        finally:
+            self.observeLatency(
+                name=name,
+                labels=labels,
+                seconds=time.perf_counter() - startTime,
+                isError=isError
+            )
+
+    def observeLatency(self, name: str, labels: Dict[str, str], seconds: float, isError: bool = False):
+        seriesKey = self.__createSeriesKey(name, labels)
+
+        with self.__lock:
+            histogram = self.__histograms.get(seriesKey)
+
+            if histogram is None:
+                histogram = LatencyHistogram(self.__buckets)
+                self.__histograms[seriesKey] = histogram
+
+            histogram.observe(seconds, isError)
+
+    def recordError(self, name: str, labels: Dict[str, str] = None):
+        seriesKey = self.__createSeriesKey(name, labels)
+
+        with self.__lock:
+            histogram = self.__histograms.get(seriesKey)
+
+            if histogram is None:
+                histogram = LatencyHistogram(self.__buckets)
+                self.__histograms[seriesKey] = histogram
+
+            histogram.recordError()
+
+    async def __runLogSummary(self):
+        while True:
+            await asyncio.sleep(self.__summaryTimeDelta.total_seconds())
+            print(f'Metrics summary ({utils.getNowTimeText()}):\n{self.toSummaryStr()}')
+
+    def setGauge(self, name: str, labels: Dict[str, str], value: float):
+        seriesKey = self.__createSeriesKey(name, labels)
+
+        with self.__lock:
+            self.__gauges[seriesKey] = value
+
+    async def __serve(self):
+        try:
+            await asyncio.start_server(self.__handleHttpConnection, self.__host, self.__port)
+        except OSError as e:
+            print(f'Unable to serve metrics at {self.__host}:{self.__port}: {e}')
+            return
+
+        print(f'Serving metrics at http://{self.__host}:{self.__port}/metrics')
+
+    def start(self):
+        if self.__tasks is not None:
+            return
+
+        loop = asyncio.get_event_loop()
+
+        self.__tasks = [
+            loop.create_task(self.__serve()),
+            loop.create_task(self.__runLogSummary())
+        ]
+
+    def toPrometheusStr(self):
+        lines = list()
+
+        with self.__lock:
+            histogramNames = sorted(set(name for name, _ in self.__histograms))
+
+            for name in histogramNames:
+                lines.append(f'# TYPE cynanbot_{name}_seconds histogram')
+
+                for (seriesName, labels), histogram in self.__histograms.items():
+                    if seriesName != name:
+                        continue
+
+                    labelsStr = self.__formatLabels(labels)
+
+                    for bucket, count in histogram.getCumulativeBucketCounts():
+                        bucketLabelsStr = self.__formatLabels(labels, f'le="{bucket}"')
+                        lines.append(f'cynanbot_{name}_seconds_bucket{bucketLabelsStr} {count}')
+
+                    bucketLabelsStr = self.__formatLabels(labels, 'le="+Inf"')
+                    lines.append(f'cynanbot_{name}_seconds_bucket{bucketLabelsStr} {histogram.getCount()}')
+                    lines.append(f'cynanbot_{name}_seconds_sum{labelsStr} {histogram.getSum()}')
+                    lines.append(f'cynanbot_{name}_seconds_count{labelsStr} {histogram.getCount()}')
+
+                lines.append(f'# TYPE cynanbot_{name}_errors_total counter')
+
+                for (seriesName, labels), histogram in self.__histograms.items():
+                    if seriesName == name:
+                        lines.append(f'cynanbot_{name}_errors_total{self.__formatLabels(labels)} {histogram.getErrorCount()}')
+
+            # series are sorted by name, so each metric's series are next to each other, and only
+            # the first of them gets the TYPE line (Prometheus rejects a metric typed twice)
+            previousName = None
+
+            for (name, labels), value in sorted(self.__counters.items()):
+                if name != previousName:
+                    lines.append(f'# TYPE cynanbot_{name}_total counter')
+                    previousName = name
+
+                lines.append(f'cynanbot_{name}_total{self.__formatLabels(labels)} {value}')
+
+            previousName = None
+
+            for (name, labels), value in sorted(self.__gauges.items()):
+                if name != previousName:
+                    lines.append(f'# TYPE cynanbot_{name} gauge')
+                    previousName = name
+
+                lines.append(f'cynanbot_{name}{self.__formatLabels(labels)} {value}')
+
+        lines.append('')
+        return '\n'.join(lines)
+
+    def toSummaryStr(self):
+        lines = list()
+
+        with self.__lock:
+            for (name, labels), histogram in sorted(self.__histograms.items()):
+                labelsStr = ', '.join(f'{key}={labelValue}' for key, labelValue in labels)
+                lines.append(f'\t{name} ({labelsStr}): {histogram.toSummaryStr()}')
+
+            for (name, labels), value in sorted(self.__counters.items()):
+                labelsStr = ', '.join(f'{key}={labelValue}' for key, labelValue in labels)
+                lines.append(f'\t{name} ({labelsStr}): {value}')
+
+        if len(lines) == 0:
+            return '\tNo metrics recorded yet'
+
+        return '\n'.join(lines)
+
+    def __wrapMethod(self, method, labels: Dict[str, str]):
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def asyncWrapper(*args, **kwargs):
+                with self.measure('repository_call', labels):
+                    return await method(*args, **kwargs)
+
+            return asyncWrapper
+        else:
+            @functools.wraps(method)
+            def wrapper(*args, **kwargs):
+                with self.measure('repository_call', labels):
+                    return method(*args, **kwargs)
+
+            return wrapper
+
+
+class LatencyHistogram():
+
+    def __init__(self, buckets: List[float]):
+        if not utils.hasItems(buckets):
+            raise ValueError(f'buckets argument is malformed: \"{buckets}\"')
+
+        self.__buckets = buckets
+        self.__bucketCounts = [ 0 ] * len(buckets)
+        self.__count = 0
+        self.__errorCount = 0
+        self.__sum = 0.0
+
+    def getCount(self):
+        return self.__count
+
+    def getCumulativeBucketCounts(self):
+        cumulativeBucketCounts = list()
+        total = 0
+
+        for bucket, count in zip(self.__buckets, self.__bucketCounts):
+            total = total + count
+            cumulativeBucketCounts.append((bucket, total))
+
+        return cumulativeBucketCounts
+
+    def getErrorCount(self):
+        return self.__errorCount
+
+    def getPercentile(self, percentile: float):
+        if self.__count == 0:
+            return None
+
+        # This is an upper bound, as we only know which bucket the percentile falls into.
+        target = self.__count * percentile
+
+        for bucket, total in self.getCumulativeBucketCounts():
+            if total >= target:
+                return bucket
+
+        return float('inf')
+
+    def getSum(self):
+        return self.__sum
+
+    def observe(self, seconds: float, isError: bool):
+        self.__count = self.__count + 1
+        self.__sum = self.__sum + seconds
+
+        if isError:
+            self.__errorCount = self.__errorCount + 1
+
+        for index, bucket in enumerate(self.__buckets):
+            if seconds <= bucket:
+                self.__bucketCounts[index] = self.__bucketCounts[index] + 1
+                break
+
+    def recordError(self):
+        self.__errorCount = self.__errorCount + 1
+
+    def toSummaryStr(self):
+        if self.__count == 0:
+            return f'0 calls, {self.__errorCount} error(s)'
+
+        meanMillis = (self.__sum / self.__count) * 1000
+        p50Millis = self.getPercentile(0.5) * 1000
+        p99Millis = self.getPercentile(0.99) * 1000
+        errorRate = (self.__errorCount / self.__count) * 100
+        return f'{self.__count} calls, mean {meanMillis:.1f}ms, p50 <= {p50Millis:g}ms, p99 <= {p99Millis:g}ms, {errorRate:.1f}% errors'
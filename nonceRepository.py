@@ -1,4 +1,5 @@
 import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
 
 
 class NonceRepository():
@@ -10,17 +11,25 @@ class NonceRepository():
         if not utils.isValidStr(key):
             raise ValueError(f'key argument is malformed: \"{key}\"')
 
-        key = key.lower()
+        key = ChannelKey(key)
         return self.__cache.get(key)
 
+    def removeNonce(self, key: str):
+        if not utils.isValidStr(key):
+            raise ValueError(f'key argument is malformed: \"{key}\"')
+
+        key = ChannelKey(key)
+        self.__cache.pop(key, None)
+
     def setNonce(self, key: str, nonce: str):
         if not utils.isValidStr(key):
             raise ValueError(f'key argument is malformed: \"{key}\"')
 
+        key = ChannelKey(key)
+
         if not utils.isValidStr(nonce):
             print(f'key \"{key}\" has an invalid nonce: \"{nonce}\"')
             self.__cache.pop(key, None)
             return
 
-        key = key.lower()
         self.__cache[key] = nonce
@@ -0,0 +1,120 @@
+import asyncio
+from collections import deque
+from datetime import timedelta
+
+import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
+from metricsRepository import MetricsRepository
+
+
+# Paces the !battle, !catch, !freeevolve and !freeshiny commands that pkmn reward redemptions send
+# to the pkmn game bot, so that a burst of redemptions (say, during a giveaway) turns into a steady
+# stream of chat lines, rather than a flood that trips Twitch's rate limits. Each channel gets its
+# own queue, and a command that's identical to one already waiting in that channel is dropped.
+
+class PkmnCommandQueue():
+
+    def __init__(
+        self,
+        metricsRepository: MetricsRepository,
+        commandTimeDelta: timedelta = timedelta(seconds=2),
+        maxQueueSize: int = 100
+    ):
+        if metricsRepository is None:
+            raise ValueError(f'metricsRepository argument is malformed: \"{metricsRepository}\"')
+        elif commandTimeDelta is None:
+            raise ValueError(f'commandTimeDelta argument is malformed: \"{commandTimeDelta}\"')
+        elif not utils.isValidNum(maxQueueSize):
+            raise ValueError(f'maxQueueSize argument is malformed: \"{maxQueueSize}\"')
+        elif maxQueueSize < 1:
+            raise ValueError(f'maxQueueSize argument is out of bounds: \"{maxQueueSize}\"')
+
+        self.__metricsRepository = metricsRepository
+        self.__commandSeconds = commandTimeDelta.total_seconds()
+        self.__maxQueueSize = maxQueueSize
+        self.__channels = dict()
+        self.__commands = dict()
+        self.__lastSendTimes = dict()
+        self.__tasks = dict()
+
+    async def __drain(self, channelKey: ChannelKey):
+        commands = self.__commands[channelKey]
+
+        try:
+            while len(commands) >= 1:
+                await asyncio.sleep(self.__getWaitSeconds(channelKey))
+
+                command = commands.popleft()
+                self.__updateQueueDepth(channelKey)
+                await self.__send(channelKey, command)
+        finally:
+            del self.__tasks[channelKey]
+
+    def getQueueDepth(self, handle: str):
+        commands = self.__commands.get(ChannelKey(handle))
+
+        if commands is None:
+            return 0
+
+        return len(commands)
+
+    def __getWaitSeconds(self, channelKey: ChannelKey):
+        lastSendTime = self.__lastSendTimes.get(channelKey)
+
+        if lastSendTime is None:
+            return 0
+
+        return max(0, lastSendTime + self.__commandSeconds - asyncio.get_event_loop().time())
+
+    async def __send(self, channelKey: ChannelKey, command: str):
+        # recorded before sending, so that anything submitted while this is being sent still waits
+        self.__lastSendTimes[channelKey] = asyncio.get_event_loop().time()
+
+        try:
+            await self.__channels[channelKey].send(command)
+        except Exception as e:
+            print(f'Error sending pkmn command \"{command}\" to {channelKey}: {e}')
+
+    async def submit(self, twitchChannel, command: str):
+        if twitchChannel is None:
+            raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
+        elif not utils.isValidStr(command):
+            raise ValueError(f'command argument is malformed: \"{command}\"')
+
+        channelKey = ChannelKey(twitchChannel.name)
+        self.__channels[channelKey] = twitchChannel
+
+        commands = self.__commands.get(channelKey)
+        if commands is None:
+            commands = deque()
+            self.__commands[channelKey] = commands
+
+        # nothing is waiting and the last command went out long enough ago, so there's no need to
+        # involve the queue at all
+        if len(commands) == 0 and channelKey not in self.__tasks and self.__getWaitSeconds(channelKey) == 0:
+            await self.__send(channelKey, command)
+            return True
+
+        if command in commands:
+            print(f'Dropping pkmn command \"{command}\" in {channelKey}, as it\'s already queued')
+            self.__metricsRepository.incrementCounter('pkmn_commands_dropped', { 'channel': channelKey, 'reason': 'duplicate' })
+            return False
+        elif len(commands) >= self.__maxQueueSize:
+            print(f'Dropping pkmn command \"{command}\" in {channelKey}, as {len(commands)} command(s) are already queued')
+            self.__metricsRepository.incrementCounter('pkmn_commands_dropped', { 'channel': channelKey, 'reason': 'full' })
+            return False
+
+        commands.append(command)
+        self.__updateQueueDepth(channelKey)
+
+        if channelKey not in self.__tasks:
+            self.__tasks[channelKey] = asyncio.get_event_loop().create_task(self.__drain(channelKey))
+
+        return True
+
+    def __updateQueueDepth(self, channelKey: ChannelKey):
+        self.__metricsRepository.setGauge(
+            name='pkmn_command_queue_depth',
+            labels={ 'channel': channelKey },
+            value=len(self.__commands[channelKey])
+        )
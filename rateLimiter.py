@@ -0,0 +1,117 @@
+from collections import deque
+from datetime import datetime, timedelta
+
+import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
+
+
+class SlidingWindowRateLimiter():
+
+    def __init__(self, maxEvents: int, timeDelta: timedelta):
+        if not utils.isValidNum(maxEvents):
+            raise ValueError(f'maxEvents argument is malformed: \"{maxEvents}\"')
+        elif maxEvents < 1:
+            raise ValueError(f'maxEvents argument is out of bounds: \"{maxEvents}\"')
+        elif timeDelta is None:
+            raise ValueError(f'timeDelta argument is malformed: \"{timeDelta}\"')
+
+        self.__maxEvents = maxEvents
+        self.__timeDelta = timeDelta
+        self.__events = dict()
+        self.__nextSweepTime = datetime.now() + timeDelta
+
+    def __getRecentEvents(self, key: str, now: datetime):
+        events = self.__events.get(key)
+
+        if events is None:
+            return None
+
+        windowStart = now - self.__timeDelta
+
+        while len(events) >= 1 and events[0] <= windowStart:
+            events.popleft()
+
+        if len(events) == 0:
+            del self.__events[key]
+            return None
+
+        return events
+
+    def isReady(self, key: str):
+        if not utils.isValidStr(key):
+            raise ValueError(f'key argument is malformed: \"{key}\"')
+
+        events = self.__getRecentEvents(key, datetime.now())
+        return events is None or len(events) < self.__maxEvents
+
+    def __sweep(self, now: datetime):
+        # A key is otherwise only cleaned up when it's looked up again, so everyone that has ever
+        # used a command would stay in here forever. At most once per window, every key whose
+        # newest event has already left the window is dropped.
+        windowStart = now - self.__timeDelta
+        expiredKeys = [ key for key, events in self.__events.items() if events[-1] <= windowStart ]
+
+        for key in expiredKeys:
+            del self.__events[key]
+
+        self.__nextSweepTime = now + self.__timeDelta
+
+    def update(self, key: str):
+        if not utils.isValidStr(key):
+            raise ValueError(f'key argument is malformed: \"{key}\"')
+
+        now = datetime.now()
+
+        if now >= self.__nextSweepTime:
+            self.__sweep(now)
+
+        events = self.__getRecentEvents(key, now)
+
+        if events is None:
+            events = deque()
+            self.__events[key] = events
+
+        events.append(now)
+
+
+class UserAndChannelRateLimiter():
+
+    def __init__(
+        self,
+        channelMaxEvents: int,
+        channelTimeDelta: timedelta,
+        userMaxEvents: int,
+        userTimeDelta: timedelta
+    ):
+        self.__channelRateLimiter = SlidingWindowRateLimiter(
+            maxEvents=channelMaxEvents,
+            timeDelta=channelTimeDelta
+        )
+
+        self.__userRateLimiter = SlidingWindowRateLimiter(
+            maxEvents=userMaxEvents,
+            timeDelta=userTimeDelta
+        )
+
+    def isReadyAndUpdate(self, twitchChannel: str, userName: str, isMod: bool = False):
+        if not utils.isValidStr(twitchChannel):
+            raise ValueError(f'twitchChannel argument is malformed: \"{twitchChannel}\"')
+        elif not utils.isValidStr(userName):
+            raise ValueError(f'userName argument is malformed: \"{userName}\"')
+
+        twitchChannel = ChannelKey(twitchChannel)
+        userKey = f'{twitchChannel}:{userName.lower()}'
+
+        # Mods skip the channel-wide limit, but everyone (mods included) is still subject to the
+        # per-user limit, as each accepted command can cost us an upstream API call.
+        if not self.__userRateLimiter.isReady(userKey):
+            return False
+        elif not isMod and not self.__channelRateLimiter.isReady(twitchChannel):
+            return False
+
+        self.__userRateLimiter.update(userKey)
+
+        if not isMod:
+            self.__channelRateLimiter.update(twitchChannel)
+
+        return True
@@ -0,0 +1,98 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict
+
+import CynanBotCommon.utils as utils
+
+
+class ResponseCache():
+
+    def __init__(
+        self,
+        timeToLives: Dict[str, timedelta],
+        expirationTimes: Dict[str, Callable] = None,
+        defaultTimeToLive: timedelta = timedelta(minutes=5),
+        maxSize: int = 512
+    ):
+        if timeToLives is None:
+            raise ValueError(f'timeToLives argument is malformed: \"{timeToLives}\"')
+        elif defaultTimeToLive is None:
+            raise ValueError(f'defaultTimeToLive argument is malformed: \"{defaultTimeToLive}\"')
+        elif not utils.isValidNum(maxSize):
+            raise ValueError(f'maxSize argument is malformed: \"{maxSize}\"')
+        elif maxSize < 1:
+            raise ValueError(f'maxSize argument is out of bounds: \"{maxSize}\"')
+
+        if expirationTimes is None:
+            expirationTimes = dict()
+
+        # sources whose values change at a known time (rather than going stale after a while) give
+        # a function that returns when that is, instead of a time to live
+        self.__timeToLives = timeToLives
+        self.__expirationTimes = expirationTimes
+        self.__defaultTimeToLive = defaultTimeToLive
+        self.__maxSize = maxSize
+        self.__entries = OrderedDict()
+        self.__inFlight = dict()
+
+    async def fetch(self, source: str, key: str, fetcher: Callable):
+        if not utils.isValidStr(source):
+            raise ValueError(f'source argument is malformed: \"{source}\"')
+        elif not utils.isValidStr(key):
+            raise ValueError(f'key argument is malformed: \"{key}\"')
+        elif fetcher is None:
+            raise ValueError(f'fetcher argument is malformed: \"{fetcher}\"')
+
+        cacheKey = (source, key)
+        entry = self.__entries.get(cacheKey)
+
+        if entry is not None:
+            expirationTime, value = entry
+
+            if datetime.now(timezone.utc) < expirationTime:
+                self.__entries.move_to_end(cacheKey)
+                return value
+
+            del self.__entries[cacheKey]
+
+        future = self.__inFlight.get(cacheKey)
+
+        if future is None:
+            # The fetchers we're given perform blocking network calls, so they're run on the
+            # default executor. Anyone else asking for the same key while that's happening will
+            # just wait on this same future instead of making their own call.
+            loop = asyncio.get_event_loop()
+            future = asyncio.ensure_future(loop.run_in_executor(None, fetcher))
+            self.__inFlight[cacheKey] = future
+            future.add_done_callback(lambda f: self.__onFetchDone(source, cacheKey, f))
+
+        return await asyncio.shield(future)
+
+    def __onFetchDone(self, source: str, cacheKey, future):
+        self.__inFlight.pop(cacheKey, None)
+
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        value = future.result()
+
+        # failed lookups are never cached, so that the next request tries again
+        if value is None:
+            return
+
+        self.__entries[cacheKey] = (self.__getExpirationTime(source), value)
+        self.__entries.move_to_end(cacheKey)
+
+        while len(self.__entries) > self.__maxSize:
+            self.__entries.popitem(last=False)
+
+    def __getExpirationTime(self, source: str):
+        if source in self.__expirationTimes:
+            return self.__expirationTimes[source]()
+
+        timeToLive = self.__timeToLives.get(source, self.__defaultTimeToLive)
+        return datetime.now(timezone.utc) + timeToLive
+
+    def getSize(self):
+        return len(self.__entries)
@@ -0,0 +1,223 @@
+import asyncio
+from datetime import timedelta
+from typing import Callable, Dict
+
+import CynanBotCommon.utils as utils
+from authHelper import AuthHelper
+from user import User
+from userIdsRepository import UserIdsRepository
+from usersRepository import UsersRepository
+from userTokensRepository import UserTokensRepository
+
+
+# Maps each channel's channel point reward IDs to whatever handles them, so that a redemption is a
+# single dict lookup no matter how many kinds of rewards there are. Handlers register themselves
+# along with how to get their reward ID from a User, and the table is rebuilt by buildTables()
+# whenever the users file is (re)loaded, never while handling a redemption. A channel whose ID
+# can't be looked up is left out of the table, and only that channel is looked up again, after a
+# backoff, rather than the whole table being rebuilt.
+
+class RewardDispatcher():
+
+    def __init__(
+        self,
+        authHelper: AuthHelper,
+        userIdsRepository: UserIdsRepository,
+        usersRepository: UsersRepository,
+        userTokensRepository: UserTokensRepository,
+        retryTimeDelta: timedelta = timedelta(seconds=30),
+        maxRetryTimeDelta: timedelta = timedelta(minutes=30)
+    ):
+        if authHelper is None:
+            raise ValueError(f'authHelper argument is malformed: \"{authHelper}\"')
+        elif userIdsRepository is None:
+            raise ValueError(f'userIdsRepository argument is malformed: \"{userIdsRepository}\"')
+        elif usersRepository is None:
+            raise ValueError(f'usersRepository argument is malformed: \"{usersRepository}\"')
+        elif userTokensRepository is None:
+            raise ValueError(f'userTokensRepository argument is malformed: \"{userTokensRepository}\"')
+        elif retryTimeDelta is None:
+            raise ValueError(f'retryTimeDelta argument is malformed: \"{retryTimeDelta}\"')
+        elif maxRetryTimeDelta is None:
+            raise ValueError(f'maxRetryTimeDelta argument is malformed: \"{maxRetryTimeDelta}\"')
+
+        self.__authHelper = authHelper
+        self.__userIdsRepository = userIdsRepository
+        self.__usersRepository = usersRepository
+        self.__userTokensRepository = userTokensRepository
+        self.__retrySeconds = retryTimeDelta.total_seconds()
+        self.__maxRetrySeconds = maxRetryTimeDelta.total_seconds()
+        self.__rewardTypes = list()
+        self.__channels = dict()
+        self.__rewards = dict()
+        self.__failedUsers = dict()
+        self.__retryCount = 0
+        self.__retryHandle = None
+
+    def __addUser(self, user: User, channels: Dict, rewards: Dict):
+        # returns False if the channel's ID couldn't be looked up, in which case it's left out
+        try:
+            channelId = self.__fetchChannelId(user)
+        except Exception as e:
+            print(f'Error fetching the channel ID for {user.getHandle()}, its rewards will be ignored for now: {e}')
+            return False
+
+        # channels without an access token have no pub sub subscription, so no redemptions
+        if not utils.isValidStr(channelId):
+            return True
+
+        channels[channelId] = user
+
+        for rewardType in self.__rewardTypes:
+            # settings for disabled features are never loaded, so their reward IDs are None
+            rewardId = rewardType.getRewardId(user)
+
+            if not utils.isValidStr(rewardId):
+                continue
+            elif (channelId, rewardId) in rewards:
+                print(f'{user.getHandle()} uses reward ID \"{rewardId}\" for both {rewards[(channelId, rewardId)].getRewardName()} and {rewardType.getRewardName()}, ignoring the latter')
+                continue
+
+            rewards[(channelId, rewardId)] = rewardType
+
+        return True
+
+    def buildTables(self):
+        users = self.__usersRepository.getUsers()
+        channels = dict()
+        rewards = dict()
+        failedUsers = dict()
+
+        for user in users:
+            if not self.__addUser(user, channels, rewards):
+                failedUsers[user.getChannelKey()] = user
+
+        # swapped in whole, rather than updated in place
+        self.__channels = channels
+        self.__rewards = rewards
+        self.__setFailedUsers(failedUsers, retryCount=0)
+
+    def __fetchChannelId(self, user: User):
+        accessToken = self.__userTokensRepository.getAccessToken(user.getHandle())
+
+        if accessToken is None:
+            return None
+
+        return self.__userIdsRepository.fetchUserId(
+            userName=user.getHandle(),
+            clientId=self.__authHelper.getClientId(),
+            accessToken=accessToken
+        )
+
+    def getFailedUsers(self):
+        return list(self.__failedUsers.values())
+
+    def getReward(self, channelId: str, rewardId: str):
+        return self.__rewards.get((channelId, rewardId))
+
+    def getUser(self, channelId: str):
+        return self.__channels.get(channelId)
+
+    def registerReward(self, rewardName: str, getRewardId: Callable, handler: Callable):
+        if not utils.isValidStr(rewardName):
+            raise ValueError(f'rewardName argument is malformed: \"{rewardName}\"')
+        elif getRewardId is None:
+            raise ValueError(f'getRewardId argument is malformed: \"{getRewardId}\"')
+        elif handler is None:
+            raise ValueError(f'handler argument is malformed: \"{handler}\"')
+
+        self.__rewardTypes.append(RewardType(
+            rewardName=rewardName,
+            getRewardId=getRewardId,
+            handler=handler
+        ))
+
+    def __retryFailedUsers(self):
+        self.__retryHandle = None
+
+        channels = dict(self.__channels)
+        rewards = dict(self.__rewards)
+        failedUsers = dict()
+
+        for channelKey, user in self.__failedUsers.items():
+            if not self.__addUser(user, channels, rewards):
+                failedUsers[channelKey] = user
+
+        self.__channels = channels
+        self.__rewards = rewards
+        self.__setFailedUsers(failedUsers, retryCount=self.__retryCount + 1)
+
+    def __setFailedUsers(self, failedUsers: Dict, retryCount: int):
+        self.__failedUsers = failedUsers
+        self.__retryCount = retryCount
+
+        # a rebuild supersedes whatever retry was still pending
+        if self.__retryHandle is not None:
+            self.__retryHandle.cancel()
+            self.__retryHandle = None
+
+        if len(failedUsers) == 0:
+            return
+
+        # doubles with every failed retry, up to maxRetryTimeDelta
+        retrySeconds = min(self.__retrySeconds * (2 ** retryCount), self.__maxRetrySeconds)
+        self.__retryHandle = asyncio.get_event_loop().call_later(retrySeconds, self.__retryFailedUsers)
+
+
+class RewardType():
+
+    def __init__(self, rewardName: str, getRewardId: Callable, handler: Callable):
+        self.__rewardName = rewardName
+        self.__getRewardId = getRewardId
+        self.__handler = handler
+
+    def getHandler(self):
+        return self.__handler
+
+    def getRewardId(self, user: User):
+        return self.__getRewardId(user)
+
+    def getRewardName(self):
+        return self.__rewardName
+
+
+class RewardRedemption():
+
+    def __init__(
+        self,
+        redemptionMessage: str,
+        rewardId: str,
+        twitchChannel,
+        twitchUser: User,
+        userIdThatRedeemed: str,
+        userNameThatRedeemed: str
+    ):
+        if not utils.isValidStr(rewardId):
+            raise ValueError(f'rewardId argument is malformed: \"{rewardId}\"')
+        elif twitchUser is None:
+            raise ValueError(f'twitchUser argument is malformed: \"{twitchUser}\"')
+
+        self.__redemptionMessage = redemptionMessage
+        self.__rewardId = rewardId
+        self.__twitchChannel = twitchChannel
+        self.__twitchUser = twitchUser
+        self.__userIdThatRedeemed = userIdThatRedeemed
+        self.__userNameThatRedeemed = userNameThatRedeemed
+
+    def getRedemptionMessage(self):
+        return self.__redemptionMessage
+
+    def getRewardId(self):
+        return self.__rewardId
+
+    def getTwitchChannel(self):
+        return self.__twitchChannel
+
+    def getTwitchUser(self):
+        return self.__twitchUser
+
+    def getUserIdThatRedeemed(self):
+        return self.__userIdThatRedeemed
+
+    def getUserNameThatRedeemed(self):
+        return self.__userNameThatRedeemed
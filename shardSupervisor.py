@@ -0,0 +1,116 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from channelShard import ChannelShard
+from timeZoneRepository import TimeZoneRepository
+from usersRepository import UsersRepository
+
+
+# Runs CynanBot as a number of worker processes, each of which joins only the channels that the
+# consistent hash ring assigns to it (see ChannelShard). Workers that exit are restarted, with a
+# growing delay if they keep crashing. Run from the repository root:
+#
+#   python shardSupervisor.py --shards 4
+
+class ShardSupervisor():
+
+    def __init__(
+        self,
+        shardCount: int,
+        maxRestartDelaySeconds: float = 60,
+        minRestartDelaySeconds: float = 1
+    ):
+        if shardCount is None or shardCount < 1:
+            raise ValueError(f'shardCount argument is malformed: \"{shardCount}\"')
+
+        self.__shardCount = shardCount
+        self.__maxRestartDelaySeconds = maxRestartDelaySeconds
+        self.__minRestartDelaySeconds = minRestartDelaySeconds
+        self.__isStopping = False
+        self.__processes = dict()
+        self.__restartDelays = dict()
+        self.__restartTimes = dict()
+        self.__startTimes = dict()
+
+    def printShardAssignments(self):
+        usersRepository = UsersRepository(timeZoneRepository=TimeZoneRepository())
+        users = usersRepository.getUsers()
+
+        for shardIndex in range(self.__shardCount):
+            channelShard = ChannelShard(shardIndex=shardIndex, shardCount=self.__shardCount)
+            handles = [ user.getHandle() for user in users if channelShard.isInShard(user.getHandle()) ]
+            print(f'{channelShard.toStr()}: {len(handles)} channel(s) ({", ".join(handles)})')
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.__stop)
+        signal.signal(signal.SIGTERM, self.__stop)
+
+        for shardIndex in range(self.__shardCount):
+            self.__startShard(shardIndex)
+
+        while not self.__isStopping:
+            time.sleep(1)
+
+            for shardIndex, process in list(self.__processes.items()):
+                if process is not None and process.poll() is not None:
+                    self.__scheduleRestart(shardIndex, process.returncode)
+
+            now = time.monotonic()
+
+            for shardIndex, restartTime in list(self.__restartTimes.items()):
+                if now >= restartTime:
+                    del self.__restartTimes[shardIndex]
+                    self.__startShard(shardIndex)
+
+        for process in self.__processes.values():
+            if process is not None:
+                process.wait()
+
+    def __scheduleRestart(self, shardIndex: int, returnCode: int):
+        self.__processes[shardIndex] = None
+
+        # a worker that stayed up for a while gets a fresh (short) restart delay
+        if time.monotonic() - self.__startTimes[shardIndex] > self.__maxRestartDelaySeconds:
+            restartDelay = self.__minRestartDelaySeconds
+        else:
+            restartDelay = min(self.__maxRestartDelaySeconds, self.__restartDelays.get(shardIndex, self.__minRestartDelaySeconds) * 2)
+
+        self.__restartDelays[shardIndex] = restartDelay
+        self.__restartTimes[shardIndex] = time.monotonic() + restartDelay
+        print(f'Shard {shardIndex} exited with code {returnCode}, restarting it in {restartDelay}s...')
+
+    def __startShard(self, shardIndex: int):
+        environment = dict(os.environ)
+        environment['CYNANBOT_SHARD_INDEX'] = str(shardIndex)
+        environment['CYNANBOT_SHARD_COUNT'] = str(self.__shardCount)
+
+        # every shard records its own traffic, rather than all of them appending to the one file
+        if 'CYNANBOT_TRAFFIC_FILE' in environment:
+            environment['CYNANBOT_TRAFFIC_FILE'] = f'{environment["CYNANBOT_TRAFFIC_FILE"]}.shard{shardIndex}'
+
+        process = subprocess.Popen([ sys.executable, 'initCynanBot.py' ], env=environment)
+        self.__processes[shardIndex] = process
+        self.__startTimes[shardIndex] = time.monotonic()
+        print(f'Started shard {shardIndex} (pid {process.pid})')
+
+    def __stop(self, signalNumber, frame):
+        print(f'Stopping {self.__shardCount} shard(s)...')
+        self.__isStopping = True
+
+        for process in self.__processes.values():
+            if process is not None and process.poll() is None:
+                process.terminate()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Runs CynanBot as multiple channel sharded processes')
+    parser.add_argument('--shards', type=int, default=os.cpu_count(), help='number of worker processes')
+    args = parser.parse_args()
+
+    shardSupervisor = ShardSupervisor(shardCount=args.shards)
+    shardSupervisor.printShardAssignments()
+    shardSupervisor.run()
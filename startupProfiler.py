@@ -0,0 +1,118 @@
+import builtins
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler():
+
+    def __init__(self, isEnabled: bool, minImportTimeDelta: float = 0.001):
+        if isEnabled is None:
+            raise ValueError(f'isEnabled argument is malformed: \"{isEnabled}\"')
+        elif minImportTimeDelta is None:
+            raise ValueError(f'minImportTimeDelta argument is malformed: \"{minImportTimeDelta}\"')
+
+        self.__isEnabled = isEnabled
+        self.__minImportSeconds = minImportTimeDelta
+        self.__startTime = time.perf_counter()
+        self.__importTimings = dict()
+        self.__timings = list()
+
+    def isEnabled(self):
+        return self.__isEnabled
+
+    @contextmanager
+    def measure(self, componentName: str):
+        if not self.__isEnabled:
+            yield
+            return
+
+        startTime = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.__timings.append((componentName, time.perf_counter() - startTime))
+
+    @contextmanager
+    def measureImports(self):
+        # Times every package that's first imported in here, each on its own. Like python's own
+        # -X importtime, a package's time excludes the other packages it imports in turn, so one
+        # that happens to be imported first doesn't take the blame for everything it pulls in.
+        # Modules are lumped in with the rest of their top level package (cynanBot on its own,
+        # all of requests together, and so on).
+        if not self.__isEnabled:
+            yield
+            return
+
+        originalImport = builtins.__import__
+        childSecondsStack = list()
+
+        def timedImport(name, globals=None, locals=None, fromlist=(), level=0):
+            moduleName = self.__resolveModuleName(name, globals, level)
+
+            if moduleName is None or moduleName in sys.modules:
+                return originalImport(name, globals, locals, fromlist, level)
+
+            childSecondsStack.append(0)
+            startTime = time.perf_counter()
+
+            try:
+                return originalImport(name, globals, locals, fromlist, level)
+            finally:
+                seconds = time.perf_counter() - startTime
+                childSeconds = childSecondsStack.pop()
+
+                if len(childSecondsStack) >= 1:
+                    childSecondsStack[-1] = childSecondsStack[-1] + seconds
+
+                packageName = moduleName.split('.')[0]
+                self.__importTimings[packageName] = self.__importTimings.get(packageName, 0) + seconds - childSeconds
+
+        builtins.__import__ = timedImport
+
+        try:
+            yield
+        finally:
+            builtins.__import__ = originalImport
+
+    def __resolveModuleName(self, name: str, globals, level: int):
+        if level == 0:
+            return name
+        elif globals is None or not globals.get('__package__'):
+            return None
+
+        try:
+            return importlib.util.resolve_name('.' * level + name, globals['__package__'])
+        except (ImportError, ValueError):
+            return None
+
+    def printReport(self):
+        if self.__isEnabled:
+            print(self.toStr())
+
+    def toStr(self):
+        totalSeconds = time.perf_counter() - self.__startTime
+        lines = [ f'Startup profile ({totalSeconds * 1000:.1f}ms total):' ]
+        timings = list(self.__timings)
+
+        # the many packages that take next to no time are lumped together, so they don't bury the rest
+        quickImportCount = 0
+        quickImportSeconds = 0
+
+        for packageName, seconds in self.__importTimings.items():
+            if seconds >= self.__minImportSeconds:
+                timings.append((f'import {packageName}', seconds))
+            else:
+                quickImportCount = quickImportCount + 1
+                quickImportSeconds = quickImportSeconds + seconds
+
+        if quickImportCount >= 1:
+            timings.append((f'import ({quickImportCount} other packages)', quickImportSeconds))
+
+        # slowest components first, as those are the ones worth looking at
+        for componentName, seconds in sorted(timings, key=lambda timing: timing[1], reverse=True):
+            lines.append(f'  {seconds * 1000:8.1f}ms  {componentName}')
+
+        return '\n'.join(lines)
@@ -1,3 +1,5 @@
+import time
+from datetime import datetime, tzinfo
 from typing import List
 
 import pytz
@@ -11,8 +13,34 @@ import CynanBotCommon.utils as utils
 class TimeZoneRepository():
 
     def __init__(self):
+        self.__localTimes = dict()
         self.__timeZones = dict()
 
+    def getCurrentMinute(self):
+        return int(time.time()) // 60
+
+    def getLocalTime(self, timeZone: tzinfo):
+        if timeZone is None:
+            raise ValueError(f'timeZone argument is malformed: \"{timeZone}\"')
+
+        currentMinute = self.getCurrentMinute()
+        localTime = self.__localTimes.get(timeZone)
+
+        if localTime is not None and localTime.getMinute() == currentMinute:
+            return localTime
+
+        now = datetime.now(timeZone)
+
+        localTime = LocalTime(
+            minute=currentMinute,
+            formattedTime=utils.formatTime(now),
+            formattedTimeShort=utils.formatTimeShort(now),
+            timeZoneName=now.tzname()
+        )
+
+        self.__localTimes[timeZone] = localTime
+        return localTime
+
     def getTimeZone(self, timeZone: str):
         if not utils.isValidStr(timeZone):
             return None
@@ -39,3 +67,37 @@ class TimeZoneRepository():
             return None
         else:
             return newTimeZones
+
+
+class LocalTime():
+
+    def __init__(
+        self,
+        minute: int,
+        formattedTime: str,
+        formattedTimeShort: str,
+        timeZoneName: str
+    ):
+        if not utils.isValidNum(minute):
+            raise ValueError(f'minute argument is malformed: \"{minute}\"')
+        elif not utils.isValidStr(formattedTime):
+            raise ValueError(f'formattedTime argument is malformed: \"{formattedTime}\"')
+        elif not utils.isValidStr(formattedTimeShort):
+            raise ValueError(f'formattedTimeShort argument is malformed: \"{formattedTimeShort}\"')
+
+        self.__minute = minute
+        self.__formattedTime = formattedTime
+        self.__formattedTimeShort = formattedTimeShort
+        self.__timeZoneName = timeZoneName
+
+    def getFormattedTime(self):
+        return self.__formattedTime
+
+    def getFormattedTimeShort(self):
+        return self.__formattedTimeShort
+
+    def getMinute(self):
+        return self.__minute
+
+    def getTimeZoneName(self):
+        return self.__timeZoneName
@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+from typing import Dict
+
+import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
+
+
+class TrafficRecorder():
+
+    def __init__(self, trafficFile: str):
+        if not utils.isValidStr(trafficFile):
+            raise ValueError(f'trafficFile argument is malformed: \"{trafficFile}\"')
+
+        self.__trafficFile = trafficFile
+        self.__lock = threading.Lock()
+
+        # line buffered, so that every record hits the file as a whole line even if we crash
+        self.__file = open(trafficFile, 'a', buffering=1, encoding='utf-8')
+        print(f'Recording chat and pub sub traffic to \"{trafficFile}\"')
+
+    def close(self):
+        with self.__lock:
+            self.__file.close()
+
+    def __isSecretKey(self, key: str):
+        key = key.lower()
+        return key == 'nonce' or 'token' in key or 'secret' in key or 'password' in key
+
+    def recordChannel(self, handle: str, userId: str, rewardIds: Dict[str, str] = None):
+        if not utils.isValidStr(handle):
+            raise ValueError(f'handle argument is malformed: \"{handle}\"')
+        elif not utils.isValidStr(userId):
+            raise ValueError(f'userId argument is malformed: \"{userId}\"')
+
+        record = { 'k': 'c', 'c': ChannelKey(handle), 'i': userId }
+
+        # a replay needs these, otherwise none of the recorded redemptions would match a reward
+        if utils.hasItems(rewardIds):
+            record['r'] = rewardIds
+
+        self.__write(record)
+
+    def recordMessage(self, message):
+        if message is None:
+            raise ValueError(f'message argument is malformed: \"{message}\"')
+
+        self.__write({
+            'k': 'm',
+            'c': message.channel.name,
+            'a': message.author.name,
+            'i': str(message.author.id),
+            'o': 1 if message.author.is_mod else 0,
+            'x': message.content
+        })
+
+    def recordPubSub(self, data: dict):
+        if data is None:
+            raise ValueError(f'data argument is malformed: \"{data}\"')
+
+        self.__write({ 'k': 'p', 'd': self.__scrub(data) })
+
+    def __scrub(self, value):
+        if isinstance(value, dict):
+            scrubbed = dict()
+
+            for key, childValue in value.items():
+                if self.__isSecretKey(key):
+                    scrubbed[key] = '<scrubbed>'
+                elif key == 'message' and isinstance(childValue, str):
+                    # pub sub nests the interesting payload as a JSON string, so scrub that too
+                    try:
+                        scrubbed[key] = json.dumps(self.__scrub(json.loads(childValue)), separators=(',', ':'))
+                    except ValueError:
+                        scrubbed[key] = childValue
+                else:
+                    scrubbed[key] = self.__scrub(childValue)
+
+            return scrubbed
+        elif isinstance(value, list):
+            return [ self.__scrub(childValue) for childValue in value ]
+        else:
+            return value
+
+    def __write(self, record: dict):
+        record['t'] = round(time.time(), 3)
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+        with self.__lock:
+            self.__file.write(f'{line}\n')
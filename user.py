@@ -4,13 +4,46 @@ from datetime import tzinfo
 from typing import List
 
 import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
 
 
 class User:
 
+    # Users are snapshots of the users file, built by UsersRepository each time the file is loaded
+    # and then shared by everything until the next load, so they can't be changed once created.
+    __slots__ = (
+        '__isAnalogueEnabled',
+        '__isAnalogueStockNotificationsEnabled',
+        '__isCatJamEnabled',
+        '__isCutenessEnabled',
+        '__isGiveCutenessEnabled',
+        '__isJishoEnabled',
+        '__isJokesEnabled',
+        '__isPicOfTheDayEnabled',
+        '__isPkmnEnabled',
+        '__isRatJamEnabled',
+        '__isWordOfTheDayEnabled',
+        '__discord',
+        '__handle',
+        '__increaseCutenessDoubleRewardId',
+        '__increaseCutenessRewardId',
+        '__locationId',
+        '__picOfTheDayFile',
+        '__picOfTheDayRewardId',
+        '__pkmnBattleRewardId',
+        '__pkmnCatchRewardId',
+        '__pkmnEvolveRewardId',
+        '__pkmnShinyRewardId',
+        '__speedrunProfile',
+        '__twitter',
+        '__timeZones',
+        '__channelKey'
+    )
+
     def __init__(
         self,
         isAnalogueEnabled: bool,
+        isAnalogueStockNotificationsEnabled: bool,
         isCatJamEnabled: bool,
         isCutenessEnabled: bool,
         isGiveCutenessEnabled: bool,
@@ -35,12 +68,12 @@ class User:
         twitter: str,
         timeZones: List[tzinfo]
     ):
+        # everything else is validated by USER_SCHEMA as the users file is loaded
         if not utils.isValidStr(handle):
             raise ValueError(f'handle argument is malformed: \"{handle}\"')
-        elif isPicOfTheDayEnabled and not utils.isValidStr(picOfTheDayFile):
-            raise ValueError(f'picOfTheDayFile argument is malformed: \"{picOfTheDayFile}\"')
 
         self.__isAnalogueEnabled = isAnalogueEnabled
+        self.__isAnalogueStockNotificationsEnabled = isAnalogueStockNotificationsEnabled
         self.__isCatJamEnabled = isCatJamEnabled
         self.__isCutenessEnabled = isCutenessEnabled
         self.__isGiveCutenessEnabled = isGiveCutenessEnabled
@@ -63,7 +96,13 @@ class User:
         self.__pkmnShinyRewardId = pkmnShinyRewardId
         self.__speedrunProfile = speedrunProfile
         self.__twitter = twitter
-        self.__timeZones = timeZones
+        self.__timeZones = None if timeZones is None else tuple(timeZones)
+
+        # this has to be set last, as it's what marks the User as finished
+        self.__channelKey = ChannelKey(handle)
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f'User {self.__handle} can\'t be changed')
 
     def fetchPicOfTheDay(self):
         if not self.__isPicOfTheDayEnabled:
@@ -80,6 +119,9 @@ class User:
         potdParsed = urllib.parse.urlparse(potdText)
         return potdParsed.geturl()
 
+    def getChannelKey(self):
+        return self.__channelKey
+
     def getDiscord(self):
         return self.__discord
 
@@ -110,6 +152,20 @@ class User:
     def getPkmnShinyRewardId(self):
         return self.__pkmnShinyRewardId
 
+    def getRewardIds(self):
+        # every channel point reward ID this channel has, keyed by its setting in the users file
+        rewardIds = {
+            'increaseCutenessDoubleRewardId': self.__increaseCutenessDoubleRewardId,
+            'increaseCutenessRewardId': self.__increaseCutenessRewardId,
+            'picOfTheDayRewardId': self.__picOfTheDayRewardId,
+            'pkmnBattleRewardId': self.__pkmnBattleRewardId,
+            'pkmnCatchRewardId': self.__pkmnCatchRewardId,
+            'pkmnEvolveRewardId': self.__pkmnEvolveRewardId,
+            'pkmnShinyRewardId': self.__pkmnShinyRewardId
+        }
+
+        return { key: rewardId for key, rewardId in rewardIds.items() if utils.isValidStr(rewardId) }
+
     def getSpeedrunProfile(self):
         return self.__speedrunProfile
 
@@ -119,6 +175,12 @@ class User:
     def getTwitter(self):
         return self.__twitter
 
+    def __setattr__(self, name: str, value):
+        if hasattr(self, '_User__channelKey'):
+            raise AttributeError(f'User {self.__handle} can\'t be changed')
+
+        super().__setattr__(name, value)
+
     def hasDiscord(self):
         return utils.isValidStr(self.__discord)
 
@@ -137,6 +199,9 @@ class User:
     def isAnalogueEnabled(self):
         return self.__isAnalogueEnabled
 
+    def isAnalogueStockNotificationsEnabled(self):
+        return self.__isAnalogueStockNotificationsEnabled
+
     def isCatJamEnabled(self):
         return self.__isCatJamEnabled
 
@@ -8,22 +8,37 @@ from backingDatabase import BackingDatabase
 
 class UserIdsRepository():
 
-    def __init__(self, backingDatabase: BackingDatabase):
+    def __init__(
+        self,
+        backingDatabase: BackingDatabase,
+        helixUsersUrl: str = 'https://api.twitch.tv/helix/users'
+    ):
         if backingDatabase is None:
             raise ValueError(f'backingDatabase argument is malformed: \"{backingDatabase}\"')
+        elif not utils.isValidUrl(helixUsersUrl):
+            raise ValueError(f'helixUsersUrl argument is malformed: \"{helixUsersUrl}\"')
 
         self.__backingDatabase = backingDatabase
+        self.__helixUsersUrl = helixUsersUrl
 
-        connection = backingDatabase.getConnection()
-        connection.execute(
-            '''
-                CREATE TABLE IF NOT EXISTS userIds (
-                    userId TEXT NOT NULL PRIMARY KEY COLLATE NOCASE,
-                    userName TEXT NOT NULL COLLATE NOCASE
-                )
+        backingDatabase.registerStatement(
+            name='userIds.fetchUserId',
+            sql='SELECT userId FROM userIds WHERE userName = ?'
+        )
+        backingDatabase.registerStatement(
+            name='userIds.fetchUserName',
+            sql='SELECT userName FROM userIds WHERE userId = ?'
+        )
+        # the WHERE skips the write entirely when nothing has changed, which is almost always
+        backingDatabase.registerStatement(
+            name='userIds.setUser',
+            sql='''
+                INSERT INTO userIds (userId, userName)
+                VALUES (?, ?)
+                ON CONFLICT(userId) DO UPDATE SET userName = excluded.userName
+                WHERE userName != excluded.userName COLLATE BINARY
             '''
         )
-        connection.commit()
 
     def fetchUserId(
         self,
@@ -34,16 +49,12 @@ class UserIdsRepository():
         if not utils.isValidStr(userName):
             raise ValueError(f'userName argument is malformed: \"{userName}\"')
 
-        cursor = self.__backingDatabase.getConnection().cursor()
-        cursor.execute('SELECT userId FROM userIds WHERE userName = ?', (userName, ))
-        row = cursor.fetchone()
+        row = self.__backingDatabase.fetchOne('userIds.fetchUserId', (userName, ))
 
         userId = None
         if row is not None:
             userId = row[0]
 
-        cursor.close()
-
         if userId is not None:
             if utils.isValidStr(userId):
                 return userId
@@ -65,7 +76,7 @@ class UserIdsRepository():
         }
 
         rawResponse = requests.get(
-            url=f'https://api.twitch.tv/helix/users?login={userName}',
+            url=f'{self.__helixUsersUrl}?login={userName}',
             headers=headers,
             timeout=utils.getDefaultTimeout()
         )
@@ -88,9 +99,7 @@ class UserIdsRepository():
         if not utils.isValidStr(userId) or userId == '0':
             raise ValueError(f'userId argument is malformed: \"{userId}\"')
 
-        cursor = self.__backingDatabase.getConnection().cursor()
-        cursor.execute('SELECT userName FROM userIds WHERE userId = ?', (userId, ))
-        row = cursor.fetchone()
+        row = self.__backingDatabase.fetchOne('userIds.fetchUserName', (userId, ))
 
         if row is None:
             raise RuntimeError(f'No userName for userId \"{userId}\" found')
@@ -99,7 +108,6 @@ class UserIdsRepository():
         if not utils.isValidStr(userName):
             raise RuntimeError(f'userName for userId \"{userId}\" is malformed: \"{userName}\"')
 
-        cursor.close()
         return userName
 
     def setUser(self, userId: str, userName: str):
@@ -108,15 +116,5 @@ class UserIdsRepository():
         elif not utils.isValidStr(userName):
             raise ValueError(f'userName argument is malformed: \"{userName}\"')
 
-        connection = self.__backingDatabase.getConnection()
-        cursor = connection.cursor()
-        cursor.execute(
-            '''
-                INSERT INTO userIds (userId, userName)
-                VALUES (?, ?)
-                ON CONFLICT(userId) DO UPDATE SET userName = excluded.userName
-            ''',
-            (userId, userName)
-        )
-        connection.commit()
-        cursor.close()
+        self.__backingDatabase.execute('userIds.setUser', (userId, userName))
+        self.__backingDatabase.commit()
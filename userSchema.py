@@ -0,0 +1,114 @@
+from typing import List
+
+import CynanBotCommon.utils as utils
+
+
+class UserField():
+
+    def __init__(
+        self,
+        jsonKey: str,
+        fieldType: type,
+        argumentName: str = None,
+        enabledBy: str = None,
+        isRequired: bool = False
+    ):
+        if not utils.isValidStr(jsonKey):
+            raise ValueError(f'jsonKey argument is malformed: \"{jsonKey}\"')
+        elif fieldType not in (bool, list, str):
+            raise ValueError(f'fieldType argument is malformed: \"{fieldType}\"')
+
+        self.__jsonKey = jsonKey
+        self.__fieldType = fieldType
+        self.__argumentName = argumentName
+        self.__enabledBy = enabledBy
+        self.__isRequired = isRequired
+
+    def getArgumentName(self):
+        return self.__argumentName
+
+    def getDefaultValue(self):
+        if self.__fieldType is bool:
+            return False
+        else:
+            return None
+
+    def getEnabledBy(self):
+        return self.__enabledBy
+
+    def getJsonKey(self):
+        return self.__jsonKey
+
+    def hasArgumentName(self):
+        return utils.isValidStr(self.__argumentName)
+
+    def validate(self, value, isEnabled: bool, errors: List[str]):
+        # returns the value to use, anything wrong with it is added to errors rather than raised,
+        # so that every problem with the users file can be reported at once
+        if not isEnabled:
+            return self.getDefaultValue()
+        elif value is None:
+            if self.__isRequired:
+                errors.append(f'\"{self.__jsonKey}\" is required when \"{self.__enabledBy}\" is enabled')
+
+            return self.getDefaultValue()
+        elif self.__fieldType is bool and not isinstance(value, bool):
+            errors.append(f'\"{self.__jsonKey}\" must be true or false: \"{value}\"')
+        elif self.__fieldType is str and not utils.isValidStr(value):
+            errors.append(f'\"{self.__jsonKey}\" must be a non-empty string: \"{value}\"')
+        elif self.__fieldType is list and (not isinstance(value, list) or not all(utils.isValidStr(item) for item in value)):
+            errors.append(f'\"{self.__jsonKey}\" must be a list of non-empty strings: \"{value}\"')
+        else:
+            return value
+
+        return self.getDefaultValue()
+
+
+# Every setting that a channel can have in the users file. Settings with an enabledBy are ignored
+# unless that setting is turned on, and settings without an argumentName are handled by
+# UsersRepository itself. Settings that aren't in here are ignored, as they always have been.
+USER_SCHEMA = [
+    UserField('analogueEnabled', bool, 'isAnalogueEnabled'),
+    UserField('analogueStockNotificationsEnabled', bool, 'isAnalogueStockNotificationsEnabled', enabledBy='analogueEnabled'),
+    UserField('catJamEnabled', bool, 'isCatJamEnabled'),
+    UserField('cutenessEnabled', bool, 'isCutenessEnabled'),
+    UserField('giveCutenessEnabled', bool, 'isGiveCutenessEnabled'),
+    UserField('jishoEnabled', bool, 'isJishoEnabled'),
+    UserField('jokesEnabled', bool, 'isJokesEnabled'),
+    UserField('picOfTheDayEnabled', bool, 'isPicOfTheDayEnabled'),
+    UserField('pkmnEnabled', bool, 'isPkmnEnabled'),
+    UserField('ratJamEnabled', bool, 'isRatJamEnabled'),
+    UserField('wordOfTheDayEnabled', bool, 'isWordOfTheDayEnabled'),
+    UserField('discord', str, 'discord'),
+    UserField('increaseCutenessDoubleRewardId', str, 'increaseCutenessDoubleRewardId', enabledBy='cutenessEnabled'),
+    UserField('increaseCutenessRewardId', str, 'increaseCutenessRewardId', enabledBy='cutenessEnabled'),
+    UserField('locationId', str, 'locationId'),
+    UserField('picOfTheDayFile', str, 'picOfTheDayFile', enabledBy='picOfTheDayEnabled', isRequired=True),
+    UserField('picOfTheDayRewardId', str, 'picOfTheDayRewardId', enabledBy='picOfTheDayEnabled'),
+    UserField('pkmnBattleRewardId', str, 'pkmnBattleRewardId', enabledBy='pkmnEnabled'),
+    UserField('pkmnCatchRewardId', str, 'pkmnCatchRewardId', enabledBy='pkmnEnabled'),
+    UserField('pkmnEvolveRewardId', str, 'pkmnEvolveRewardId', enabledBy='pkmnEnabled'),
+    UserField('pkmnShinyRewardId', str, 'pkmnShinyRewardId', enabledBy='pkmnEnabled'),
+    UserField('speedrunProfile', str, 'speedrunProfile'),
+    UserField('twitter', str, 'twitter'),
+    UserField('timeZone', str),
+    UserField('timeZones', list)
+]
+
+
+def validateUserJson(userJson, schema: List[UserField] = USER_SCHEMA):
+    # returns the validated values (keyed by JSON key) and a list of everything wrong with them
+    errors = list()
+
+    if not isinstance(userJson, dict):
+        errors.append(f'must be a JSON object: \"{userJson}\"')
+        userJson = dict()
+
+    values = dict()
+
+    # fields are in an order where anything that enables another field comes first
+    for field in schema:
+        isEnabled = field.getEnabledBy() is None or values.get(field.getEnabledBy()) is True
+        values[field.getJsonKey()] = field.validate(userJson.get(field.getJsonKey()), isEnabled, errors)
+
+    return values, errors
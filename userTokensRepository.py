@@ -2,6 +2,7 @@ import json
 import os
 
 import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
 
 
 class UserTokensRepository():
@@ -60,10 +61,11 @@ class UserTokensRepository():
         if not utils.isValidStr(handle):
             raise ValueError(f'handle argument is malformed: \"{handle}\"')
 
+        channelKey = ChannelKey(handle)
         jsonContents = self.__readJson()
 
         for key in jsonContents:
-            if handle.lower() == key.lower():
+            if ChannelKey(key) == channelKey:
                 return jsonContents[key]
 
         return None
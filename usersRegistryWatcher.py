@@ -0,0 +1,108 @@
+import asyncio
+from datetime import timedelta
+from typing import Callable, List
+
+import CynanBotCommon.utils as utils
+from usersRepository import UsersRepository
+
+
+class UsersRegistryWatcher():
+
+    def __init__(
+        self,
+        usersRepository: UsersRepository,
+        pollTimeDelta: timedelta = timedelta(seconds=10)
+    ):
+        if usersRepository is None:
+            raise ValueError(f'usersRepository argument is malformed: \"{usersRepository}\"')
+        elif pollTimeDelta is None:
+            raise ValueError(f'pollTimeDelta argument is malformed: \"{pollTimeDelta}\"')
+
+        self.__usersRepository = usersRepository
+        self.__pollTimeDelta = pollTimeDelta
+        self.__listeners = list()
+        self.__reloadedListeners = list()
+        self.__handles = None
+        self.__task = None
+
+    def addUsersChangedListener(self, listener: Callable):
+        if listener is None:
+            raise ValueError(f'listener argument is malformed: \"{listener}\"')
+
+        self.__listeners.append(listener)
+
+    def addUsersReloadedListener(self, listener: Callable):
+        if listener is None:
+            raise ValueError(f'listener argument is malformed: \"{listener}\"')
+
+        self.__reloadedListeners.append(listener)
+
+    def __createHandles(self, users: List):
+        return { user.getChannelKey(): user for user in users }
+
+    async def __poll(self):
+        # a half written or otherwise broken file is reported once, and then left alone until
+        # it's saved again, the bot just carries on with the channels (and settings) it already has
+        try:
+            isReloaded = self.__usersRepository.reloadIfChanged()
+        except (OSError, RuntimeError, ValueError) as e:
+            print(f'Error reloading users file, keeping the current channels: {e}')
+            return
+
+        if isReloaded:
+            for listener in self.__reloadedListeners:
+                try:
+                    await listener()
+                except Exception as e:
+                    print(f'Error applying the reloaded users file: {e}')
+
+        # this is compared against the channels that were actually joined (or left), rather than
+        # against the previous version of the file, so that any channel whose change failed last
+        # time is tried again here, even if the file hasn't changed since
+        newHandles = self.__createHandles(self.__usersRepository.getUsers())
+
+        addedUsers = [ user for handle, user in newHandles.items() if handle not in self.__handles ]
+        removedUsers = [ user for handle, user in self.__handles.items() if handle not in newHandles ]
+
+        if not utils.hasItems(addedUsers) and not utils.hasItems(removedUsers):
+            return
+
+        print(f'Users file changed, {len(addedUsers)} channel(s) added and {len(removedUsers)} channel(s) removed ({utils.getNowTimeText()})')
+
+        # one channel at a time, so that one that fails doesn't hold back (or repeat) the others
+        for user in removedUsers:
+            if await self.__notifyListeners(addedUsers=list(), removedUsers=[ user ]):
+                del self.__handles[user.getChannelKey()]
+
+        for user in addedUsers:
+            if await self.__notifyListeners(addedUsers=[ user ], removedUsers=list()):
+                self.__handles[user.getChannelKey()] = user
+
+    async def __notifyListeners(self, addedUsers: List, removedUsers: List):
+        try:
+            for listener in self.__listeners:
+                await listener(addedUsers, removedUsers)
+        except Exception as e:
+            handles = ', '.join(user.getHandle() for user in addedUsers + removedUsers)
+            print(f'Error applying users file changes for {handles}, will try again shortly: {e}')
+            return False
+
+        return True
+
+    async def __run(self):
+        while True:
+            await asyncio.sleep(self.__pollTimeDelta.total_seconds())
+
+            try:
+                await self.__poll()
+            except Exception as e:
+                print(f'Error applying users file changes: {e}')
+
+    def start(self):
+        if self.__task is not None:
+            return
+
+        # the channels that the bot started out with are the baseline for every later change
+        self.__handles = self.__createHandles(self.__usersRepository.getUsers())
+
+        self.__task = asyncio.get_event_loop().create_task(self.__run())
@@ -1,9 +1,13 @@
 import json
 import os
+from typing import List
 
 import CynanBotCommon.utils as utils
+from channelKey import ChannelKey
+from channelShard import ChannelShard
 from timeZoneRepository import TimeZoneRepository
 from user import User
+from userSchema import USER_SCHEMA, validateUserJson
 
 
 class UsersRepository():
@@ -11,6 +15,7 @@ class UsersRepository():
     def __init__(
         self,
         timeZoneRepository: TimeZoneRepository,
+        channelShard: ChannelShard = None,
         usersFile: str = 'usersRepository.json'
     ):
         if timeZoneRepository is None:
@@ -19,118 +24,131 @@ class UsersRepository():
             raise ValueError(f'usersFile argument is malformed: \"{usersFile}\"')
 
         self.__timeZoneRepository = timeZoneRepository
+        self.__channelShard = channelShard
         self.__usersFile = usersFile
+        self.__modifiedTime = None
+        self.__registry = None
 
-    def __createUser(self, handle: str, userJson: dict):
-        if not utils.isValidStr(handle):
-            raise ValueError(f'handle argument is malformed: \"{handle}\"')
-        elif userJson is None:
-            raise ValueError(f'userJson argument is malformed: \"{userJson}\"')
-        elif len(userJson) == 0:
-            raise ValueError(f'userJson argument is empty: \"{userJson}\"')
-
-        isAnalogueEnabled = userJson.get('analogueEnabled', False)
-        isCatJamEnabled = userJson.get('catJamEnabled', False)
-        isCutenessEnabled = userJson.get('cutenessEnabled', False)
-        isGiveCutenessEnabled = userJson.get('giveCutenessEnabled', False)
-        isJishoEnabled = userJson.get('jishoEnabled', False)
-        isJokesEnabled = userJson.get('jokesEnabled', False)
-        isPicOfTheDayEnabled = userJson.get('picOfTheDayEnabled', False)
-        isPkmnEnabled = userJson.get('pkmnEnabled', False)
-        isRatJamEnabled = userJson.get('ratJamEnabled', False)
-        isWordOfTheDayEnabled = userJson.get('wordOfTheDayEnabled', False)
-        discord = userJson.get('discord')
-        locationId = userJson.get('locationId')
-        speedrunProfile = userJson.get('speedrunProfile')
-        twitter = userJson.get('twitter')
+    def __createUser(self, handle: str, userJson: dict, errors: List[str]):
+        values, userErrors = validateUserJson(userJson)
+
+        arguments = { field.getArgumentName(): values[field.getJsonKey()] for field in USER_SCHEMA if field.hasArgumentName() }
 
         timeZones = None
-        if 'timeZones' in userJson:
-            timeZones = self.__timeZoneRepository.getTimeZones(userJson['timeZones'])
-        elif 'timeZone' in userJson:
-            timeZones = list()
-            timeZones.append(self.__timeZoneRepository.getTimeZone(userJson['timeZone']))
-
-        increaseCutenessDoubleRewardId = None
-        increaseCutenessRewardId = None
-        if isCutenessEnabled:
-            increaseCutenessDoubleRewardId = userJson.get('increaseCutenessDoubleRewardId')
-            increaseCutenessRewardId = userJson.get('increaseCutenessRewardId')
-
-        picOfTheDayFile = None
-        picOfTheDayRewardId = None
-        if isPicOfTheDayEnabled:
-            picOfTheDayFile = userJson.get('picOfTheDayFile')
-            picOfTheDayRewardId = userJson.get('picOfTheDayRewardId')
-
-            if not utils.isValidStr(picOfTheDayFile):
-                raise ValueError(f'POTD is enabled for {handle} but picOfTheDayFile is malformed: \"{picOfTheDayFile}\"')
-
-        pkmnBattleRewardId = None
-        pkmnCatchRewardId = None
-        pkmnEvolveRewardId = None
-        pkmnShinyRewardId = None
-        if isPkmnEnabled:
-            pkmnBattleRewardId = userJson.get('pkmnBattleRewardId')
-            pkmnCatchRewardId = userJson.get('pkmnCatchRewardId')
-            pkmnEvolveRewardId = userJson.get('pkmnEvolveRewardId')
-            pkmnShinyRewardId = userJson.get('pkmnShinyRewardId')
+        try:
+            if values['timeZones'] is not None:
+                timeZones = self.__timeZoneRepository.getTimeZones(values['timeZones'])
+            elif values['timeZone'] is not None:
+                timeZones = [ self.__timeZoneRepository.getTimeZone(values['timeZone']) ]
+        except (KeyError, ValueError) as e:
+            userErrors.append(f'unknown time zone: {e}')
+
+        if utils.hasItems(userErrors):
+            errors.extend(f'{handle}: {error}' for error in userErrors)
+            return None
 
         return User(
-            isAnalogueEnabled=isAnalogueEnabled,
-            isCatJamEnabled=isCatJamEnabled,
-            isCutenessEnabled=isCutenessEnabled,
-            isGiveCutenessEnabled=isGiveCutenessEnabled,
-            isJishoEnabled=isJishoEnabled,
-            isJokesEnabled=isJokesEnabled,
-            isPicOfTheDayEnabled=isPicOfTheDayEnabled,
-            isPkmnEnabled=isPkmnEnabled,
-            isRatJamEnabled=isRatJamEnabled,
-            isWordOfTheDayEnabled=isWordOfTheDayEnabled,
-            discord=discord,
             handle=handle,
-            increaseCutenessDoubleRewardId=increaseCutenessDoubleRewardId,
-            increaseCutenessRewardId=increaseCutenessRewardId,
-            locationId=locationId,
-            picOfTheDayFile=picOfTheDayFile,
-            picOfTheDayRewardId=picOfTheDayRewardId,
-            pkmnBattleRewardId=pkmnBattleRewardId,
-            pkmnCatchRewardId=pkmnCatchRewardId,
-            pkmnEvolveRewardId=pkmnEvolveRewardId,
-            pkmnShinyRewardId=pkmnShinyRewardId,
-            speedrunProfile=speedrunProfile,
-            twitter=twitter,
-            timeZones=timeZones
+            timeZones=timeZones,
+            **arguments
         )
 
     def getUser(self, handle: str):
         if not utils.isValidStr(handle):
             raise ValueError(f'handle argument is malformed: \"{handle}\"')
 
-        users = self.getUsers()
+        user = self.__getRegistry().getUser(ChannelKey(handle))
 
-        for user in users:
-            if handle.lower() == user.getHandle().lower():
-                return user
+        if user is None:
+            raise RuntimeError(f'Unable to find user with handle \"{handle}\" in users file: \"{self.__usersFile}\"')
 
-        raise RuntimeError(f'Unable to find user with handle \"{handle}\" in users file: \"{self.__usersFile}\"')
+        return user
 
-    def getUsers(self):
+    def __getModifiedTime(self):
         if not os.path.exists(self.__usersFile):
             raise FileNotFoundError(f'Users file not found: \"{self.__usersFile}\"')
 
+        stat = os.stat(self.__usersFile)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def __getRegistry(self):
+        registry = self.__registry
+
+        if registry is None:
+            self.reloadIfChanged()
+            registry = self.__registry
+
+        return registry
+
+    def getUsers(self):
+        return self.__getRegistry().getUsers()
+
+    def getUsersFile(self):
+        return self.__usersFile
+
+    def __loadRegistry(self):
         with open(self.__usersFile, 'r') as file:
             jsonContents = json.load(file)
 
         if jsonContents is None:
             raise IOError(f'Error reading from users file: \"{self.__usersFile}\"')
 
-        users = []
-        for handle in jsonContents:
-            userJson = jsonContents[handle]
-            users.append(self.__createUser(handle, userJson))
-
-        if len(users) == 0:
+        if len(jsonContents) == 0:
             raise RuntimeError(f'Unable to read in any users from users file: \"{self.__usersFile}\"')
 
-        return users
+        errors = list()
+        handles = dict()
+        users = list()
+
+        for handle, userJson in jsonContents.items():
+            # when sharded, this process only knows about the channels assigned to its own shard
+            if self.__channelShard is not None and not self.__channelShard.isInShard(handle):
+                continue
+
+            channelKey = ChannelKey(handle)
+
+            if channelKey in handles:
+                errors.append(f'{handle}: is also in the users file as \"{handles[channelKey]}\"')
+                continue
+
+            handles[channelKey] = handle
+            user = self.__createUser(handle, userJson, errors)
+
+            if user is not None:
+                users.append(user)
+
+        if utils.hasItems(errors):
+            raise ValueError(f'Users file \"{self.__usersFile}\" has {len(errors)} error(s):\n' + '\n'.join(errors))
+
+        return UsersRegistry(users)
+
+    def reloadIfChanged(self):
+        # Loads the users file if it has changed since it was last loaded, and returns whether it
+        # was. The whole file is validated before anything is swapped in, so everything else only
+        # ever sees either the old users or the new ones, and never a file with mistakes in it.
+        modifiedTime = self.__getModifiedTime()
+
+        if self.__registry is not None and modifiedTime == self.__modifiedTime:
+            return False
+
+        # recorded before loading, so that a broken file is only reported once
+        self.__modifiedTime = modifiedTime
+        self.__registry = self.__loadRegistry()
+
+        return True
+
+
+class UsersRegistry():
+
+    def __init__(self, users: List[User]):
+        if users is None:
+            raise ValueError(f'users argument is malformed: \"{users}\"')
+
+        self.__users = tuple(users)
+        self.__usersByChannelKey = { user.getChannelKey(): user for user in users }
+
+    def getUser(self, channelKey: ChannelKey):
+        return self.__usersByChannelKey.get(channelKey)
+
+    def getUsers(self):
+        return self.__users
@@ -12,16 +12,41 @@ from CynanBotCommon.timedDict import TimedDict
 from locationsRepository import Location
 
 
+# This table is built from the Weather Condition Codes listed here:
+# https://openweathermap.org/weather-conditions#Weather-Condition-Codes-2
+# It's keyed on the integer codes that Open Weather sends, so no string conversion is needed.
+CONDITION_ICONS = {
+    200: '⛈️', 201: '⛈️', 202: '⛈️',
+    210: '🌩️', 211: '🌩️', 212: '🌩️',
+    221: '⛈️', 230: '⛈️', 231: '⛈️', 232: '⛈️',
+    300: '☔', 301: '☔', 310: '☔', 311: '☔', 313: '☔', 500: '☔',
+    501: '🌧️', 502: '🌧️', 503: '🌧️', 504: '🌧️', 520: '🌧️', 521: '🌧️', 522: '🌧️', 531: '🌧️',
+    600: '❄️', 601: '❄️',
+    602: '🌨️',
+    711: '🌫️', 721: '🌫️', 731: '🌫️', 741: '🌫️',
+    762: '🌋',
+    771: '🌬',
+    781: '🌪️',
+    801: '☁️', 802: '☁️', 803: '☁️', 804: '☁️'
+}
+
+
 class WeatherRepository():
 
     def __init__(
         self,
         oneWeatherApiKey: str,
         iqAirApiKey: str = None,
+        iqAirApiUrl: str = 'https://api.airvisual.com/v2/nearest_city',
+        oneWeatherApiUrl: str = 'https://api.openweathermap.org/data/2.5/onecall',
         cacheTimeDelta: timedelta = timedelta(hours=1, minutes=30)
     ):
         if not utils.isValidStr(oneWeatherApiKey):
             raise ValueError(f'oneWeatherApiKey argument is malformed: \"{oneWeatherApiKey}\"')
+        elif not utils.isValidUrl(iqAirApiUrl):
+            raise ValueError(f'iqAirApiUrl argument is malformed: \"{iqAirApiUrl}\"')
+        elif not utils.isValidUrl(oneWeatherApiUrl):
+            raise ValueError(f'oneWeatherApiUrl argument is malformed: \"{oneWeatherApiUrl}\"')
         elif cacheTimeDelta is None:
             raise ValueError(f'cacheTimeDelta argument is malformed: \"{cacheTimeDelta}\"')
 
@@ -29,9 +54,10 @@ class WeatherRepository():
             print(f'IQAir API key is malformed: \"{iqAirApiKey}\". This won\'t prevent us from fetching weather, but it will prevent us from fetching the current air quality conditions at the given location.')
 
         self.__iqAirApiKey = iqAirApiKey
+        self.__iqAirApiUrl = iqAirApiUrl
         self.__oneWeatherApiKey = oneWeatherApiKey
+        self.__oneWeatherApiUrl = oneWeatherApiUrl
         self.__cache = TimedDict(timeDelta=cacheTimeDelta)
-        self.__conditionIcons = self.__createConditionIconsDict()
 
     def __chooseTomorrowFromForecast(self, jsonResponse: dict):
         currentSunrise = jsonResponse['current']['sunrise']
@@ -43,52 +69,6 @@ class WeatherRepository():
 
         raise RuntimeError(f'Unable to find viable tomorrow data in JSON response: \"{jsonResponse}\"')
 
-    def __createConditionIconsDict(self):
-        # This dictionary is built from the Weather Condition Codes listed here:
-        # https://openweathermap.org/weather-conditions#Weather-Condition-Codes-2
-
-        icons = dict()
-        icons['200'] = '⛈️'
-        icons['201'] = icons['200']
-        icons['202'] = icons['200']
-        icons['210'] = '🌩️'
-        icons['211'] = icons['210']
-        icons['212'] = icons['211']
-        icons['221'] = icons['200']
-        icons['230'] = icons['200']
-        icons['231'] = icons['200']
-        icons['232'] = icons['200']
-        icons['300'] = '☔'
-        icons['301'] = icons['300']
-        icons['310'] = icons['300']
-        icons['311'] = icons['300']
-        icons['313'] = icons['300']
-        icons['500'] = icons['300']
-        icons['501'] = '🌧️'
-        icons['502'] = icons['501']
-        icons['503'] = icons['501']
-        icons['504'] = icons['501']
-        icons['520'] = icons['501']
-        icons['521'] = icons['501']
-        icons['522'] = icons['501']
-        icons['531'] = icons['501']
-        icons['600'] = '❄️'
-        icons['601'] = icons['600']
-        icons['602'] = '🌨️'
-        icons['711'] = '🌫️'
-        icons['721'] = icons['711']
-        icons['731'] = icons['711']
-        icons['741'] = icons['711']
-        icons['762'] = '🌋'
-        icons['771'] = '🌬'
-        icons['781'] = '🌪️'
-        icons['801'] = '☁️'
-        icons['802'] = icons['801']
-        icons['803'] = icons['801']
-        icons['804'] = icons['801']
-
-        return icons
-
     def __fetchAirQuality(self, location: Location):
         if location is None:
             raise ValueError(f'location argument is malformed: \"{location}\"')
@@ -100,8 +80,8 @@ class WeatherRepository():
         # Doing this requires an API key, which you can get here:
         # https://www.iqair.com/us/commercial/air-quality-monitors/airvisual-platform/api
 
-        requestUrl = "https://api.airvisual.com/v2/nearest_city?key={}&lat={}&lon={}".format(
-            self.__iqAirApiKey, location.getLatitude(), location.getLongitude())
+        requestUrl = "{}?key={}&lat={}&lon={}".format(
+            self.__iqAirApiUrl, self.__iqAirApiKey, location.getLatitude(), location.getLongitude())
 
         
         rawResponse = None
@@ -126,19 +106,54 @@ class WeatherRepository():
         if location is None:
             raise ValueError(f'location argument is malformed: \"{location}\"')
 
-        cacheValue = self.__cache[location.getId()]
+        cachedWeather = self.__fetchCachedWeather(location)
+
+        if cachedWeather is None:
+            return None
+
+        return cachedWeather.getWeatherReport()
+
+    def __fetchCachedWeather(self, location: Location):
+        cachedWeather = self.__cache[location.getId()]
+
+        if cachedWeather is not None:
+            return cachedWeather
+
+        weatherReport = self.__refreshWeather(location)
+
+        if weatherReport is None:
+            del self.__cache[location.getId()]
+            return None
+
+        # rendered once here, rather than every time someone asks for the weather
+        cachedWeather = CachedWeather(
+            weatherReport=weatherReport,
+            weatherStr=weatherReport.toStr()
+        )
+
+        self.__cache[location.getId()] = cachedWeather
+        return cachedWeather
+
+    def fetchWeatherStr(self, location: Location):
+        if location is None:
+            raise ValueError(f'location argument is malformed: \"{location}\"')
+
+        cachedWeather = self.__fetchCachedWeather(location)
+
+        if cachedWeather is None:
+            return None
 
-        if cacheValue is not None:
-            return cacheValue
+        return cachedWeather.getWeatherStr()
 
+    def __refreshWeather(self, location: Location):
         print(f'Refreshing weather for \"{location.getId()}\"... ({utils.getNowTimeText()})')
 
         # Retrieve weather report from https://openweathermap.org/api/one-call-api
         # Doing this requires an API key, which you can get here:
         # https://openweathermap.org/api
 
-        requestUrl = "https://api.openweathermap.org/data/2.5/onecall?appid={}&lat={}&lon={}&exclude=minutely,hourly&units=metric".format(
-            self.__oneWeatherApiKey, location.getLatitude(), location.getLongitude())
+        requestUrl = "{}?appid={}&lat={}&lon={}&exclude=minutely,hourly&units=metric".format(
+            self.__oneWeatherApiUrl, self.__oneWeatherApiKey, location.getLatitude(), location.getLongitude())
 
         rawResponse = None
 
@@ -149,7 +164,6 @@ class WeatherRepository():
 
         if rawResponse is None:
             print(f'rawResponse is malformed: \"{rawResponse}\"')
-            del self.__cache[location.getId()]
             return None
 
         jsonResponse = rawResponse.json()
@@ -203,28 +217,45 @@ class WeatherRepository():
         except ValueError:
             print(f'Weather Report for \"{location.getId()}\" has a data error')
 
-        if weatherReport is None:
-            del self.__cache[location.getId()]
-        else:
-            self.__cache[location.getId()] = weatherReport
-
         return weatherReport
 
     def __prettifyCondition(self, conditionJson: dict):
-        conditionIcon = ''
-        if 'id' in conditionJson:
-            id_ = str(conditionJson['id'])
+        conditionDescription = conditionJson['description']
+        icon = CONDITION_ICONS.get(conditionJson.get('id'))
 
-            if id_ in self.__conditionIcons:
-                icon = self.__conditionIcons[id_]
-                conditionIcon = f'{icon} '
+        if icon is None:
+            return conditionDescription
 
-        conditionDescription = conditionJson['description']
-        return f'{conditionIcon}{conditionDescription}'
+        return f'{icon} {conditionDescription}'
+
+
+class CachedWeather():
+
+    __slots__ = ('__weatherReport', '__weatherStr')
+
+    def __init__(self, weatherReport, weatherStr: str):
+        if weatherReport is None:
+            raise ValueError(f'weatherReport argument is malformed: \"{weatherReport}\"')
+        elif not utils.isValidStr(weatherStr):
+            raise ValueError(f'weatherStr argument is malformed: \"{weatherStr}\"')
+
+        self.__weatherReport = weatherReport
+        self.__weatherStr = weatherStr
+
+    def getWeatherReport(self):
+        return self.__weatherReport
+
+    def getWeatherStr(self):
+        return self.__weatherStr
 
 
 class WeatherReport():
 
+    __slots__ = (
+        '__airQuality', '__humidity', '__pressure', '__temperature', '__tomorrowsHighTemperature',
+        '__tomorrowsLowTemperature', '__alerts', '__conditions', '__tomorrowsConditions'
+    )
+
     def __init__(
         self,
         airQuality: int,
@@ -254,9 +285,9 @@ class WeatherReport():
         self.__temperature = temperature
         self.__tomorrowsHighTemperature = tomorrowsHighTemperature
         self.__tomorrowsLowTemperature = tomorrowsLowTemperature
-        self.__alerts = alerts
-        self.__conditions = conditions
-        self.__tomorrowsConditions = tomorrowsConditions
+        self.__alerts = tuple(alerts or ())
+        self.__conditions = tuple(conditions or ())
+        self.__tomorrowsConditions = tuple(tomorrowsConditions or ())
 
     def __cToF(self, celsius: float):
         return (celsius * (9 / 5)) + 32
@@ -0,0 +1,114 @@
+import asyncio
+from datetime import date, datetime, time, timedelta, tzinfo
+
+import CynanBotCommon.utils as utils
+from CynanBotCommon.wordOfTheDayRepository import (LanguageEntry,
+                                                   WordOfTheDayRepository)
+
+
+class WordOfTheDayPrefetcher():
+
+    def __init__(
+        self,
+        rolloverTimeZone: tzinfo,
+        wordOfTheDayRepository: WordOfTheDayRepository,
+        rolloverDelay: timedelta = timedelta(minutes=5),
+        retryTimeDelta: timedelta = timedelta(minutes=15)
+    ):
+        if rolloverTimeZone is None:
+            raise ValueError(f'rolloverTimeZone argument is malformed: \"{rolloverTimeZone}\"')
+        elif wordOfTheDayRepository is None:
+            raise ValueError(f'wordOfTheDayRepository argument is malformed: \"{wordOfTheDayRepository}\"')
+        elif rolloverDelay is None:
+            raise ValueError(f'rolloverDelay argument is malformed: \"{rolloverDelay}\"')
+        elif retryTimeDelta is None:
+            raise ValueError(f'retryTimeDelta argument is malformed: \"{retryTimeDelta}\"')
+
+        self.__rolloverTimeZone = rolloverTimeZone
+        self.__wordOfTheDayRepository = wordOfTheDayRepository
+        self.__rolloverDelay = rolloverDelay
+        self.__retryTimeDelta = retryTimeDelta
+        self.__wotdStrs = dict()
+        self.__task = None
+
+    def __getCurrentRolloverDate(self):
+        return datetime.now(self.__rolloverTimeZone).date()
+
+    def getNextRolloverTime(self):
+        nextRolloverDate = self.__getCurrentRolloverDate() + timedelta(days=1)
+        return self.__localizeMidnight(nextRolloverDate)
+
+    def __getTimeUntilNextPrefetch(self):
+        now = datetime.now(self.__rolloverTimeZone)
+        return self.getNextRolloverTime() + self.__rolloverDelay - now
+
+    def getWotdStr(self, languageEntry: LanguageEntry):
+        if languageEntry is None:
+            raise ValueError(f'languageEntry argument is malformed: \"{languageEntry}\"')
+
+        entry = self.__wotdStrs.get(languageEntry.getApiName())
+
+        if entry is None:
+            return None
+
+        rolloverDate, wotdStr = entry
+
+        # if fetching today's word failed, yesterday's must not be passed off as today's
+        if rolloverDate != self.__getCurrentRolloverDate():
+            return None
+
+        return wotdStr
+
+    def __localizeMidnight(self, rolloverDate: date):
+        midnight = datetime.combine(rolloverDate, time())
+
+        # pytz time zones have to localize, as just attaching them would use the wrong UTC offset
+        # whenever midnight is on the other side of a daylight saving time change from now
+        if hasattr(self.__rolloverTimeZone, 'localize'):
+            return self.__rolloverTimeZone.localize(midnight)
+
+        return midnight.replace(tzinfo=self.__rolloverTimeZone)
+
+    async def __prefetch(self, languageEntries):
+        loop = asyncio.get_event_loop()
+        failedLanguageEntries = list()
+
+        for languageEntry in languageEntries:
+            wotd = None
+
+            try:
+                wotd = await loop.run_in_executor(None, self.__wordOfTheDayRepository.fetchWotd, languageEntry)
+            except Exception as e:
+                print(f'Error prefetching word of the day for \"{languageEntry.getApiName()}\": {e}')
+
+            if wotd is None:
+                failedLanguageEntries.append(languageEntry)
+            else:
+                self.__wotdStrs[languageEntry.getApiName()] = (self.__getCurrentRolloverDate(), wotd.toStr())
+
+        return failedLanguageEntries
+
+    async def __run(self):
+        while True:
+            try:
+                languageEntries = self.__wordOfTheDayRepository.getLanguageList().getLanguages()
+                print(f'Prefetching word of the day for {len(languageEntries)} language(s)... ({utils.getNowTimeText()})')
+
+                failedLanguageEntries = await self.__prefetch(languageEntries)
+
+                # retry any failures until either they all succeed or we hit the next rollover
+                while len(failedLanguageEntries) >= 1 and self.__retryTimeDelta < self.__getTimeUntilNextPrefetch():
+                    await asyncio.sleep(self.__retryTimeDelta.total_seconds())
+                    failedLanguageEntries = await self.__prefetch(failedLanguageEntries)
+            except Exception as e:
+                print(f'Error in the word of the day prefetcher, will try again soon: {e}')
+                await asyncio.sleep(min(self.__retryTimeDelta, self.__getTimeUntilNextPrefetch()).total_seconds())
+                continue
+
+            await asyncio.sleep(self.__getTimeUntilNextPrefetch().total_seconds())
+
+    def start(self):
+        if self.__task is not None:
+            return
+
+        self.__task = asyncio.get_event_loop().create_task(self.__run())